@@ -0,0 +1,360 @@
+"""
+Animation plans: vectorized interpolation for deterministic play() calls.
+
+Most animations in these scenes are straight-path Transforms with fixed
+targets (Transform(prior_bar, posterior_bar), diagram.morph_to(...),
+FadeIn/FadeOut, .animate, GrowArrow) or AnimationGroup/LaggedStart
+bundles of them. Manim interpolates those per frame, per submobject, in
+Python. PlannedAnimation instead collects, at begin():
+
+  - one start and one end point tensor for every submobject of every leaf
+  - the alpha each submobject sees on each frame of the fixed frame grid
+    (group timings, lag ratios and rate functions folded in)
+
+and evaluates blocks of frames as one (frames x points x 3) NumPy
+operation. Per frame, only the submobject point views are swapped in, and
+style is interpolated only for submobjects whose style actually changes.
+
+Anything that is not plannable (Write, Create, Flash, Wait, path_arc
+transforms, custom interpolate_submobject) runs exactly as before. With
+-v DEBUG every play logs which of its animations were planned;
+
+    python HPL112/src/animplan.py
+
+checks that a LaggedStart of Transforms takes the planned path and lands
+on manim's own frames.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+from manim import Animation, AnimationGroup, Scene, Succession, Transform, VMobject, config, linear, logger, tempconfig
+from manim.constants import RendererType
+
+# Frames are evaluated in blocks so long animations over big Text objects
+# don't materialize hundreds of MB at once.
+MAX_BLOCK_BYTES = 32 * 2**20
+
+
+class NotPlannable(Exception):
+    pass
+
+
+def _vectorize(func):
+    """Apply a scalar rate function to an array of alphas."""
+    def apply(values):
+        return np.fromiter((func(float(v)) for v in values), dtype=float, count=len(values))
+    return apply
+
+
+def _is_plannable_leaf(anim) -> bool:
+    cls = type(anim)
+    return (
+        isinstance(anim, Transform)
+        and getattr(anim, "path_arc", 0) == 0
+        and cls.interpolate is Animation.interpolate
+        and cls.interpolate_mobject is Animation.interpolate_mobject
+        and cls.interpolate_submobject is Transform.interpolate_submobject
+    )
+
+
+def _is_plannable_group(anim) -> bool:
+    return (
+        isinstance(anim, AnimationGroup)
+        and not isinstance(anim, Succession)
+        and type(anim).interpolate is AnimationGroup.interpolate
+    )
+
+
+def _group_timings(group):
+    """(animation, start, end) per child, as AnimationGroup lays them out."""
+    if hasattr(group, "anims_with_timings"):
+        # 0.18: laid out once in init_run_time
+        awt = group.anims_with_timings
+        timings = [(anim, float(start), float(end)) for anim, start, end in zip(awt["anim"], awt["start"], awt["end"])]
+        return timings, float(group.max_end_time)
+    timings = []
+    curr_time = 0.0
+    for anim in group.animations:
+        start = curr_time
+        end = start + anim.get_run_time()
+        timings.append((anim, start, end))
+        curr_time = (1 - group.lag_ratio) * start + group.lag_ratio * end
+    max_end = max((end for _, _, end in timings), default=0.0)
+    return timings, max_end
+
+
+def _style_differs(mob, start, target) -> bool:
+    if not isinstance(mob, VMobject):
+        return True
+    for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas",
+                 "stroke_width", "background_stroke_width", "sheen_factor"):
+        if not np.array_equal(np.asarray(getattr(start, attr)), np.asarray(getattr(target, attr))):
+            return True
+    return False
+
+
+class AnimationPlan:
+    """
+    Start/end point tensors plus per-frame alphas for one compiled play().
+
+    Built after the wrapped animation has begun, i.e. after Transform has
+    aligned each submobject with its target.
+    """
+
+    def __init__(self, animation: Animation, frame_rate: float):
+        self.run_time = animation.run_time
+        if self.run_time <= 0:
+            raise NotPlannable(animation)
+        self.leaves = []
+        self._collect(animation, lambda alphas: alphas)
+        if not self.leaves:
+            raise NotPlannable(animation)
+
+        # same grid Scene.get_time_progression walks
+        times = np.arange(0, self.run_time, 1 / frame_rate)
+        self.frame_rate = frame_rate
+        self.alpha_grid = times / self.run_time
+
+        self.family_counts = []
+        submobjects, starts, ends, family_ids = [], [], [], []
+        styled = []
+        sub_alpha_columns = []
+        for leaf, alpha_map in self.leaves:
+            families = list(leaf.get_all_families_zipped())
+            n = len(families)
+            self.family_counts.append(n)
+            leaf_alphas = alpha_map(self.alpha_grid)
+            first_column = None
+            for i, (mob, start, target) in enumerate(families):
+                if start.points.shape != target.points.shape or mob.points.shape != start.points.shape:
+                    raise NotPlannable(leaf)
+                if i == 0 or leaf.lag_ratio != 0:
+                    column = np.fromiter(
+                        (leaf.get_sub_alpha(float(a), i, n) for a in leaf_alphas),
+                        dtype=float, count=len(leaf_alphas),
+                    )
+                    first_column = column if first_column is None else first_column
+                else:
+                    column = first_column
+                family_id = len(sub_alpha_columns)
+                sub_alpha_columns.append(column)
+                submobjects.append(mob)
+                starts.append(start.points)
+                ends.append(target.points)
+                family_ids.append(np.full(len(start.points), family_id))
+                if _style_differs(mob, start, target):
+                    styled.append((family_id, mob, start, target))
+
+        self.submobjects = submobjects
+        self.styled = styled
+        self.offsets = np.cumsum([0] + [len(p) for p in starts])
+        self.start = np.concatenate(starts) if starts else np.zeros((0, 3))
+        self.end = np.concatenate(ends) if ends else np.zeros((0, 3))
+        self.point_family = np.concatenate(family_ids) if family_ids else np.zeros(0, dtype=int)
+        # (frames, families) table of the alpha every submobject sees
+        self.sub_alphas = np.stack(sub_alpha_columns, axis=1) if sub_alpha_columns else np.zeros((len(times), 0))
+
+        frame_bytes = max(self.start.nbytes, 1)
+        self.block_size = max(1, MAX_BLOCK_BYTES // frame_bytes)
+        self._block_start = None
+        self._block = None
+
+    def _collect(self, anim, alpha_map):
+        if _is_plannable_group(anim):
+            timings, max_end = _group_timings(anim)
+            rate = _vectorize(anim.rate_func)
+            for child, start, end in timings:
+                def child_map(alphas, start=start, end=end, parent=alpha_map):
+                    time = rate(parent(alphas)) * max_end
+                    if end == start:
+                        return np.zeros_like(time)
+                    return np.clip((time - start) / (end - start), 0, 1)
+                self._collect(child, child_map)
+        elif _is_plannable_leaf(anim):
+            self.leaves.append((anim, alpha_map))
+        else:
+            raise NotPlannable(anim)
+
+    # --- evaluation ---------------------------------------------------
+    def _evaluate(self, sub_alphas: np.ndarray) -> np.ndarray:
+        """(frames, families) alphas -> (frames, points, 3) positions."""
+        point_alphas = sub_alphas[:, self.point_family, None]
+        # same arithmetic as manim's interpolate(), so frames match exactly
+        return (1 - point_alphas) * self.start + point_alphas * self.end
+
+    def _sub_alphas_at(self, alpha: float) -> np.ndarray:
+        row = []
+        for (leaf, alpha_map), n in zip(self.leaves, self.family_counts):
+            leaf_alpha = float(alpha_map(np.array([alpha]))[0])
+            row.extend(leaf.get_sub_alpha(leaf_alpha, i, n) for i in range(n))
+        return np.array(row, dtype=float)
+
+    def _frame_index(self, alpha: float):
+        k = int(round(alpha * self.run_time * self.frame_rate))
+        if 0 <= k < len(self.alpha_grid) and self.alpha_grid[k] == alpha:
+            return k
+        return None
+
+    def apply(self, alpha: float):
+        k = self._frame_index(alpha)
+        if k is None:
+            # off-grid (e.g. skipped animations jump straight to alpha=1)
+            row = self._sub_alphas_at(alpha)
+            points = self._evaluate(row[None])[0]
+        else:
+            if self._block_start is None or not (self._block_start <= k < self._block_start + len(self._block)):
+                self._block_start = k
+                self._block = self._evaluate(self.sub_alphas[k:k + self.block_size])
+            points = self._block[k - self._block_start]
+            row = self.sub_alphas[k]
+
+        offsets = self.offsets
+        for i, mob in enumerate(self.submobjects):
+            mob.points = points[offsets[i]:offsets[i + 1]]
+        for family_id, mob, start, target in self.styled:
+            mob.interpolate_color(start, target, row[family_id])
+
+
+class PlannedAnimation(Animation):
+    """
+    Wraps a compiled animation and drives it through an AnimationPlan.
+
+    Setup, finish and scene clean-up are delegated to the wrapped
+    animation, so finish() still lands on manim's own end state.
+    """
+
+    def __init__(self, animation: Animation, **kwargs):
+        self.animation = animation
+        self.plan = None
+        super().__init__(
+            animation.mobject,
+            run_time=animation.run_time,
+            rate_func=linear,
+            remover=animation.remover,
+            introducer=animation.introducer,
+            suspend_mobject_updating=False,
+            **kwargs,
+        )
+
+    def _setup_scene(self, scene):
+        self.animation._setup_scene(scene)
+        # skipped plays jump straight to their end state; no plan needed
+        self.skipping = getattr(getattr(scene, "renderer", None), "skip_animations", False)
+
+    def begin(self):
+        self.animation.begin()
+        self.plan = None
+        if getattr(self, "skipping", False):
+            return
+        try:
+            self.plan = AnimationPlan(self.animation, config.frame_rate)
+        except NotPlannable as error:
+            logger.debug(f"{self.animation} runs unplanned: {error} is not plannable")
+
+    def interpolate(self, alpha: float):
+        if self.plan is None:
+            self.animation.interpolate(alpha)
+        else:
+            self.plan.apply(alpha)
+
+    def update_mobjects(self, dt: float):
+        self.animation.update_mobjects(dt)
+
+    def finish(self):
+        self.plan = None
+        self.animation.finish()
+
+    def clean_up_from_scene(self, scene):
+        self.animation.clean_up_from_scene(scene)
+
+    def get_all_mobjects(self):
+        return self.animation.get_all_mobjects()
+
+    def get_all_mobjects_to_update(self):
+        return self.animation.get_all_mobjects_to_update()
+
+
+def plan_animation(animation: Animation) -> Animation:
+    """Wrap animation in a PlannedAnimation if its structure allows it."""
+    if _is_plannable_leaf(animation) or (
+        _is_plannable_group(animation) and _group_is_plannable(animation)
+    ):
+        return PlannedAnimation(animation)
+    return animation
+
+
+def _group_is_plannable(group) -> bool:
+    for child in group.animations:
+        if _is_plannable_group(child):
+            if not _group_is_plannable(child):
+                return False
+        elif not _is_plannable_leaf(child):
+            return False
+    return True
+
+
+class PlannedScene(Scene):
+    """Scene whose play() calls are compiled to AnimationPlans when possible."""
+
+    plan_animations = True
+
+    def compile_animations(self, *args, **kwargs):
+        animations = super().compile_animations(*args, **kwargs)
+        if not self.plan_animations or config.renderer != RendererType.CAIRO:
+            return animations
+        planned = [plan_animation(anim) for anim in animations]
+        logger.debug(
+            f"play {self.renderer.num_plays}: "
+            + ", ".join(f"{type(anim).__name__} {'planned' if anim is not new else 'as is'}"
+                        for anim, new in zip(animations, planned))
+        )
+        return planned
+
+
+def self_check(frame_rate=15) -> float:
+    """
+    Plays a LaggedStart of Transforms both ways and returns the largest
+    point difference; raises if it does not take the planned path.
+    """
+    from manim import Circle, LaggedStart, Square, VGroup, RIGHT
+
+    def build():
+        squares = VGroup(*(Square(side_length=0.5).shift(i * RIGHT) for i in range(4)))
+        anim = LaggedStart(*(Transform(s, Circle(radius=0.3).move_to(s)) for s in squares), lag_ratio=0.3)
+        return squares, anim
+
+    planned_mob, planned = build()
+    planned = plan_animation(planned)
+    if not isinstance(planned, PlannedAnimation):
+        raise AssertionError("LaggedStart of Transforms was not wrapped in a PlannedAnimation")
+    reference_mob, reference = build()
+    with tempconfig({"frame_rate": frame_rate}):
+        planned.begin()
+        if planned.plan is None:
+            raise AssertionError("LaggedStart of Transforms did not compile to an AnimationPlan")
+        reference.begin()
+        worst = 0.0
+        for alpha in planned.plan.alpha_grid:
+            planned.interpolate(alpha)
+            reference.interpolate(alpha)
+            for a, b in zip(planned_mob.family_members_with_points(), reference_mob.family_members_with_points()):
+                worst = max(worst, float(np.abs(a.points - b.points).max()))
+        planned.finish()
+        reference.finish()
+    return worst
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fps", type=float, default=15, help="frame rate of the check")
+    args = parser.parse_args()
+
+    difference = self_check(args.fps)
+    print(f"LaggedStart planned, largest point difference to manim {difference:.3g}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,304 @@
+"""
+Checkpoints for long renders, so a killed FullBayesMovie render resumes
+where it died instead of starting over.
+
+With BAYES_CHECKPOINT set, the renderer saves a checkpoint after completed
+plays:
+
+    state.npz   point and color arrays of every mobject on screen, in
+                family order (compressed)
+    rng.pkl     Python and NumPy random states
+    meta.json   play index, renderer time, the partial movie file and
+                frame count of every finished play, a signature of the
+                mobject tree and a key over everything that shapes the
+                render (scene source, timelines, narration clips, quality,
+                encoder settings)
+
+construct() cannot be entered halfway, so resuming runs it again with the
+plays before the checkpoint fast-forwarded (partial.py's end-state jumps,
+nothing rasterized), then overwrites the tree with the saved arrays and
+random states. Plays from there on render exactly as in the first run;
+the earlier ones keep their segment files, which are already closed-GOP
+segments (partial.SegmentFileWriter), so the final movie is the usual
+concat of all of them.
+
+Saving costs a compressed write of every on-screen point array. To keep
+that bounded a checkpoint is skipped while the time spent saving would
+exceed CHECKPOINT_SHARE of the render's wall time; the totals are logged
+when the scene finishes. Checkpoints are deleted after a successful
+render, and ignored when the key no longer matches.
+
+    BAYES_CHECKPOINT=1 manim -qh HPL112/src/main.py FullBayesMovie            # media/checkpoints/
+    BAYES_CHECKPOINT=/scratch/ckpt manim -qh HPL112/src/main.py FullBayesMovie
+    python HPL112/src/checkpoint.py list
+    python HPL112/src/checkpoint.py clear FullBayesMovie
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import random
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+from manim import config, logger
+
+from framehash import HASH_ENV_VAR
+from framepool import PooledFrameScene
+from framestore import STORE_ENV_VAR
+from partial import FastForwardRenderer, encoder_signature, partial_movie_files
+
+CHECKPOINT_ENV_VAR = "BAYES_CHECKPOINT"
+CHECKPOINT_SHARE = 0.05  # at most this much of the wall time goes to saving
+KEEP = 2                 # older checkpoints are pruned; the previous one covers a torn write
+
+ARRAY_ATTRS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "rgbas", "pixel_array")
+SCALAR_ATTRS = ("stroke_width", "background_stroke_width", "z_index")
+
+
+def checkpoint_root() -> Path | None:
+    value = os.environ.get(CHECKPOINT_ENV_VAR)
+    if not value:
+        return None
+    if value == "1":
+        return Path(config.media_dir) / "checkpoints"
+    return Path(value)
+
+
+def scene_directory(root: Path, scene_name: str) -> Path:
+    return Path(root) / scene_name / f"{config.pixel_height}p{config.frame_rate:g}"
+
+
+def checkpoint_key(scene_cls) -> str:
+    """Changes whenever a resumed render could differ from a fresh one."""
+    from narration import NARRATION_DIR, source_hash
+
+    h = hashlib.sha256(source_hash(scene_cls).encode())
+    # every scene's clips: FullBayesMovie is narrated with its segments' ones
+    for path in sorted(NARRATION_DIR.glob("*/*")):
+        stat = path.stat()
+        h.update(f"{path.parent.name}/{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    h.update(repr([config.pixel_width, config.pixel_height, config.frame_rate, encoder_signature()]).encode())
+    return h.hexdigest()[:24]
+
+
+# --------------------------------------------------------------------
+# Scene state
+# --------------------------------------------------------------------
+def tree_signature(mobjects) -> list[str]:
+    return [type(mob).__name__ for mob in mobjects]
+
+
+def capture_state(mobjects) -> dict:
+    arrays = {}
+    for i, mob in enumerate(mobjects):
+        for attr in ARRAY_ATTRS:
+            value = getattr(mob, attr, None)
+            if isinstance(value, np.ndarray):
+                arrays[f"{i}/{attr}"] = value
+        for attr in SCALAR_ATTRS:
+            value = getattr(mob, attr, None)
+            if isinstance(value, (int, float)):
+                arrays[f"{i}/{attr}"] = np.asarray(value)
+    return arrays
+
+
+def restore_state(mobjects, arrays) -> int:
+    """Writes saved arrays back onto the tree; returns how many were set."""
+    restored = 0
+    for key in arrays.files:
+        index, attr = key.split("/", 1)
+        value = arrays[key]
+        if attr in SCALAR_ATTRS:
+            value = value.item()
+        setattr(mobjects[int(index)], attr, value)
+        restored += 1
+    return restored
+
+
+def list_checkpoints(directory: Path) -> list[Path]:
+    """Complete checkpoints, newest first."""
+    found = [path for path in Path(directory).glob("ckpt-*") if (path / "meta.json").exists()]
+    return sorted(found, reverse=True)
+
+
+def latest_checkpoint(directory: Path, key: str) -> dict | None:
+    """Newest checkpoint with a matching key whose segment files all exist."""
+    for path in list_checkpoints(directory):
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if meta.get("key") != key:
+            logger.info(f"Checkpoint {path} is for other sources or settings, ignoring it")
+            continue
+        if all(f and Path(f).exists() for f in meta["segments"]):
+            return {**meta, "path": str(path)}
+        logger.warning(f"Checkpoint {path} lost some of its partial movies, trying an older one")
+    return None
+
+
+# --------------------------------------------------------------------
+# Renderer and scene
+# --------------------------------------------------------------------
+class CheckpointRenderer(FastForwardRenderer):
+    """Saves checkpoints after plays and resumes from one if given."""
+
+    def __init__(self, directory, key, resume=None, **kwargs):
+        start = resume["plays"] if resume else 0
+        super().__init__(play_range=(start, None) if resume else None, **kwargs)
+        self.directory = Path(directory)
+        self.key = key
+        self.resume = resume
+        self.stats = {"saves": 0, "skipped": 0, "seconds": 0.0, "bytes": 0}
+        self._last_cost = 0.0
+        self._started = time.perf_counter()
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self._started = time.perf_counter()
+
+    def play(self, scene, *args, **kwargs):
+        super().play(scene, *args, **kwargs)
+        if self.resume is not None and self.num_plays == self.resume["plays"]:
+            self.restore(scene)
+        elif self.resume is None or self.num_plays > self.resume["plays"]:
+            self.maybe_save(scene)
+
+    # --- saving -----------------------------------------------------------
+    def maybe_save(self, scene):
+        elapsed = time.perf_counter() - self._started
+        if self.stats["seconds"] + self._last_cost > CHECKPOINT_SHARE * elapsed:
+            self.stats["skipped"] += 1
+            return
+        start = time.perf_counter()
+        self.stats["bytes"] += self.save(scene)
+        self._last_cost = time.perf_counter() - start
+        self.stats["saves"] += 1
+        self.stats["seconds"] += self._last_cost
+
+    def save(self, scene) -> int:
+        mobjects = scene.get_mobject_family_members()
+        segments = [str(f) if f else None for f in partial_movie_files(self.file_writer)[:self.num_plays]]
+        frames = getattr(self.file_writer, "segment_frames", {})
+        meta = {
+            "scene": type(scene).__name__,
+            "key": self.key,
+            "plays": self.num_plays,
+            "time": float(self.time),
+            "segments": segments,
+            "frames": {f: frames[f] for f in segments if f in frames},
+            "signature": tree_signature(mobjects),
+            "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+        final = self.directory / f"ckpt-{self.num_plays:05d}"
+        tmp = self.directory / f".{final.name}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        np.savez_compressed(tmp / "state.npz", **capture_state(mobjects))
+        with open(tmp / "rng.pkl", "wb") as rng:
+            pickle.dump((random.getstate(), np.random.get_state()), rng)
+        (tmp / "meta.json").write_text(json.dumps(meta, indent=1))  # last: marks the checkpoint complete
+        shutil.rmtree(final, ignore_errors=True)
+        tmp.rename(final)
+
+        for old in list_checkpoints(self.directory)[KEEP:]:
+            shutil.rmtree(old, ignore_errors=True)
+        return sum(path.stat().st_size for path in final.iterdir())
+
+    # --- resuming -----------------------------------------------------------
+    def restore(self, scene):
+        path = Path(self.resume["path"])
+        mobjects = scene.get_mobject_family_members()
+        if tree_signature(mobjects) == self.resume["signature"]:
+            with np.load(path / "state.npz") as arrays:
+                count = restore_state(mobjects, arrays)
+            logger.info(f"Resumed from {path} after play {self.num_plays} ({count} arrays)")
+        else:
+            # same sources but a different tree: keep the fast-forwarded end states
+            logger.warning(f"Mobject tree differs from {path}; resuming from fast-forwarded state")
+        with open(path / "rng.pkl", "rb") as rng:
+            python_state, numpy_state = pickle.load(rng)
+        random.setstate(python_state)
+        np.random.set_state(numpy_state)
+        self.time = self.resume["time"]
+        fill_skipped_segments(self.file_writer, self.resume["segments"])
+        if hasattr(self.file_writer, "segment_frames"):
+            self.file_writer.segment_frames.update(self.resume["frames"])
+
+    def scene_finished(self, scene):
+        super().scene_finished(scene)
+        stats = self.stats
+        wall = time.perf_counter() - self._started
+        logger.info(
+            f"Checkpoints: {stats['saves']} saved, {stats['skipped']} skipped for budget, "
+            f"{stats['seconds']:.2f}s ({stats['seconds'] / max(wall, 1e-9):.1%} of {wall:.1f}s), "
+            f"{stats['bytes'] / 1e6:.1f} MB written"
+        )
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def fill_skipped_segments(file_writer, segments):
+    """Put the checkpoint's partial movies where the skipped plays left None."""
+    flat = file_writer.partial_movie_files
+    for i, file in enumerate(segments[:len(flat)]):
+        if flat[i] is None:
+            flat[i] = file
+    index = 0
+    for section in getattr(file_writer, "sections", []):
+        files = section.partial_movie_files
+        for j in range(len(files)):
+            if files[j] is None and index < len(segments):
+                files[j] = segments[index]
+            index += 1
+
+
+class CheckpointScene(PooledFrameScene):
+    """Checkpoints (and resumes) the render when BAYES_CHECKPOINT is set."""
+
+    def make_renderer(self, skip_animations=False, **kwargs):
+        root = checkpoint_root()
+        if root is None or skip_animations:
+            return super().make_renderer(skip_animations=skip_animations, **kwargs)
+        others = [name for name in (STORE_ENV_VAR, HASH_ENV_VAR) if os.environ.get(name)]
+        if others:
+            # a resumed render fast-forwards the plays a store or manifest would need
+            raise ValueError(f"{CHECKPOINT_ENV_VAR} cannot be combined with {', '.join(others)}")
+        directory = scene_directory(root, type(self).__name__)
+        key = checkpoint_key(type(self))
+        resume = latest_checkpoint(directory, key)
+        if resume is not None:
+            logger.info(f"Resuming {type(self).__name__} at play {resume['plays']} from {resume['path']}")
+        return CheckpointRenderer(directory, key, resume=resume, **kwargs)
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("list", "clear"))
+    parser.add_argument("scenes", nargs="*", help="scene class names (default: all with checkpoints)")
+    parser.add_argument("--dir", default=None, help="checkpoint root (default: $BAYES_CHECKPOINT or media/checkpoints)")
+    args = parser.parse_args()
+
+    root = Path(args.dir) if args.dir else checkpoint_root() or Path(config.media_dir) / "checkpoints"
+    scene_dirs = [root / name for name in args.scenes] if args.scenes else sorted(root.glob("*"))
+    for scene_dir in scene_dirs:
+        if args.command == "clear":
+            shutil.rmtree(scene_dir, ignore_errors=True)
+            print(f"cleared {scene_dir}")
+            continue
+        for quality_dir in sorted(scene_dir.glob("*")):
+            for path in list_checkpoints(quality_dir):
+                meta = json.loads((path / "meta.json").read_text())
+                print(f"{scene_dir.name} {quality_dir.name}: play {meta['plays']} "
+                      f"(t={meta['time']:.2f}s, saved {meta['saved']})")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,293 @@
+"""
+Render one scene in parallel by splitting its timeline into chunks of
+consecutive plays.
+
+A worker given plays [start, stop) rebuilds the scene state at `start`
+the way partial.py does -- every earlier play jumps to its end state, no
+frames are rasterized -- renders its own plays and stops. Each play is a
+keyframe-aligned segment (partial.SegmentFileWriter), so stitching the
+chunks is a stream-copy concat of their segments in play order. Chunks
+are balanced by run time; later chunks pay a little more for their
+longer fast-forward.
+
+Like partial renders this relies on a play's end state not depending on
+how finely it was sampled, which holds for every scene here except
+time-based updaters running through skipped plays.
+
+Local pool:
+    python HPL112/src/chunked.py render Scene5_BayesEquationWithDiagrams --chunks 4 --workers 4
+
+Several machines sharing a directory (no central service; claims are
+atomic mkdir()s, so any shared filesystem will do):
+    python HPL112/src/chunked.py submit Scene5_BayesEquationWithDiagrams --queue /shared/q --chunks 8
+    python HPL112/src/chunked.py work --queue /shared/q                # on every machine
+    python HPL112/src/chunked.py stitch /shared/q/<job> --output Scene5.mp4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from manim import config, logger, tempconfig
+
+from partial import (
+    NARRATION_TRACK,
+    SEGMENTS_FILE,
+    FastForwardRenderer,
+    concat_segments,
+    encoder_signature,
+    play_durations,
+    write_segments,
+)
+
+CLAIM_HEARTBEAT = 30.0  # seconds between claim touches while rendering
+STALE_AFTER = 600.0     # a claim untouched this long is taken over
+
+
+# --------------------------------------------------------------------
+# Planning and rendering chunks
+# --------------------------------------------------------------------
+def plan_chunks(durations, num_chunks: int) -> list[tuple[int, int]]:
+    """Contiguous [start, stop) play ranges of roughly equal run time."""
+    total = sum(durations)
+    bounds = [0]
+    elapsed = 0.0
+    for i, duration in enumerate(durations[:-1]):
+        elapsed += duration
+        if len(bounds) < num_chunks and elapsed >= total * len(bounds) / num_chunks:
+            bounds.append(i + 1)
+    bounds.append(len(durations))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def render_chunk(scene_name: str, play_range, quality="low_quality") -> dict:
+    """Render plays [start, stop) of a scene; returns their segments."""
+    import main
+
+    start, stop = play_range
+    with tempconfig({"quality": quality, "preview": False, "progress_bar": "none"}):
+        renderer = FastForwardRenderer(play_range=(start, stop))
+        scene = getattr(main, scene_name)(renderer=renderer)
+        renderer.file_writer.segments_only = True
+        scene.render()
+        segments = renderer.segments()[start:stop]
+        directory = Path(renderer.file_writer.partial_movie_directory)
+        return {
+            "range": [start, stop],
+            "segments": segments,
+            "encoder": encoder_signature(),
+            "narration": str(directory / NARRATION_TRACK) if (directory / NARRATION_TRACK).exists() else None,
+        }
+
+
+def stitch(chunks: list[dict], output: Path, manifest=None, scene_name="") -> Path:
+    """Concatenate chunk results (in play order) by stream copy."""
+    chunks = sorted(chunks, key=lambda chunk: chunk["range"][0])
+    encoders = {chunk["encoder"] for chunk in chunks}
+    if len(encoders) != 1:
+        raise ValueError(f"chunks were encoded with different settings ({sorted(encoders)}); re-render them")
+    expected = 0
+    for chunk in chunks:
+        if chunk["range"][0] != expected:
+            raise ValueError(f"chunk ranges have a gap or overlap at play {expected}")
+        expected = chunk["range"][1]
+
+    plays, start = [], 0
+    for chunk in chunks:
+        for segment in chunk["segments"]:
+            plays.append({**segment, "start_frame": start})
+            start = None if start is None or segment["frames"] is None else start + segment["frames"]
+    narration = next((chunk["narration"] for chunk in chunks if chunk.get("narration")), None)
+    concat_segments([play["file"] for play in plays], output, audio=narration)
+    if manifest is not None:
+        write_segments(manifest, scene_name, plays)
+    return output
+
+
+def render_local(scene_name: str, num_chunks: int, workers: int, quality="low_quality") -> Path:
+    import main
+
+    with tempconfig({"quality": quality}):
+        durations = play_durations(getattr(main, scene_name), quality)
+        ranges = plan_chunks(durations, num_chunks)
+        logger.info(f"{scene_name}: {len(durations)} plays in chunks {ranges}")
+
+        ctx = get_context("spawn")
+        with ctx.Pool(workers, maxtasksperchild=1) as pool:
+            chunks = pool.starmap(render_chunk, [(scene_name, r, quality) for r in ranges])
+
+        directory = Path(chunks[0]["segments"][0]["file"]).parent
+        video_dir = Path(config.get_dir("video_dir", module_name="", scene_name=scene_name))
+        video_dir.mkdir(parents=True, exist_ok=True)
+        output = video_dir / f"{scene_name}{config.movie_file_extension}"
+        return stitch(chunks, output, directory / SEGMENTS_FILE, scene_name)
+
+
+# --------------------------------------------------------------------
+# Shared-directory work queue
+# --------------------------------------------------------------------
+#   <queue>/<job>/job.json             scene, quality, chunk ranges
+#   <queue>/<job>/chunk-0003.claim/    mkdir'd by the worker that takes chunk 3
+#   <queue>/<job>/chunk-0003.json      its result, segments copied to segments/
+def submit(queue, scene_name: str, num_chunks: int, quality="low_quality") -> Path:
+    import main
+
+    durations = play_durations(getattr(main, scene_name), quality)
+    job = Path(queue) / f"{scene_name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    (job / "segments").mkdir(parents=True)
+    _write_json(job / "job.json", {
+        "scene": scene_name,
+        "quality": quality,
+        "chunks": plan_chunks(durations, num_chunks),
+    })
+    return job
+
+
+def _write_json(path: Path, data):
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=1))
+    tmp.replace(path)  # readers never see half a file
+
+
+def _claim(job: Path, index: int) -> Path | None:
+    claim = job / f"chunk-{index:04d}.claim"
+    if (job / f"chunk-{index:04d}.json").exists():
+        return None
+    try:
+        claim.mkdir()
+    except FileExistsError:
+        if time.time() - claim.stat().st_mtime < STALE_AFTER:
+            return None
+        # the owner stopped heartbeating: move its claim aside and retry once
+        try:
+            claim.rename(job / f"chunk-{index:04d}.stale-{int(time.time())}")
+            claim.mkdir()
+        except OSError:
+            return None
+    _write_json(claim / "owner.json", {"host": socket.gethostname(), "pid": os.getpid(), "since": time.time()})
+    return claim
+
+
+def _heartbeat(claim: Path, stop: threading.Event):
+    while not stop.wait(CLAIM_HEARTBEAT):
+        try:
+            os.utime(claim)
+        except OSError:
+            return
+
+
+def work_once(queue) -> bool:
+    """Claim and render one chunk of any job; False when there was none."""
+    for job in sorted(Path(queue).glob("*/job.json")):
+        job_dir = job.parent
+        spec = json.loads(job.read_text())
+        for index, play_range in enumerate(spec["chunks"]):
+            claim = _claim(job_dir, index)
+            if claim is None:
+                continue
+            stop = threading.Event()
+            threading.Thread(target=_heartbeat, args=(claim, stop), daemon=True).start()
+            try:
+                logger.info(f"{job_dir.name}: rendering chunk {index} (plays {play_range})")
+                result = _render_chunk_in_child(spec["scene"], play_range, spec["quality"])
+                # copy the segments next to the job so any machine can stitch
+                for number, segment in enumerate(result["segments"]):
+                    target = job_dir / "segments" / f"{index:04d}-{number:04d}{Path(segment['file']).suffix}"
+                    shutil.copyfile(segment["file"], target)
+                    segment["file"] = target.name
+                if result["narration"]:
+                    track = job_dir / NARRATION_TRACK
+                    if not track.exists():
+                        shutil.copyfile(result["narration"], track)
+                    result["narration"] = track.name
+                _write_json(job_dir / f"chunk-{index:04d}.json", result)
+            finally:
+                stop.set()
+            return True
+    return False
+
+
+def _render_chunk_in_child(scene_name, play_range, quality) -> dict:
+    # a fresh interpreter per chunk: scene modules keep caches at import time
+    ctx = get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(render_chunk, (scene_name, tuple(play_range), quality))
+
+
+def work(queue, poll: float | None = None):
+    """Render chunks until none are left (or forever, polling, if poll is set)."""
+    while True:
+        if work_once(queue):
+            continue
+        if poll is None:
+            return
+        time.sleep(poll)
+
+
+def stitch_job(job, output, wait: float | None = None) -> Path:
+    job = Path(job)
+    spec = json.loads((job / "job.json").read_text())
+    results = [job / f"chunk-{i:04d}.json" for i in range(len(spec["chunks"]))]
+    while not all(path.exists() for path in results):
+        if wait is None:
+            missing = [path.name for path in results if not path.exists()]
+            raise FileNotFoundError(f"chunks not finished yet: {missing}")
+        time.sleep(wait)
+
+    chunks = []
+    for path in results:
+        chunk = json.loads(path.read_text())
+        for segment in chunk["segments"]:
+            segment["file"] = str(job / "segments" / segment["file"])
+        if chunk.get("narration"):
+            chunk["narration"] = str(job / chunk["narration"])
+        chunks.append(chunk)
+    return stitch(chunks, Path(output), job / SEGMENTS_FILE, spec["scene"])
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render one scene on a local process pool")
+    render.add_argument("scene")
+    render.add_argument("--chunks", type=int, default=os.cpu_count() or 2)
+    render.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    render.add_argument("--quality", default="low_quality")
+
+    submit_cmd = commands.add_parser("submit", help="put a scene's chunks into a shared queue")
+    submit_cmd.add_argument("scene")
+    submit_cmd.add_argument("--queue", required=True)
+    submit_cmd.add_argument("--chunks", type=int, default=8)
+    submit_cmd.add_argument("--quality", default="low_quality")
+
+    work_cmd = commands.add_parser("work", help="render queued chunks")
+    work_cmd.add_argument("--queue", required=True)
+    work_cmd.add_argument("--poll", type=float, default=None, help="keep polling every N seconds")
+
+    stitch_cmd = commands.add_parser("stitch", help="join a finished job's chunks")
+    stitch_cmd.add_argument("job")
+    stitch_cmd.add_argument("--output", required=True)
+    stitch_cmd.add_argument("--wait", type=float, default=None, help="poll every N seconds until done")
+    args = parser.parse_args()
+
+    if args.command == "render":
+        print(render_local(args.scene, args.chunks, args.workers, args.quality))
+    elif args.command == "submit":
+        print(submit(args.queue, args.scene, args.chunks, args.quality))
+    elif args.command == "work":
+        work(args.queue, args.poll)
+    else:
+        print(stitch_job(args.job, args.output, args.wait))
+
+
+if __name__ == "__main__":
+    _main()
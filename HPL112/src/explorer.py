@@ -0,0 +1,551 @@
+"""
+Interactive Bayes explorer: a local HTTP/WebSocket server that renders
+single frames of the diagrams while prior/likelihood/antilikelihood
+sliders move, for live teaching without rendering a video.
+
+    python HPL112/src/explorer.py serve                 # then open http://127.0.0.1:8765/
+    python HPL112/src/explorer.py loadtest --spawn      # slider-to-frame latency
+
+Views:
+    diagram    BayesDiagram with braces
+    fraction   Scene5's P(H|E) fraction of two diagrams
+    bar        SimpleProbabilityBar of the posterior
+
+Endpoints: "/" (slider page), "/ws" (WebSocket), "/frame?view=..&prior=..",
+"/stats". Over the WebSocket the client sends JSON like
+{"seq": 7, "view": "fraction", "prior": 0.4, "likelihood": 0.6,
+"antilikelihood": 0.2}; for each rendered event the server answers with a
+JSON header (seq, cached, render_ms) followed by the PNG as a binary message.
+
+Why it is fast:
+  - each view's mobjects are built once and updated in place
+    (BayesDiagram.set_parameters, SimpleProbabilityBar.set_p)
+  - PNGs are kept in an LRU keyed by view and quantized parameters; the
+    parameters are quantized before rendering, so a hit is the exact frame
+    a render would give
+  - a connection only keeps its newest event: events arriving while a frame
+    renders replace each other and only the last one gets rendered
+  - rendering happens on one worker thread, so the event loop keeps reading
+    (and coalescing) in the meantime
+
+Standard library plus manim only; nothing leaves localhost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+from manim import ORIGIN, Camera, config, logger
+
+from localserver import respond
+
+PARAMS = ("prior", "likelihood", "antilikelihood")
+DEFAULT_PARAMS = {"prior": 0.35, "likelihood": 0.6, "antilikelihood": 0.2}
+QUANTUM = 0.005
+CACHE_SIZE = 2048
+TARGET_MS = 50.0
+DEFAULT_PORT = 8765
+
+
+def quantize(params: dict, quantum: float = QUANTUM) -> tuple:
+    values = []
+    for name in PARAMS:
+        value = min(max(float(params.get(name, DEFAULT_PARAMS[name])), 0.0), 1.0)
+        values.append(round(round(value / quantum) * quantum, 6))
+    return tuple(values)
+
+
+def posterior(prior, likelihood, antilikelihood) -> float:
+    evidence = prior * likelihood + (1 - prior) * antilikelihood
+    return prior * likelihood / evidence if evidence > 0 else 0.0
+
+
+# --------------------------------------------------------------------
+# Warm mobjects and frame rendering
+# --------------------------------------------------------------------
+def build_views() -> dict:
+    """view name -> (mobject, update(prior, likelihood, antilikelihood))."""
+    import main
+
+    start = [DEFAULT_PARAMS[name] for name in PARAMS]
+
+    diagram = main.BayesDiagram(*start, height=5.5).add_brace_attrs()
+    diagram.move_to(ORIGIN)
+
+    fraction = main.diagram_fraction(*start).set_height(7.0).move_to(ORIGIN)
+    top, _, bottom = fraction
+
+    def update_fraction(*values):
+        top.set_parameters(*values)
+        bottom.set_parameters(*values)
+
+    bar = main.SimpleProbabilityBar(posterior(*start), width=10, height=0.8, color1=main.COLOR_POST)
+    bar.move_to(ORIGIN)
+
+    def update_bar(*values):
+        bar.set_p(posterior(*values))
+
+    return {
+        "diagram": (diagram, diagram.set_parameters),
+        "fraction": (fraction, update_fraction),
+        "bar": (bar, update_bar),
+    }
+
+
+class Explorer:
+    """Renders frames of the warm views; not thread-safe, use one thread."""
+
+    def __init__(self, width=854, height=480, quantum=QUANTUM, cache_size=CACHE_SIZE):
+        import main
+
+        self.camera = Camera(
+            pixel_width=width,
+            pixel_height=height,
+            frame_height=config.frame_height,
+            frame_width=config.frame_height * width / height,
+            background_color=main.BG,
+        )
+        self.quantum = quantum
+        self.cache_size = cache_size
+        self.views = build_views()
+        self.shown = dict.fromkeys(self.views)  # quantized params each view shows now
+        self.cache = OrderedDict()
+        self.stats = Counter()
+        self.render_seconds = 0.0
+
+    def warm(self):
+        """Compile every percent label and draw each view once."""
+        import main
+
+        for percent in range(101):
+            main._percent_label(percent)
+        for view in self.views:
+            self._render(view, quantize(DEFAULT_PARAMS, self.quantum))
+
+    def frame(self, view: str, params: dict) -> tuple[bytes, bool]:
+        """(png, from_cache) for a view at the quantized params."""
+        if view not in self.views:
+            raise KeyError(f"unknown view {view!r}; choose from {sorted(self.views)}")
+        values = quantize(params, self.quantum)
+        key = (view, *values)
+        png = self.cache.get(key)
+        if png is not None:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return png, True
+
+        start = time.perf_counter()
+        png = self._render(view, values)
+        self.render_seconds += time.perf_counter() - start
+        self.stats["renders"] += 1
+        self.cache[key] = png
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return png, False
+
+    def _render(self, view, values) -> bytes:
+        mobject, update = self.views[view]
+        if self.shown[view] != values:
+            update(*values)
+            self.shown[view] = values
+        self.camera.reset()
+        self.camera.capture_mobject(mobject)
+        buffer = io.BytesIO()
+        # speed over size: these never leave the machine
+        self.camera.get_image().save(buffer, "PNG", compress_level=1)
+        return buffer.getvalue()
+
+    def summary(self) -> dict:
+        renders = self.stats["renders"]
+        return {
+            **self.stats,
+            "cache_entries": len(self.cache),
+            "mean_render_ms": round(1000 * self.render_seconds / renders, 2) if renders else None,
+        }
+
+
+# --------------------------------------------------------------------
+# Minimal WebSocket framing (RFC 6455)
+# --------------------------------------------------------------------
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+def ws_accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def _mask(data: bytes, key: bytes) -> bytes:
+    raw = np.frombuffer(data, dtype=np.uint8)
+    return (raw ^ np.resize(np.frombuffer(key, dtype=np.uint8), raw.size)).tobytes()
+
+
+async def ws_send(writer, payload, opcode=None, mask=False):
+    """Send one unfragmented message; clients must mask, servers must not."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+        opcode = opcode or OP_TEXT
+    opcode = opcode or OP_BINARY
+    mask_bit = 0x80 if mask else 0
+    size = len(payload)
+    header = bytearray([0x80 | opcode])
+    if size < 126:
+        header.append(mask_bit | size)
+    elif size < 1 << 16:
+        header.append(mask_bit | 126)
+        header += size.to_bytes(2, "big")
+    else:
+        header.append(mask_bit | 127)
+        header += size.to_bytes(8, "big")
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _mask(payload, key)
+    writer.write(bytes(header) + payload)
+    await writer.drain()
+
+
+async def ws_recv(reader) -> tuple[int, bytes]:
+    """(opcode, payload) of the next message, joining fragments."""
+    opcode, message = None, b""
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        size = b1 & 0x7F
+        if size == 126:
+            size = int.from_bytes(await reader.readexactly(2), "big")
+        elif size == 127:
+            size = int.from_bytes(await reader.readexactly(8), "big")
+        key = await reader.readexactly(4) if b1 & 0x80 else None
+        data = await reader.readexactly(size)
+        if key:
+            data = _mask(data, key)
+        frame_opcode = b0 & 0x0F
+        if frame_opcode >= OP_CLOSE:  # control frames are never fragmented
+            return frame_opcode, data
+        opcode = opcode or frame_opcode
+        message += data
+        if b0 & 0x80:
+            return opcode, message
+
+
+async def ws_connect(url: str):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((
+        f"GET {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    ).encode())
+    response = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in response.split(b"\r\n", 1)[0]:
+        raise ConnectionError(f"websocket upgrade refused: {response[:80]!r}")
+    return reader, writer
+
+
+class LatestOnly:
+    """One-slot mailbox: put() overwrites what is waiting, get() takes the newest."""
+
+    def __init__(self):
+        self._item = None
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, item):
+        if self._ready.is_set():
+            self.dropped += 1
+        self._item = item
+        self._ready.set()
+
+    async def get(self):
+        await self._ready.wait()
+        self._ready.clear()
+        item, self._item = self._item, None
+        return item
+
+
+# --------------------------------------------------------------------
+# Server
+# --------------------------------------------------------------------
+INDEX_HTML = """<!doctype html>
+<meta charset="utf-8"><title>Bayes explorer</title>
+<style>
+ body { background: #0e0e10; color: #ddd; font: 15px sans-serif; margin: 20px; }
+ label { display: inline-block; width: 130px; } input[type=range] { width: 420px; }
+ img { display: block; margin-top: 12px; max-width: 100%; }
+</style>
+<div><label>view</label><select id="view">
+ <option>diagram</option><option>fraction</option><option>bar</option></select>
+ <span id="info"></span></div>
+<div><label>prior</label><input type="range" id="prior" min="0" max="1" step="0.005" value="0.35"></div>
+<div><label>likelihood</label><input type="range" id="likelihood" min="0" max="1" step="0.005" value="0.6"></div>
+<div><label>antilikelihood</label><input type="range" id="antilikelihood" min="0" max="1" step="0.005" value="0.2"></div>
+<img id="frame">
+<script>
+const ws = new WebSocket(`ws://${location.host}/ws`);
+const names = ["prior", "likelihood", "antilikelihood"];
+let seq = 0, sent = {}, header = null;
+function send() {
+  const msg = {seq: ++seq, view: document.getElementById("view").value};
+  for (const n of names) msg[n] = parseFloat(document.getElementById(n).value);
+  sent[msg.seq] = performance.now();
+  ws.send(JSON.stringify(msg));
+}
+ws.onopen = send;
+ws.onmessage = (event) => {
+  if (typeof event.data === "string") { header = JSON.parse(event.data); return; }
+  const img = document.getElementById("frame");
+  if (img.src) URL.revokeObjectURL(img.src);
+  img.src = URL.createObjectURL(event.data);
+  if (header && header.seq in sent) {
+    const ms = (performance.now() - sent[header.seq]).toFixed(1);
+    document.getElementById("info").textContent =
+      `${ms} ms${header.cached ? " (cached)" : ""}, posterior ${header.posterior.toFixed(3)}`;
+    for (const k in sent) if (+k <= header.seq) delete sent[k];
+  }
+};
+for (const id of [...names, "view"]) document.getElementById(id).addEventListener("input", send);
+</script>
+"""
+
+
+class ExplorerServer:
+    def __init__(self, explorer: Explorer):
+        self.explorer = explorer
+        # one thread: the mobjects are shared and manim is not thread-safe
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explorer-render")
+
+    async def render(self, view, params):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.explorer.frame, view, params)
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {
+                key.strip().lower(): value.strip()
+                for key, value in (line.split(":", 1) for line in lines[1:] if ":" in line)
+            }
+            url = urlsplit(target)
+            if url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self.websocket(reader, writer, headers)
+            elif url.path == "/frame":
+                query = dict(parse_qsl(url.query))
+                try:
+                    png, _ = await self.render(query.get("view", "diagram"), query)
+                except (KeyError, ValueError) as err:
+                    await respond(writer, 400, "text/plain", str(err).encode())
+                else:
+                    await respond(writer, 200, "image/png", png)
+            elif url.path == "/stats":
+                await respond(writer, 200, "application/json", json.dumps(self.explorer.summary()).encode())
+            elif url.path == "/":
+                await respond(writer, 200, "text/html; charset=utf-8", INDEX_HTML.encode())
+            else:
+                await respond(writer, 404, "text/plain", b"not found")
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def websocket(self, reader, writer, headers):
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {ws_accept_key(headers['sec-websocket-key'])}\r\n\r\n"
+        ).encode())
+        await writer.drain()
+
+        mailbox = LatestOnly()
+        sender = asyncio.create_task(self._send_frames(writer, mailbox))
+        try:
+            while True:
+                opcode, data = await ws_recv(reader)
+                if opcode == OP_CLOSE:
+                    break
+                if opcode == OP_PING:
+                    await ws_send(writer, data, opcode=OP_PONG)
+                elif opcode == OP_TEXT:
+                    mailbox.put(json.loads(data))
+        except (asyncio.IncompleteReadError, ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            self.explorer.stats["coalesced"] += mailbox.dropped
+            mailbox.put(None)
+            await asyncio.gather(sender, return_exceptions=True)
+
+    async def _send_frames(self, writer, mailbox: LatestOnly):
+        while (message := await mailbox.get()) is not None:
+            view = message.get("view", "diagram")
+            start = time.perf_counter()
+            try:
+                png, cached = await self.render(view, message)
+            except (KeyError, ValueError) as err:
+                await ws_send(writer, json.dumps({"seq": message.get("seq"), "error": str(err)}))
+                continue
+            values = quantize(message, self.explorer.quantum)
+            await ws_send(writer, json.dumps({
+                "seq": message.get("seq"),
+                "view": view,
+                "cached": cached,
+                "render_ms": round(1000 * (time.perf_counter() - start), 2),
+                "posterior": posterior(*values),
+            }))
+            await ws_send(writer, png)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(f"Bayes explorer on http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+# --------------------------------------------------------------------
+# Load test: simulated slider drags over the WebSocket
+# --------------------------------------------------------------------
+async def _drag_client(url, seconds, rate, views, seed) -> dict:
+    rng = random.Random(seed)
+    reader, writer = await ws_connect(url)
+    params = dict(DEFAULT_PARAMS)
+    sent_at, latencies = {}, []
+    seen = {"seq": 0, "cached": 0}
+
+    async def receive():
+        header = None
+        while True:
+            opcode, data = await ws_recv(reader)
+            if opcode == OP_TEXT:
+                header = json.loads(data)
+                if "error" in header:
+                    raise RuntimeError(header["error"])
+            elif opcode == OP_BINARY and header is not None:
+                latencies.append(time.perf_counter() - sent_at.pop(header["seq"]))
+                seen["seq"] = header["seq"]
+                seen["cached"] += header["cached"]
+                for seq in [s for s in sent_at if s < header["seq"]]:
+                    del sent_at[seq]  # coalesced away
+
+    receiver = asyncio.create_task(receive())
+    seq = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        # drag one slider a little, like a hand would
+        name = rng.choice(PARAMS)
+        params[name] = min(max(params[name] + rng.gauss(0, 0.01), 0.0), 1.0)
+        seq += 1
+        view = views[int(time.perf_counter() * 0.5) % len(views)]
+        sent_at[seq] = time.perf_counter()
+        await ws_send(writer, json.dumps({"seq": seq, "view": view, **params}), mask=True)
+        await asyncio.sleep(1 / rate)
+
+    # the newest event is never coalesced away, so its frame must arrive
+    deadline = time.perf_counter() + 10
+    while seen["seq"] < seq and not receiver.done() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+    receiver.cancel()
+    await asyncio.gather(receiver, return_exceptions=True)
+    await ws_send(writer, b"", opcode=OP_CLOSE, mask=True)
+    writer.close()
+    if seen["seq"] < seq:
+        raise RuntimeError(f"no frame for the last event ({seen['seq']} < {seq})")
+    return {"sent": seq, "latencies": latencies, "cached": seen["cached"]}
+
+
+async def load_test(url, seconds=10.0, rate=120.0, clients=1, views=("diagram", "fraction", "bar")) -> dict:
+    results = await asyncio.gather(*(
+        _drag_client(url, seconds, rate, list(views), seed) for seed in range(clients)
+    ))
+    latencies = np.array([lat for r in results for lat in r["latencies"]]) * 1000
+    frames = len(latencies)
+    sent = sum(r["sent"] for r in results)
+    return {
+        "events": sent,
+        "frames": frames,
+        "coalesced": sent - frames,
+        "cache_hit_rate": round(sum(r["cached"] for r in results) / max(frames, 1), 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "max_ms": round(float(latencies.max()), 2),
+    }
+
+
+async def _wait_for_port(host, port, timeout=120.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.25)
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the explorer server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--size", default="854x480", help="frame size in pixels, WxH")
+    serve.add_argument("--quantum", type=float, default=QUANTUM, help="parameter step of the frame cache")
+
+    load = commands.add_parser("loadtest", help="measure slider-to-frame latency")
+    load.add_argument("--url", default=f"ws://127.0.0.1:{DEFAULT_PORT}/ws")
+    load.add_argument("--spawn", action="store_true", help="start a server for the test")
+    load.add_argument("--seconds", type=float, default=10.0)
+    load.add_argument("--rate", type=float, default=120.0, help="slider events per second per client")
+    load.add_argument("--clients", type=int, default=1)
+    load.add_argument("--target-ms", type=float, default=TARGET_MS, help="fail when p95 is above this")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        width, height = (int(n) for n in args.size.split("x"))
+        explorer = Explorer(width, height, quantum=args.quantum)
+        explorer.warm()
+        try:
+            asyncio.run(ExplorerServer(explorer).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    parts = urlsplit(args.url)
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([
+            sys.executable, str(Path(__file__).resolve()), "serve",
+            "--host", parts.hostname, "--port", str(parts.port or 80),
+        ])
+    try:
+        if server is not None:
+            asyncio.run(_wait_for_port(parts.hostname, parts.port or 80))
+        report = asyncio.run(load_test(args.url, args.seconds, args.rate, args.clients))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=1))
+    sys.exit(1 if report["p95_ms"] > args.target_ms else 0)
+
+
+if __name__ == "__main__":
+    _main()
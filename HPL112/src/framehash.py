@@ -0,0 +1,196 @@
+"""
+Per-frame content hashes for regression checks.
+
+With hashing on, every frame handed to the file writer is hashed
+(BLAKE2b, 64-bit digest, over the raw RGBA buffer) and each scene writes a
+compact manifest: run-length encoded digests plus the frame index where
+every play()/wait() starts. Comparing two manifests gives the first
+differing frame, its time and its play index -- much cheaper than
+comparing encoded videos, and the check the caching / partial /
+parallel render tools rely on.
+
+Turn it on for normal renders with an environment variable:
+    BAYES_FRAME_HASHES=hashes/ manim -ql HPL112/src/main.py Scene4_BayesVisualization
+
+or use the CLI (run from the repo root):
+    python HPL112/src/framehash.py record Scene3_WhatIsBayesianism --out hashes/
+    python HPL112/src/framehash.py diff before/Scene3_WhatIsBayesianism.json after/Scene3_WhatIsBayesianism.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from manim import config, tempconfig
+
+from framepool import PooledCairoRenderer, PooledFrameScene
+
+HASH_ENV_VAR = "BAYES_FRAME_HASHES"
+DEFAULT_SEED = 0
+
+
+def frame_digest(frame) -> str:
+    return hashlib.blake2b(memoryview(frame).cast("B"), digest_size=8).hexdigest()
+
+
+class FrameHashRenderer(PooledCairoRenderer):
+    """PooledCairoRenderer that records a digest for every written frame."""
+
+    def __init__(self, manifest_dir=None, seed=DEFAULT_SEED, **kwargs):
+        super().__init__(**kwargs)
+        # cached partial movies skip rendering, so there would be nothing to hash
+        config.disable_caching = True
+        self.manifest_dir = Path(manifest_dir) if manifest_dir is not None else None
+        self.seed = seed
+        self.runs = []          # [digest, count] pairs
+        self.num_frames = 0
+        self.play_starts = []
+
+    def play(self, scene, *args, **kwargs):
+        self.play_starts.append(self.num_frames)
+        return super().play(scene, *args, **kwargs)
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.skip_animations and num_frames > 0:
+            digest = frame_digest(frame)
+            if self.runs and self.runs[-1][0] == digest:
+                self.runs[-1][1] += num_frames
+            else:
+                self.runs.append([digest, num_frames])
+            self.num_frames += num_frames
+        super().add_frame(frame, num_frames)
+
+    def manifest(self, scene_name: str) -> dict:
+        return {
+            "scene": scene_name,
+            "hash": "blake2b-64",
+            "seed": self.seed,
+            "frame_rate": config.frame_rate,
+            "pixel_width": config.pixel_width,
+            "pixel_height": config.pixel_height,
+            "num_frames": self.num_frames,
+            "play_starts": self.play_starts,
+            "frames": self.runs,
+        }
+
+    def scene_finished(self, scene):
+        super().scene_finished(scene)
+        if self.manifest_dir is not None:
+            write_manifest(self.manifest(type(scene).__name__), self.manifest_dir)
+
+
+class FrameHashScene(PooledFrameScene):
+    """Records frame hashes when BAYES_FRAME_HASHES names an output directory."""
+
+    def __init__(self, renderer=None, **kwargs):
+        if os.environ.get(HASH_ENV_VAR):
+            kwargs.setdefault("random_seed", DEFAULT_SEED)
+        super().__init__(renderer=renderer, **kwargs)
+
+    def make_renderer(self, skip_animations=False, **kwargs):
+        manifest_dir = os.environ.get(HASH_ENV_VAR)
+        if manifest_dir:
+            return FrameHashRenderer(manifest_dir=manifest_dir, skip_animations=skip_animations, **kwargs)
+        return super().make_renderer(skip_animations=skip_animations, **kwargs)
+
+
+# --------------------------------------------------------------------
+# Manifests
+# --------------------------------------------------------------------
+def write_manifest(manifest: dict, directory) -> Path:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{manifest['scene']}.json"
+    path.write_text(json.dumps(manifest, separators=(",", ":")))
+    return path
+
+
+def read_manifest(path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def iter_digests(manifest: dict):
+    for digest, count in manifest["frames"]:
+        for _ in range(count):
+            yield digest
+
+
+def first_difference(a: dict, b: dict):
+    """
+    Index of the first frame where two manifests differ, or None if they
+    match. A length mismatch counts as a difference at the shorter end.
+    """
+    for key in ("frame_rate", "pixel_width", "pixel_height"):
+        if a[key] != b[key]:
+            raise ValueError(f"manifests differ in {key}: {a[key]} vs {b[key]}")
+
+    index = 0
+    for digest_a, digest_b in zip(iter_digests(a), iter_digests(b)):
+        if digest_a != digest_b:
+            return index
+        index += 1
+    if a["num_frames"] != b["num_frames"]:
+        return index
+    return None
+
+
+def describe_frame(manifest: dict, index: int) -> str:
+    play = bisect.bisect_right(manifest["play_starts"], index) - 1
+    seconds = index / manifest["frame_rate"]
+    return f"frame {index} (t={seconds:.3f}s, play #{play})"
+
+
+# --------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------
+def record(scene_names, out_dir, quality="low_quality", seed=DEFAULT_SEED, write_video=False):
+    import main
+
+    paths = []
+    for name in scene_names:
+        settings = {"quality": quality, "disable_caching": True, "write_to_movie": write_video}
+        with tempconfig(settings):
+            renderer = FrameHashRenderer(manifest_dir=out_dir, seed=seed)
+            getattr(main, name)(renderer=renderer, random_seed=seed).render()
+        paths.append(Path(out_dir) / f"{name}.json")
+    return paths
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="render scenes and write hash manifests")
+    rec.add_argument("scenes", nargs="+")
+    rec.add_argument("--out", default="hashes")
+    rec.add_argument("--quality", default="low_quality")
+    rec.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    rec.add_argument("--video", action="store_true", help="also write the movie files")
+
+    diff = sub.add_parser("diff", help="report the first differing frame of two manifests")
+    diff.add_argument("a")
+    diff.add_argument("b")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        for path in record(args.scenes, args.out, args.quality, args.seed, args.video):
+            print(path)
+        return
+
+    a, b = read_manifest(args.a), read_manifest(args.b)
+    index = first_difference(a, b)
+    if index is None:
+        print(f"{a['scene']}: identical ({a['num_frames']} frames)")
+        return
+    print(f"{a['scene']}: first difference at {describe_frame(a, index)}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    _main()
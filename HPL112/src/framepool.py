@@ -0,0 +1,247 @@
+"""
+No per-frame buffers in the Cairo render path.
+
+Stock manim allocates three full-size buffers per frame:
+Camera.reset() pushes the background through convert_pixel_array (a copy),
+CairoRenderer.get_frame() hands the file writer np.array(pixel_array)
+(another copy), and SceneFileWriter.write_frame() pipes frame.tobytes()
+(a third). At 30 fps that is thousands of throwaway frames for
+FullBayesMovie.
+
+The camera's own pixel array is the one reused buffer: PooledCamera clears
+it to the background with one uint32 fill, PooledCairoRenderer hands it
+straight to add_frame() (everything downstream -- the encoder pipe, frame
+hashes, the frame store -- is done with it before add_frame() returns),
+and PooledFileWriter writes it to ffmpeg's stdin through a memoryview.
+
+Benchmark (run from the repo root): both modes take the same tracemalloc
+snapshots while frames are piped to ffmpeg and count frame-sized blocks
+beyond those alive before the first play, next to peak RSS.
+    python HPL112/src/framepool.py                 # every scene in main.py
+    python HPL112/src/framepool.py Scene4_BayesVisualization
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+import numpy as np
+from manim import Camera, Scene, config, tempconfig
+from manim.constants import RendererType
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_png_format, write_to_movie
+
+SAMPLE_EVERY = 30  # benchmark: frames between tracemalloc snapshots
+
+
+class PooledFileWriter(SceneFileWriter):
+    """SceneFileWriter that pipes frames to ffmpeg without a bytes copy."""
+
+    def write_frame(self, frame_or_renderer):
+        if config.renderer != RendererType.CAIRO or not write_to_movie():
+            return super().write_frame(frame_or_renderer)
+        frame = np.ascontiguousarray(frame_or_renderer)  # no-op for the camera's array
+        self.writing_process.stdin.write(memoryview(frame).cast("B"))
+        if is_png_format() and not config["dry_run"]:
+            self.output_image_from_array(frame)
+
+
+class PooledCamera(Camera):
+    """
+    Camera whose reset() is a single fill of the existing pixel array.
+
+    The packed RGBA background is recomputed in init_background(), so
+    setting camera.background_color (as Scene5-7 do) still works.
+    """
+
+    def init_background(self):
+        super().init_background()
+        self._background_fill = None
+        if self.background_image is None:
+            rgba = np.ascontiguousarray(self.background[0, 0], dtype=np.uint8)
+            if self.n_channels == 4 and self.background.dtype == np.uint8:
+                self._background_fill = rgba.view(np.uint32)[0]
+
+    def reset(self):
+        pixel_array = getattr(self, "pixel_array", None)
+        if (
+            self._background_fill is None
+            or pixel_array is None
+            or pixel_array.shape != self.background.shape
+            or not pixel_array.flags.c_contiguous
+        ):
+            return super().reset()
+        # memset-like clear: one pass over the frame as packed uint32 pixels
+        pixel_array.view(np.uint32).fill(self._background_fill)
+        return self
+
+    def set_frame_to_background(self, background):
+        pixel_array = getattr(self, "pixel_array", None)
+        if pixel_array is not None and pixel_array.shape == background.shape:
+            np.copyto(pixel_array, background)
+        else:
+            super().set_frame_to_background(background)
+
+
+class PooledCairoRenderer(CairoRenderer):
+    """
+    CairoRenderer that hands add_frame() the camera's pixel array itself.
+
+    get_frame() keeps returning an independent copy, because the static
+    background image and external callers hold on to it; only the per-frame
+    path (render / freeze_current_frame) skips it. add_frame() overrides
+    must be done with the frame when they return: the next frame is drawn
+    into the same array.
+    """
+
+    def __init__(
+        self,
+        file_writer_class=PooledFileWriter,
+        camera_class=PooledCamera,
+        skip_animations=False,
+        **kwargs,
+    ):
+        super().__init__(
+            file_writer_class=file_writer_class,
+            camera_class=camera_class,
+            skip_animations=skip_animations,
+            **kwargs,
+        )
+
+    def render(self, scene, time, moving_mobjects):
+        self.update_frame(scene, moving_mobjects)
+        self.add_frame(self.camera.pixel_array)
+
+    def freeze_current_frame(self, duration: float):
+        dt = 1 / self.camera.frame_rate
+        self.add_frame(self.camera.pixel_array, num_frames=int(duration / dt))
+
+
+class PooledFrameScene(Scene):
+    """Scene that renders through PooledCairoRenderer unless told otherwise."""
+
+    def __init__(self, renderer=None, **kwargs):
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            renderer = self.make_renderer(skip_animations=kwargs.get("skip_animations", False))
+        super().__init__(renderer=renderer, **kwargs)
+
+    def make_renderer(self, skip_animations=False, **kwargs):
+        """Called before Scene.__init__; subclasses swap in their own renderer."""
+        return PooledCairoRenderer(skip_animations=skip_animations, **kwargs)
+
+
+# --------------------------------------------------------------------
+# Benchmark: stock vs pooled, one child process per scene and mode
+# --------------------------------------------------------------------
+class _SampledPipe:
+    """ffmpeg's stdin, calling sample() before every sample_every-th write."""
+
+    def __init__(self, pipe, sample, sample_every):
+        self.pipe = pipe
+        self.sample = sample
+        self.sample_every = sample_every
+        self.writes = 0
+
+    def write(self, data):
+        if self.writes % self.sample_every == 0:
+            self.sample()  # while data, and any copy it was made from, is alive
+        self.writes += 1
+        return self.pipe.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.pipe, name)
+
+
+def _frame_blocks(frame_bytes) -> int:
+    """Traced blocks at least one frame in size, across Python and NumPy's domain."""
+    snapshot = tracemalloc.take_snapshot()
+    return sum(1 for trace in snapshot.traces if trace.size >= frame_bytes)
+
+
+def _measure_scene(scene_name: str, pooled: bool, quality: str, sample_every=SAMPLE_EVERY) -> dict:
+    import main
+
+    scene_cls = getattr(main, scene_name)
+    with tempconfig({"quality": quality, "disable_caching": True, "preview": False}):
+        frame_bytes = config.pixel_width * config.pixel_height * 4
+        tracemalloc.start()
+        renderer = PooledCairoRenderer() if pooled else CairoRenderer()
+        scene = scene_cls(renderer=renderer)
+        file_writer = renderer.file_writer
+        samples = []
+        baseline = _frame_blocks(frame_bytes)
+
+        open_movie_pipe = file_writer.open_movie_pipe
+
+        def sampled_open_movie_pipe(*args, **kwargs):
+            open_movie_pipe(*args, **kwargs)
+            stdin = file_writer.writing_process.stdin
+            file_writer.writing_process.stdin = _SampledPipe(stdin, sample, sample_every)
+
+        def sample():
+            samples.append(max(_frame_blocks(frame_bytes) - baseline, 0))
+
+        file_writer.open_movie_pipe = sampled_open_movie_pipe
+        start = time.perf_counter()
+        scene.render()
+        elapsed = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    per_frame = sum(samples) / len(samples) if samples else 0.0
+    return {
+        "scene": scene_name,
+        "mode": "pooled" if pooled else "stock",
+        "frame_buffers_per_frame": round(per_frame, 2),
+        "sampled_frames": len(samples),
+        "seconds": round(elapsed, 2),
+        "traced_peak_mb": round(traced_peak / 2**20, 1),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def benchmark(scene_names, quality="low_quality") -> list[dict]:
+    """
+    Render each scene twice (stock renderer, then pooled) in fresh
+    processes so peak RSS is per scene, and return one row per run.
+    """
+    ctx = get_context("spawn")
+    rows = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for name in scene_names:
+            for pooled in (False, True):
+                rows.append(pool.apply(_measure_scene, (name, pooled, quality)))
+    return rows
+
+
+def _scene_names() -> list[str]:
+    import main
+
+    return [
+        name for name, obj in vars(main).items()
+        if isinstance(obj, type) and issubclass(obj, Scene)
+        and obj.__module__ == "main" and "construct" in vars(obj)
+    ]
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene class names (default: all)")
+    parser.add_argument("--quality", default="low_quality")
+    args = parser.parse_args()
+
+    rows = benchmark(args.scenes or _scene_names(), quality=args.quality)
+    header = ("scene", "mode", "frame_buffers_per_frame", "sampled_frames", "traced_peak_mb", "peak_rss_mb", "seconds")
+    print("  ".join(f"{h:>18}" for h in header))
+    for row in rows:
+        print("  ".join(f"{str(row.get(h, '')):>18}" for h in header))
+
+
+if __name__ == "__main__":
+    _main()
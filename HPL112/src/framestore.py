@@ -0,0 +1,348 @@
+"""
+Raw frame store: every frame of a scene as uncompressed RGBA in one file,
+for frame-accurate review without seeking in compressed video.
+
+Layout of <Scene>.frames:
+
+    header      64 bytes (see HEADER), patched in when the scene finishes
+    frames      from DATA_OFFSET (page aligned): slot after slot of
+                height * width * 4 bytes
+    index       uint32 slot per frame, then uint64 first frame per play
+
+Consecutive identical frames (waits, frozen frames) share one slot, so a
+long wait costs one frame of disk. Reading memory-maps the file: frame i
+is slots[i] * frame_bytes past DATA_OFFSET and the start of play p is
+play_starts[p], both O(1) and without decoding anything. An 854x480 frame
+is 1.6 MB, so a 10-minute 30 fps scene is up to ~30 GB; this is a review
+tool, not an output format.
+
+    BAYES_FRAME_STORE=frames/ manim -ql HPL112/src/main.py Scene5_BayesEquationWithDiagrams
+    python HPL112/src/framestore.py record Scene5_BayesEquationWithDiagrams --out frames/
+    python HPL112/src/framestore.py view frames/Scene5_BayesEquationWithDiagrams.frames   # http://127.0.0.1:8766/
+
+or from Python:
+
+    store = FrameStore("frames/Scene5_BayesEquationWithDiagrams.frames")
+    store[store.play_start(12) - 1]     # last frame before play 12, an (h, w, 4) view
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+from manim import config, logger, tempconfig
+
+from framehash import HASH_ENV_VAR
+from framepool import PooledCairoRenderer, PooledFrameScene
+from localserver import respond
+
+STORE_ENV_VAR = "BAYES_FRAME_STORE"
+SUFFIX = ".frames"
+MAGIC = b"BAYESRGB"
+VERSION = 1
+# magic, version, channels, width, height, reserved, frame rate,
+# frames, slots, index offset, plays
+HEADER = struct.Struct("<8sHHIIIdQQQQ")
+DATA_OFFSET = 4096
+DEFAULT_PORT = 8766
+
+
+# --------------------------------------------------------------------
+# Writing
+# --------------------------------------------------------------------
+class FrameStoreWriter:
+    def __init__(self, path, width: int, height: int, frame_rate: float, channels: int = 4):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.shape = (height, width, channels)
+        self.frame_rate = frame_rate
+        self.slots = []
+        self.play_starts = []
+        self.num_slots = 0
+        self._last = None
+        self._file = open(self.path, "wb")
+        # zeroed header until close(): a store from a killed render reads as incomplete
+        self._file.write(bytes(DATA_OFFSET))
+
+    def mark_play(self):
+        self.play_starts.append(len(self.slots))
+
+    def append(self, frame: np.ndarray, num_frames: int = 1):
+        if num_frames <= 0:
+            return
+        if frame.shape != self.shape:
+            raise ValueError(f"frame shape {frame.shape} does not match the store's {self.shape}")
+        if self._last is None or not np.array_equal(frame, self._last):
+            self._file.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+            self._last = frame.copy()
+            self.num_slots += 1
+        self.slots.extend([self.num_slots - 1] * num_frames)
+
+    def close(self):
+        if self._file.closed:
+            return
+        index_offset = DATA_OFFSET + self.num_slots * int(np.prod(self.shape))
+        self._file.write(np.asarray(self.slots, dtype="<u4").tobytes())
+        if len(self.slots) % 2:
+            self._file.write(bytes(4))  # keep the uint64 play starts aligned
+        self._file.write(np.asarray(self.play_starts, dtype="<u8").tobytes())
+        height, width, channels = self.shape
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, channels, width, height, 0, float(self.frame_rate),
+            len(self.slots), self.num_slots, index_offset, len(self.play_starts),
+        ))
+        self._file.close()
+
+
+class FrameStoreRenderer(PooledCairoRenderer):
+    """PooledCairoRenderer that also writes every frame to a FrameStoreWriter."""
+
+    def __init__(self, store_dir, **kwargs):
+        super().__init__(**kwargs)
+        # cached partial movies skip rendering, so their frames would be missing
+        config.disable_caching = True
+        self.store_dir = Path(store_dir)
+        self.store = None
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        height, width = self.camera.pixel_array.shape[:2]
+        path = self.store_dir / f"{type(scene).__name__}{SUFFIX}"
+        self.store = FrameStoreWriter(path, width, height, self.camera.frame_rate)
+
+    def play(self, scene, *args, **kwargs):
+        self.store.mark_play()
+        return super().play(scene, *args, **kwargs)
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.skip_animations:
+            self.store.append(frame, num_frames)
+        super().add_frame(frame, num_frames)
+
+    def scene_finished(self, scene):
+        super().scene_finished(scene)
+        self.store.close()
+        logger.info(f"Frame store: {self.store.path} ({len(self.store.slots)} frames, {self.store.num_slots} stored)")
+
+
+class FrameStoreScene(PooledFrameScene):
+    """Writes a raw frame store when BAYES_FRAME_STORE names an output directory."""
+
+    def make_renderer(self, skip_animations=False, **kwargs):
+        store_dir = os.environ.get(STORE_ENV_VAR)
+        if store_dir:
+            if os.environ.get(HASH_ENV_VAR):
+                # each needs its own renderer; one of them would silently record nothing
+                raise ValueError(f"{STORE_ENV_VAR} and {HASH_ENV_VAR} cannot be set for the same render")
+            return FrameStoreRenderer(store_dir, skip_animations=skip_animations, **kwargs)
+        return super().make_renderer(skip_animations=skip_animations, **kwargs)
+
+
+# --------------------------------------------------------------------
+# Reading
+# --------------------------------------------------------------------
+class FrameStore:
+    """Memory-mapped read access; frames come back as read-only (h, w, 4) views."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+        magic, version, channels, width, height, _, fps, num_frames, num_slots, index_offset, num_plays = fields
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a frame store (or its render never finished)")
+        if version != VERSION:
+            raise ValueError(f"{self.path} has store version {version}, expected {VERSION}")
+        if num_frames == 0:
+            raise ValueError(f"{self.path} has no frames")
+        self.width, self.height, self.frame_rate = width, height, fps
+        self.frames = np.memmap(self.path, np.uint8, "r", DATA_OFFSET, (num_slots, height, width, channels))
+        self.slots = np.memmap(self.path, "<u4", "r", index_offset, (num_frames,))
+        plays_offset = index_offset + 4 * (num_frames + num_frames % 2)
+        self.play_starts = np.memmap(self.path, "<u8", "r", plays_offset, (num_plays,)) if num_plays else np.zeros(0, "<u8")
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.frame(index)
+
+    def frame(self, index: int) -> np.ndarray:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"frame {index} out of range (0..{len(self) - 1})")
+        return self.frames[self.slots[index]]
+
+    @property
+    def num_plays(self) -> int:
+        return len(self.play_starts)
+
+    def play_start(self, play: int) -> int:
+        """First frame of a play (== len(self) for a trailing play with no frames)."""
+        return int(self.play_starts[play])
+
+    def play_of(self, index: int) -> int:
+        return int(np.searchsorted(self.play_starts, index, side="right")) - 1
+
+    def time_of(self, index: int) -> float:
+        return index / self.frame_rate
+
+    def info(self) -> dict:
+        return {
+            "file": str(self.path),
+            "width": self.width,
+            "height": self.height,
+            "frame_rate": self.frame_rate,
+            "frames": len(self),
+            "stored": len(self.frames),
+            "play_starts": [int(s) for s in self.play_starts],
+        }
+
+
+# --------------------------------------------------------------------
+# Viewer
+# --------------------------------------------------------------------
+VIEWER_HTML = """<!doctype html>
+<meta charset="utf-8"><title>frame store</title>
+<style>
+ body { background: #0e0e10; color: #ddd; font: 14px monospace; margin: 16px; }
+ canvas { display: block; margin: 10px 0; max-width: 100%; background: #000; }
+ input[type=range] { width: 100%; }
+</style>
+<div><button id="pp">&laquo; play</button> <button id="pf">&lsaquo; frame</button>
+<button id="nf">frame &rsaquo;</button> <button id="np">play &raquo;</button> <span id="info"></span></div>
+<canvas id="c"></canvas><input type="range" id="slider" min="0" value="0">
+<div>&larr;/&rarr; frame, shift+&larr;/&rarr; or PageUp/PageDown play boundary, Home/End</div>
+<script>
+let meta, current = 0, wanted = 0, busy = false;
+const canvas = document.getElementById("c"), ctx = canvas.getContext("2d");
+const slider = document.getElementById("slider");
+function playOf(i) { let p = 0; while (p + 1 < meta.play_starts.length && meta.play_starts[p + 1] <= i) p++; return p; }
+async function show() {
+  if (busy) return;
+  busy = true;
+  while (wanted !== current || !canvas.dataset.ready) {
+    const i = wanted;
+    const buf = await (await fetch(`/raw?i=${i}`)).arrayBuffer();
+    ctx.putImageData(new ImageData(new Uint8ClampedArray(buf), meta.width, meta.height), 0, 0);
+    current = i; canvas.dataset.ready = 1; slider.value = i;
+    document.getElementById("info").textContent =
+      `frame ${i}/${meta.frames - 1}  t=${(i / meta.frame_rate).toFixed(3)}s  play #${playOf(i)}`;
+  }
+  busy = false;
+}
+function go(i) { wanted = Math.max(0, Math.min(meta.frames - 1, i)); show(); }
+function jumpPlay(step) {
+  const starts = meta.play_starts.filter(s => s < meta.frames);
+  const target = step > 0 ? starts.find(s => s > wanted) : [...starts].reverse().find(s => s < wanted);
+  if (target !== undefined) go(target);
+}
+fetch("/meta").then(r => r.json()).then(m => {
+  meta = m; canvas.width = m.width; canvas.height = m.height; slider.max = m.frames - 1; go(0);
+});
+slider.oninput = () => go(+slider.value);
+document.getElementById("pf").onclick = () => go(wanted - 1);
+document.getElementById("nf").onclick = () => go(wanted + 1);
+document.getElementById("pp").onclick = () => jumpPlay(-1);
+document.getElementById("np").onclick = () => jumpPlay(1);
+document.onkeydown = (e) => {
+  if (e.key === "ArrowLeft") e.shiftKey ? jumpPlay(-1) : go(wanted - 1);
+  else if (e.key === "ArrowRight") e.shiftKey ? jumpPlay(1) : go(wanted + 1);
+  else if (e.key === "PageUp") jumpPlay(-1);
+  else if (e.key === "PageDown") jumpPlay(1);
+  else if (e.key === "Home") go(0);
+  else if (e.key === "End") go(meta.frames - 1);
+  else return;
+  e.preventDefault();
+};
+</script>
+"""
+
+
+async def _handle(store: FrameStore, reader, writer):
+    try:
+        request = await reader.readuntil(b"\r\n\r\n")
+        url = urlsplit(request.decode("latin-1").split(" ", 2)[1])
+        if url.path == "/raw":
+            try:
+                frame = store.frame(int(dict(parse_qsl(url.query)).get("i", 0)))
+            except (IndexError, ValueError) as err:
+                await respond(writer, 400, "text/plain", str(err).encode())
+            else:
+                await respond(writer, 200, "application/octet-stream", frame.tobytes())
+        elif url.path == "/meta":
+            await respond(writer, 200, "application/json", json.dumps(store.info()).encode())
+        elif url.path == "/":
+            await respond(writer, 200, "text/html; charset=utf-8", VIEWER_HTML.encode())
+        else:
+            await respond(writer, 404, "text/plain", b"not found")
+    except (asyncio.IncompleteReadError, ConnectionError, IndexError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(store: FrameStore, host="127.0.0.1", port=DEFAULT_PORT):
+    server = await asyncio.start_server(lambda r, w: _handle(store, r, w), host, port)
+    logger.info(f"Frame viewer for {store.path.name} on http://{host}:{port}/")
+    async with server:
+        await server.serve_forever()
+
+
+# --------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------
+def record(scene_names, out_dir, quality="low_quality", write_video=False):
+    import main
+
+    paths = []
+    for name in scene_names:
+        with tempconfig({"quality": quality, "disable_caching": True, "write_to_movie": write_video}):
+            renderer = FrameStoreRenderer(out_dir)
+            getattr(main, name)(renderer=renderer).render()
+        paths.append(Path(out_dir) / f"{name}{SUFFIX}")
+    return paths
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="render scenes into frame stores")
+    rec.add_argument("scenes", nargs="+")
+    rec.add_argument("--out", default="frames")
+    rec.add_argument("--quality", default="low_quality")
+    rec.add_argument("--video", action="store_true", help="also write the movie files")
+
+    info = sub.add_parser("info", help="print a store's header and play boundaries")
+    info.add_argument("store")
+
+    view = sub.add_parser("view", help="serve a store to the browser viewer")
+    view.add_argument("store")
+    view.add_argument("--host", default="127.0.0.1")
+    view.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        for path in record(args.scenes, args.out, args.quality, args.video):
+            print(path)
+    elif args.command == "info":
+        print(json.dumps(FrameStore(args.store).info(), indent=1))
+    else:
+        try:
+            asyncio.run(serve(FrameStore(args.store), args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,161 @@
+"""
+Mobject lifecycle tracking for multi-segment scenes (FullBayesMovie).
+
+FullBayesMovie runs seven scenes' construct() on one Scene instance. The
+scene's locals die with each construct(), but the scene and renderer keep
+the last play's animations (Transform start/target copies, the Group
+handed to FadeOut, PlannedAnimation buffers), the moving/static mobject
+lists and the static background frame alive into the next segment.
+
+end_segment() drops those references and collects garbage between
+segments. With BAYES_LIFECYCLE=<report.json> set it also records, after
+each segment, the live mobject count, their point/pixel bytes and current
+RSS, and lists mobjects that are off screen but still referenced (with
+what references them), so leaks show up per segment instead of as a
+slowly growing peak.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from manim import Animation, Mobject, Scene, logger
+
+LIFECYCLE_ENV_VAR = "BAYES_LIFECYCLE"
+
+# attributes holding per-mobject copies made by generate_target()/save_state()
+GENERATED_COPIES = ("target", "saved_state")
+
+
+def mobject_bytes(mob) -> int:
+    total = 0
+    for attr in ("points", "rgbas", "pixel_array", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"):
+        value = getattr(mob, attr, None)
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+    return total
+
+
+def reachable_mobjects(roots) -> list[Mobject]:
+    """
+    Mobjects reachable from roots through lists, submobjects, generated
+    copies and the attributes of animations (start/target copies, groups).
+    """
+    found, seen, stack = [], set(), [roots]
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, Mobject):
+            found.append(obj)
+            stack.extend(obj.submobjects)
+            stack.extend(getattr(obj, attr, None) for attr in GENERATED_COPIES)
+        elif isinstance(obj, Animation):
+            stack.extend(vars(obj).values())
+    return found
+
+
+def current_rss() -> int | None:
+    """Resident set size in bytes (Linux), None elsewhere."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _referrer_kinds(obj, ignore) -> list[str]:
+    kinds = []
+    for ref in gc.get_referrers(obj):
+        if id(ref) in ignore:
+            continue
+        if isinstance(ref, dict):
+            owners = [o for o in gc.get_referrers(ref) if getattr(o, "__dict__", None) is ref]
+            kinds.append(f"{type(owners[0]).__name__}.__dict__" if owners else "dict")
+        else:
+            kinds.append(type(ref).__name__)
+    return kinds
+
+
+def census(scene: Scene, label: str, top: int = 10) -> dict:
+    gc.collect()
+    on_screen = {id(m) for m in scene.get_mobject_family_members()}
+    live = [o for o in gc.get_objects() if isinstance(o, Mobject)]
+    retained = [m for m in live if id(m) not in on_screen]
+
+    referrers = Counter()
+    ignore = {id(live), id(retained)}
+    for mob in retained[:500]:  # sampling keeps gc.get_referrers affordable
+        referrers.update(_referrer_kinds(mob, ignore))
+
+    row = {
+        "segment": label,
+        "live_mobjects": len(live),
+        "on_screen": len(on_screen),
+        "retained_off_screen": len(retained),
+        "point_bytes": sum(mobject_bytes(m) for m in live),
+        "retained_bytes": sum(mobject_bytes(m) for m in retained),
+        "rss_bytes": current_rss(),
+        "retained_by_class": dict(Counter(type(m).__name__ for m in retained).most_common(top)),
+        "retained_referrers": dict(referrers.most_common(top)),
+    }
+    del live, retained
+    return row
+
+
+class LifecycleScene(Scene):
+    """Scene made of several segments; call end_segment() after each one."""
+
+    def setup(self):
+        super().setup()
+        self.lifecycle_report = []
+        self.lifecycle_path = os.environ.get(LIFECYCLE_ENV_VAR)
+        self.segment_ends = []  # (label, plays so far); narration.py places clips by it
+
+    def release_segment(self):
+        """Drop what the scene and renderer still hold from finished plays."""
+        on_screen = {id(m) for m in self.get_mobject_family_members()}
+        held = reachable_mobjects([
+            self.mobjects, self.foreground_mobjects, self.animations or [],
+            self.moving_mobjects, self.static_mobjects, list(vars(self.renderer).values()),
+        ])
+
+        self.animations = []
+        self.moving_mobjects = []
+        self.static_mobjects = []
+        self.renderer.static_image = None
+
+        for mob in held:
+            if id(mob) not in on_screen:
+                for attr in GENERATED_COPIES:
+                    if getattr(mob, attr, None) is not None:
+                        setattr(mob, attr, None)
+        gc.collect()
+
+    def end_segment(self, label: str):
+        self.segment_ends.append((label, self.renderer.num_plays))
+        self.release_segment()
+        if self.lifecycle_path:
+            row = census(self, label)
+            self.lifecycle_report.append(row)
+            logger.info(
+                f"[lifecycle] {label}: {row['live_mobjects']} live mobjects "
+                f"({row['retained_off_screen']} off screen), "
+                f"{row['point_bytes'] / 2**20:.1f} MiB of point data, "
+                f"RSS {(row['rss_bytes'] or 0) / 2**20:.0f} MiB"
+            )
+
+    def tear_down(self):
+        super().tear_down()
+        if self.lifecycle_path and self.lifecycle_report:
+            path = Path(self.lifecycle_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.lifecycle_report, indent=1))
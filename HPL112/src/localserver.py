@@ -0,0 +1,19 @@
+"""
+HTTP/1.1 replies for the local browser tools (explorer.py, framestore.py).
+
+Both serve a page and a few endpoints from asyncio.start_server on
+localhost; one connection carries one request, so every reply closes it.
+"""
+
+from __future__ import annotations
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+
+async def respond(writer, status, content_type, body):
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
@@ -1,153 +1,193 @@
+from functools import lru_cache
+import math
+
 from manim import *
 import numpy as np
 
+from animplan import PlannedScene
+from bayesnet import BayesNet
+from checkpoint import CheckpointScene
+from framehash import FrameHashScene
+from framestore import FrameStoreScene
+from lifecycle import LifecycleScene
+from narration import NarratedScene
+from texbatch import TexPrepassScene
+from timeline import TIMELINE_DIR, run_timeline
+
 COLOR_POST = YELLOW_B
 COLOR_LIKE = BLUE_B
 COLOR_PRIOR = ORANGE
 COLOR_EVID = PURPLE_B
 BG = "#0e0e10"
 
-class Scene1_TitleCard(Scene):
-    def construct(self):
-        config.background_color = BG
 
-        title = Text("Bayesianism", weight="BOLD").scale(1.5)
-        title.set_color_by_gradient(BLUE_B, TEAL_A)
-        subtitle = Text("Bayes's theorem as the geometry of changing beliefs", font_size=36, color=TEAL_A)
-
-        line1 = Text("Joshua Hizgiaev", font_size=40, color=TEAL_B)
-        line2 = Text("HPL-112: Science and Metaphysics", font_size=36, color=TEAL_B)
-        line3 = Text("A quick study of history, meaning, and visualization", font_size=32, color=TEAL_A)
-
-        underline = Line(LEFT, RIGHT, color=TEAL_A).set_width(title.width * 1.06)
-
-        top = VGroup(title, underline, subtitle).arrange(DOWN, buff=0.25)
-        bottom = VGroup(line1, line2, line3).arrange(DOWN, buff=0.15)
-
-        group = VGroup(top, bottom).arrange(DOWN, buff=0.6)
-        group.move_to(ORIGIN)
-
-        self.play(Write(title), run_time = 1.2)
-        underline.next_to(title, DOWN, buff=0.18)
-        self.play(Create(underline), run_time=0.6)
-        self.play(FadeIn(subtitle, shift=0.2 * DOWN), run_time=0.8)
-        self.wait(0.3)
-        self.play(LaggedStart(
-            FadeIn(line1, shift=0.2 * DOWN),
-            FadeIn(line2, shift=0.2 * DOWN),
-            FadeIn(line3, shift=0.2 * DOWN),
-            lag_ratio=0.18, run_time=1.0
-        ))
-        self.wait(0.7)
-        self.play(Flash(title, line_length=0.25, color=str(TEAL_C), time_width=0.6), run_time=0.6)
-        
-        # Added longer wait for pacing
-        self.wait(4)
+class BayesScene(TexPrepassScene, PlannedScene, NarratedScene, CheckpointScene, FrameStoreScene, FrameHashScene):
+    """
+    Base for every scene in this file: pooled frame buffers, precompiled
+    interpolation plans for the deterministic play() calls, timings fitted
+    to recorded narration (see narration.py), optional per-frame
+    hashing (see framehash.py) or raw frame store (see framestore.py),
+    an optional one-pass LaTeX prepass (see texbatch.py) and optional
+    resumable checkpoints (see checkpoint.py).
+    """
+
+    # overridden by the parameterized variants orchestrate.py renders
+    parameters = {}
+
+    def param(self, name, default):
+        return self.parameters.get(name, default)
+
+    def play_timeline(self, filename):
+        """Play one of the declarative scenes in timelines/ (see timeline.py)."""
+        constants = {name: globals()[name] for name in TIMELINE_CONSTANTS}
+        return run_timeline(self, TIMELINE_DIR / filename, constants)
 
-class Scene2_History(Scene):
+
+# names the timeline files may use besides manim's own constants
+TIMELINE_CONSTANTS = ("BG", "COLOR_POST", "COLOR_LIKE", "COLOR_PRIOR", "COLOR_EVID", "EVIDENCE_COLOR1")
+
+
+class Scene1_TitleCard(BayesScene):
     def construct(self):
-        config.background_color = BG
+        self.play_timeline("scene1_title_card.toml")
 
-        # --- Title ---
-        title = Text(
-            "A short history of Bayes",
-            weight="BOLD"
-        ).set_color_by_gradient(BLUE_B, TEAL_A)
-        title.to_edge(UP, buff=0.6)
+class Scene2_History(BayesScene):
+    def construct(self):
+        self.play_timeline("scene2_history.toml")
 
-        # --- Image of Bayes on the right with a frame ---
-        bayes_img = ImageMobject("HPL112/src/images/Thomas_Bayes.gif")
-        bayes_img.set_height(3.5)
-        bayes_img.to_edge(RIGHT, buff=1.0)
-
-        frame = RoundedRectangle(
-            corner_radius=0.2,
-            height=bayes_img.height + 0.4,
-            width=bayes_img.width + 0.4,
-            color=TEAL_B,
-            stroke_width=3
-        )
-        frame.move_to(bayes_img)
+class AffineNudge(Animation):
+    """
+    Move a mobject by x -> A x + b, interpolated from the identity,
+    straight on its existing points (no .animate target copy).
+    """
 
-        caption = Text(
-            "Thomas Bayes (1701-1761)",
-            font_size=26,
-            color=TEAL_B
-        )
-        caption.next_to(frame, DOWN, buff=0.25)
-
-        # --- Bullet-point history on the left (multi-line, constrained) ---
-        bullet_specs = [
-            (
-                "• 18th-century English minister whose work on\n"
-                "  inverse probability was only published in 1763.",
-                {"18th-century": COLOR_EVID, "1763": COLOR_EVID, "inverse probability": COLOR_POST}
-            ),
-            (
-                "• Bayes's theorem gives a rule for updating a prior\n"
-                "  belief about a hypothesis when new evidence arrives.",
-                {"Bayes's theorem": COLOR_LIKE, "prior": COLOR_PRIOR, "evidence": COLOR_EVID}
-            ),
-            (
-                "• 20th-century Bayesians like Ramsey and de Finetti\n"
-                "  tied probability to fair betting rates and degrees of belief.",
-                {"Ramsey": TEAL_B, "de Finetti": TEAL_B, "degrees of belief": COLOR_PRIOR}
-            ),
-            (
-                "• Hacking, Howson & Urbach and Salmon used Bayesian\n"
-                "  ideas to analyse scientific reasoning and rationality.",
-                {"Hacking": TEAL_B, "Howson": TEAL_B, "Urbach": TEAL_B, "Salmon": TEAL_B}
-            ),
-            (
-                "• Today, Bayesian ideas sit alongside frequentist methods\n"
-                "  in statistics, and their debates fuel the 'statistics wars'.",
-                {"Bayesian": COLOR_POST, "frequentist": COLOR_LIKE, "statistics wars": COLOR_EVID}
-            ),
-        ]
+    def __init__(self, mobject, matrix=None, shift=ORIGIN, about_point=None, **kwargs):
+        super().__init__(mobject, **kwargs)
+        self.matrix = np.identity(3) if matrix is None else np.array(matrix, dtype=float)
+        self.shift_vector = np.array(shift, dtype=float)
+        self.about_point = about_point
+
+    def begin(self):
+        family = self.mobject.family_members_with_points()
+        self.family = family
+        self.offsets = np.cumsum([0] + [len(m.points) for m in family])
+        self.start_points = np.concatenate([m.points for m in family]) if family else np.zeros((0, 3))
+        about = self.about_point if self.about_point is not None else self.mobject.get_center()
+        self.about = np.array(about, dtype=float)
+        if self.suspend_mobject_updating:
+            self.mobject.suspend_updating()
+        self.interpolate(0)
+
+    def interpolate_mobject(self, alpha):
+        a = self.rate_func(alpha)
+        matrix = (1 - a) * np.identity(3) + a * self.matrix
+        points = (self.start_points - self.about) @ matrix.T + self.about + a * self.shift_vector
+        for i, mob in enumerate(self.family):
+            mob.points = points[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_all_mobjects(self):
+        return [self.mobject]
+
+
+class TermAnnotator:
+    """
+    Reusable “highlight + arrow + label” callouts for parts of a formula.
 
-        bullet_lines = VGroup()
-        for text, t2c in bullet_specs:
-            line = Text(
-                text,
-                font_size=26,
-                color=TEAL_B,
-                line_spacing=0.35
-            )
-            line.set_color_by_t2c(t2c)
-            bullet_lines.add(line)
+    specs is a list of (part, label_text, expl_text, color, position):
+      position = "above": label+arrow above, equation nudged down
+      position = "below": label+arrow below, equation nudged up
 
-        bullet_lines.arrange(DOWN, aligned_edge=LEFT, buff=0.35)
+    All labels are laid out in one Paragraph (and all explanations in
+    another), a single Arrow is retargeted for every term, and the
+    equation nudge is an AffineNudge on its own points, so the sequence
+    costs the same handful of constructions however many terms there are.
+    """
 
-        # Constrain the bullet group to the left-side space
-        # (frame_width minus image area and some margin)
-        left_width = config.frame_width - bayes_img.width - 2.5
-        if left_width > 0:
-            bullet_lines.set_width(left_width)
+    def __init__(self, equation, specs, label_font_size=32, expl_font_size=26,
+                 nudge=0.4, label_buff=0.7, arrow_buff=0.12):
+        self.equation = equation
+        self.nudge = nudge
+        self.label_buff = label_buff
+        self.arrow_buff = arrow_buff
+        self.parts = [spec[0] for spec in specs]
+        self.colors = [spec[3] for spec in specs]
+        self.positions = [spec[4] for spec in specs]
+
+        labels = Paragraph(*[spec[1] for spec in specs], font_size=label_font_size, weight="BOLD")
+        expls = Paragraph(*[spec[2] for spec in specs], font_size=expl_font_size)
+
+        self.label_groups = []
+        for label, expl, color in zip(labels.submobjects, expls.submobjects, self.colors):
+            label.set_color(color)
+            self.label_groups.append(
+                VGroup(label, expl).arrange(DOWN, aligned_edge=LEFT, buff=0.15)
+            )
 
-        bullet_lines.to_edge(LEFT, buff=0.7)
-        bullet_lines.shift(DOWN * 0.2)
+        self.arrow = None
 
-        # --- Animations ---
-        self.play(FadeIn(title, shift=0.2 * DOWN), run_time=0.9)
-        self.play(
-            FadeIn(bayes_img, shift=0.4 * LEFT),
-            Create(frame),
-            FadeIn(caption, shift=0.2 * DOWN),
-            run_time=1.2
-        )
-        self.wait(0.3)
+    def __len__(self):
+        return len(self.parts)
 
-        self.play(
-            LaggedStart(
-                *[Write(line) for line in bullet_lines],
-                lag_ratio=0.2,
-                run_time=3.5
+    def _point_arrow(self, start, end):
+        if self.arrow is None:
+            self.arrow = Arrow(
+                start=start,
+                end=end,
+                buff=self.arrow_buff,
+                stroke_width=2.2,
+                max_tip_length_to_length_ratio=0.10,
+            )
+        else:
+            direction = normalize(end - start)
+            self.arrow.put_start_and_end_on(
+                start + self.arrow_buff * direction,
+                end - self.arrow_buff * direction,
             )
+        return self.arrow
+
+    def explain(self, scene, index, wait_time=2.0):
+        equation = self.equation
+        part = self.parts[index]
+        color = self.colors[index]
+        label_group = self.label_groups[index]
+        below = self.positions[index] == "below"
+
+        shift_vec = UP * self.nudge if below else DOWN * self.nudge
+
+        # Nudge the whole equation first to make space
+        scene.play(AffineNudge(equation, shift=shift_vec), run_time=1.0)
+
+        if below:
+            # Text below, arrow pointing up to the term
+            label_group.next_to(equation, DOWN, buff=self.label_buff)
+            arrow = self._point_arrow(label_group.get_top(), part.get_bottom())
+            text_shift_dir = UP
+        else:
+            # Text above, arrow pointing down to the term
+            label_group.next_to(equation, UP, buff=self.label_buff)
+            arrow = self._point_arrow(label_group.get_bottom(), part.get_top())
+            text_shift_dir = DOWN
+
+        # Animate in: color the piece, grow arrow, fade in text
+        scene.play(
+            part.animate.set_color(color),
+            GrowArrow(arrow),
+            FadeIn(label_group, shift=0.1 * text_shift_dir),
+            run_time=1.5,
+        )
+        scene.wait(wait_time)
+
+        # De-emphasize + move equation back (nudge last so it owns the points)
+        scene.play(
+            part.animate.set_color(WHITE),
+            FadeOut(arrow),
+            FadeOut(label_group),
+            AffineNudge(equation, shift=-shift_vec),
+            run_time=1.0,
         )
 
-        self.wait(3)
 
-class Scene3_WhatIsBayesianism(Scene):
+class Scene3_WhatIsBayesianism(BayesScene):
     def construct(self):
         # Background
         config.background_color = BG
@@ -182,101 +222,32 @@ class Scene3_WhatIsBayesianism(Scene):
         prior = equation.get_part_by_tex(r"P(H)")
         evidence = equation.get_part_by_tex(r"P(E)")
 
-        # Helper to animate “highlight + arrow + label” for one part
-        def explain_part(mobj, label_text, expl_text, color,
-                         position="below", wait_time=2.0):
-            """
-            position = "above": label+arrow above, equation nudged down
-            position = "below": label+arrow below, equation nudged up
-            """
-            shift_vec = UP * 0.4 if position == "below" else DOWN * 0.4
-
-            # Nudge the whole equation first to make space
-            self.play(equation.animate.shift(shift_vec), run_time=1.0)
-
-            # Label + explanation
-            label = Text(label_text, font_size=32, weight="BOLD", color=color)
-            expl = Text(expl_text, font_size=26)
-            label_group = VGroup(label, expl).arrange(
-                DOWN, aligned_edge=LEFT, buff=0.15
-            )
-
-            if position == "below":
-                # Text below, arrow pointing up to the term
-                label_group.next_to(equation, DOWN, buff=0.7)
-                arrow = Arrow(
-                    start=label_group.get_top(),
-                    end=mobj.get_bottom(),
-                    buff=0.12,
-                    stroke_width=2.2,
-                    max_tip_length_to_length_ratio=0.10,
-                )
-                text_shift_dir = UP
-            else:
-                # Text above, arrow pointing down to the term
-                label_group.next_to(equation, UP, buff=0.7)
-                arrow = Arrow(
-                    start=label_group.get_bottom(),
-                    end=mobj.get_top(),
-                    buff=0.12,
-                    stroke_width=2.2,
-                    max_tip_length_to_length_ratio=0.10,
-                )
-                text_shift_dir = DOWN
-
-            # Animate in: color the piece, grow arrow, fade in text
-            self.play(
-                mobj.animate.set_color(color),
-                GrowArrow(arrow),
-                FadeIn(label_group, shift=0.1 * text_shift_dir),
-                run_time=1.5,
-            )
-            self.wait(wait_time)
-
-            # De-emphasize + move equation back
-            self.play(
-                mobj.animate.set_color(WHITE),
-                FadeOut(arrow),
-                FadeOut(label_group),
-                equation.animate.shift(-shift_vec),
-                run_time=1.0,
-            )
-
-        # 1 Posterior (from above, push equation down)
-        explain_part(
-            posterior,
-            "Posterior  P(H | E)",
-            "Your updated belief in H after seeing the evidence E.",
-            COLOR_POST,
-            position="below",
-        )
-
-        # 2 Likelihood (from above)
-        explain_part(
-            likelihood,
-            "Likelihood  P(E | H)",
-            "How compatible the evidence E is with hypothesis H.",
-            COLOR_LIKE,
-            position="above",
-        )
-
-        # 3 Evidence / normalizing constant (from below, push equation up)
-        explain_part(
-            evidence,
-            "Evidence  P(E)",
-            "Overall probability of seeing E under all hypotheses.",
-            COLOR_EVID,
-            position="below",
-        )
-
-        # 4 Prior (from above)
-        explain_part(
-            prior,
-            "Prior  P(H)",
-            "What you believed about H before seeing E.",
-            COLOR_PRIOR,
-            position="above",
-        )
+        # “highlight + arrow + label” for each part, built once up front
+        annotator = TermAnnotator(equation, [
+            # 1 Posterior (from below, push equation up)
+            (posterior,
+             "Posterior  P(H | E)",
+             "Your updated belief in H after seeing the evidence E.",
+             COLOR_POST, "below"),
+            # 2 Likelihood (from above)
+            (likelihood,
+             "Likelihood  P(E | H)",
+             "How compatible the evidence E is with hypothesis H.",
+             COLOR_LIKE, "above"),
+            # 3 Evidence / normalizing constant (from below, push equation up)
+            (evidence,
+             "Evidence  P(E)",
+             "Overall probability of seeing E under all hypotheses.",
+             COLOR_EVID, "below"),
+            # 4 Prior (from above)
+            (prior,
+             "Prior  P(H)",
+             "What you believed about H before seeing E.",
+             COLOR_PRIOR, "above"),
+        ])
+
+        for i in range(len(annotator)):
+            annotator.explain(self, i, wait_time=2.0)
 
         self.wait(0.5)
 
@@ -301,6 +272,91 @@ NOT_EVIDENCE_COLOR2  = GREY_D
 ShowCreation = Create  # for old code compatibility
 
 
+class VectorBrace(VMobject):
+    """
+    Same shape, placement and style as Brace(mobject, direction, buff),
+    without parsing an SVG path every time.
+
+    A brace is one path whose two straight sections grow with its length,
+    so its points are base + L * per_unit (L = length of one straight
+    section). The template is sampled once from two stock Braces; fit_to()
+    reshapes an existing brace against any mobject with a few NumPy ops.
+    """
+
+    MIN_WIDTH = 0.90552  # path width with empty straight sections (Brace's default_min_width)
+    _template = None
+
+    def __init__(
+        self,
+        mobject,
+        direction=DOWN,
+        buff=0.2,
+        sharpness=2,
+        stroke_width=0,
+        fill_opacity=1.0,
+        background_stroke_width=0,
+        background_stroke_color=BLACK,
+        **kwargs,
+    ):
+        super().__init__(
+            stroke_width=stroke_width,
+            fill_opacity=fill_opacity,
+            background_stroke_width=background_stroke_width,
+            background_stroke_color=background_stroke_color,
+            **kwargs,
+        )
+        self.buff = buff
+        self.sharpness = sharpness
+        self.direction = np.array(direction, dtype=float)
+        self.fit_to(mobject)
+
+    @classmethod
+    def template(cls):
+        if cls._template is None:
+            # with sharpness=1 a brace of width MIN_WIDTH + 2L is the bare path, unstretched
+            one, two = (
+                Brace(Line(ORIGIN, (cls.MIN_WIDTH + 2 * L) * RIGHT), DOWN, buff=0, sharpness=1).points
+                for L in (1, 2)
+            )
+            anchor_mask = np.arange(len(one)) % 4 % 3 == 0
+            cls._template = (2 * one - two, two - one, anchor_mask)
+        return cls._template
+
+    def fit_to(self, mobject, direction=None):
+        """Reshape this brace in place to sit against mobject."""
+        if direction is not None:
+            self.direction = np.array(direction, dtype=float)
+        base, per_unit, anchor_mask = self.template()
+        angle = np.pi - np.arctan2(*self.direction[:2])
+        cos, sin = np.cos(angle), np.sin(angle)
+
+        # work in the frame where the brace hangs below the mobject
+        boundary = mobject.get_points_defining_boundary()
+        if len(boundary) == 0:
+            boundary = np.zeros((1, 3))
+        x = cos * boundary[:, 0] + sin * boundary[:, 1]
+        y = cos * boundary[:, 1] - sin * boundary[:, 0]
+        left, width = x.min(), x.max() - x.min()
+
+        points = base + max(0.0, (width * self.sharpness - self.MIN_WIDTH) / 2) * per_unit
+        anchors = points[anchor_mask]
+        stretch = width / np.ptp(points[:, 0])
+        bx = left + (points[:, 0] - anchors[:, 0].min()) * stretch
+        by = y.min() - self.buff + (points[:, 1] - anchors[:, 1].max())
+
+        points[:, 0] = cos * bx - sin * by
+        points[:, 1] = sin * bx + cos * by
+        points[:, 2] = (boundary[:, 2].min() + boundary[:, 2].max()) / 2
+        self.set_points(points)
+        return self
+
+    put_at_tip = Brace.put_at_tip
+    get_text = Brace.get_text
+    get_tex = Brace.get_tex
+    get_tip = Brace.get_tip
+    get_direction = Brace.get_direction
+
+
 class SimpleBayesDiagram(VGroup):
     """
     Area diagram for Bayes:
@@ -402,8 +458,8 @@ class SimpleBayesDiagram(VGroup):
         nh_column = VGroup(self.nhe_rect, self.nhne_rect)
 
         # Horizontal braces under columns
-        self.h_brace = Brace(h_column, DOWN, buff=0.08)
-        self.nh_brace = Brace(nh_column, DOWN, buff=0.08)
+        self.h_brace = VectorBrace(h_column, DOWN, buff=0.08)
+        self.nh_brace = VectorBrace(nh_column, DOWN, buff=0.08)
 
         self.h_label = MathTex(r"P(H)").set_color(HYPOTHESIS_COLOR)
         self.h_label.next_to(self.h_brace, DOWN, buff=0.05)
@@ -412,8 +468,8 @@ class SimpleBayesDiagram(VGroup):
         self.nh_label.next_to(self.nh_brace, DOWN, buff=0.05)
 
         # Vertical braces on E strips
-        self.he_brace = Brace(self.he_rect, LEFT, buff=0.08)
-        self.nhe_brace = Brace(self.nhe_rect, RIGHT, buff=0.08)
+        self.he_brace = VectorBrace(self.he_rect, LEFT, buff=0.08)
+        self.nhe_brace = VectorBrace(self.nhe_rect, RIGHT, buff=0.08)
 
         self.he_label = MathTex(r"P(E \mid H)").set_color(EVIDENCE_COLOR1)
         self.he_label.next_to(self.he_brace, LEFT, buff=0.05)
@@ -447,6 +503,49 @@ class SimpleBayesDiagram(VGroup):
         )
         new.move_to(self)  # keep it in the same place
         return Transform(self, new)
+
+    def sweep(self, keyframes, **kwargs):
+        """A ParameterSweep through keyframes; every frame is a real diagram."""
+        return ParameterSweep(self, keyframes, **kwargs)
+
+    def set_parameters(self, prior=None, likelihood=None, antilikelihood=None):
+        """Rewrite the regions in place and refit braces and labels to them."""
+        if prior is not None:
+            self.prior = prior
+        if likelihood is not None:
+            self.likelihood = likelihood
+        if antilikelihood is not None:
+            self.antilikelihood = antilikelihood
+
+        x0, y0, _ = self.outer.get_corner(DL)
+        side = self.outer.width
+        xm = x0 + self.prior * side
+        x1 = x0 + side
+        y1 = y0 + side
+        y_he = y0 + self.likelihood * side
+        y_nhe = y0 + self.antilikelihood * side
+
+        # h_box, nh_box, he, hne, nhe, nhne
+        points = rectangle_points(
+            np.array([x0, xm, x0, x0, xm, xm]),
+            np.array([xm, x1, xm, xm, x1, x1]),
+            np.array([y0, y0, y0, y_he, y0, y_nhe]),
+            np.array([y1, y1, y_he, y1, y_nhe, y1]),
+        )
+        rects = [self.h_box, self.nh_box, self.he_rect, self.hne_rect, self.nhe_rect, self.nhne_rect]
+        for i, rect in enumerate(rects):
+            rect.points[...] = points[16 * i:16 * (i + 1)]
+
+        if hasattr(self, "h_brace"):
+            self.h_brace.fit_to(self.h_box)
+            self.nh_brace.fit_to(self.nh_box)
+            self.he_brace.fit_to(self.he_rect)
+            self.nhe_brace.fit_to(self.nhe_rect)
+            self.h_label.next_to(self.h_brace, DOWN, buff=0.05)
+            self.nh_label.next_to(self.nh_brace, DOWN, buff=0.05)
+            self.he_label.next_to(self.he_brace, LEFT, buff=0.05)
+            self.nhe_label.next_to(self.nhe_brace, RIGHT, buff=0.05)
+        return self
     
 class SimpleProbabilityBar(VGroup):
     """
@@ -511,16 +610,50 @@ class SimpleProbabilityBar(VGroup):
         )
         new_bar.move_to(self)
         return new_bar
-    
-class Scene4_BayesVisualization(Scene):
+
+    def set_p(self, new_p: float):
+        """
+        Move the split to new_p in place, for per-frame updates where
+        building a new bar every frame would be too slow. Percentage labels
+        come from a cache and only change when the rounded value does.
+        """
+        x0, y0, _ = self.left.get_corner(DL)
+        y1 = self.left.get_top()[1]
+        x1 = x0 + new_p * self.total_width
+        x2 = x0 + self.total_width
+        points = rectangle_points(
+            np.array([x0, x1]), np.array([x1, x2]),
+            np.array([y0, y0]), np.array([y1, y1]),
+        )
+        self.left.points[...] = points[:16]
+        self.right.points[...] = points[16:]
+
+        if self.show_percent:
+            old_percent = int(round(self.p * 100))
+            new_percent = int(round(new_p * 100))
+            if new_percent != old_percent:
+                self.left_label.become(_percent_label(new_percent))
+                self.right_label.become(_percent_label(100 - new_percent))
+            self.left_label.move_to(self.left)
+            self.right_label.move_to(self.right)
+        self.p = new_p
+        return self
+
+
+@lru_cache(maxsize=None)
+def _percent_label(percent: int) -> MathTex:
+    return MathTex(f"{percent}\\%").scale(0.5)
+
+
+class Scene4_BayesVisualization(BayesScene):
     def construct(self):
         # Optional if you’re using a custom background color
         # self.camera.background_color = BG
 
         # --- Parameters -----------------------------------------------------
-        prior = 0.30           # P(H)
-        likelihood = 0.70      # P(E | H)
-        antilikelihood = 0.20  # P(E | ¬H)
+        prior = self.param("prior", 0.30)                    # P(H)
+        likelihood = self.param("likelihood", 0.70)          # P(E | H)
+        antilikelihood = self.param("antilikelihood", 0.20)  # P(E | ¬H)
 
         posterior = (
             prior * likelihood
@@ -633,16 +766,17 @@ class Scene4_BayesVisualization(Scene):
         self.wait(1.0)
 
         # --- Animate changing proportions in the diagram (optional demo) ----
-        self.play(diagram.morph_to(prior=0.1), run_time=1.2)
-        self.play(diagram.morph_to(prior=0.6), run_time=1.2)
-        self.wait(0.2)
-
-        self.play(diagram.morph_to(likelihood=0.4), run_time=1.2)
-        self.play(diagram.morph_to(likelihood=0.7), run_time=1.2)
-        self.wait(0.2)
-
-        self.play(diagram.morph_to(antilikelihood=0.4), run_time=1.2)
-        self.play(diagram.morph_to(antilikelihood=antilikelihood), run_time=1.2)
+        # one sweep through parameter space: every frame is a real diagram
+        self.play(diagram.sweep([
+            dict(prior=0.1),
+            dict(prior=0.6),
+            dict(hold=0.2),
+            dict(prior=prior, likelihood=0.4),
+            dict(likelihood=0.7),
+            dict(hold=0.2),
+            dict(likelihood=likelihood, antilikelihood=0.4),
+            dict(antilikelihood=antilikelihood),
+        ], segment_time=1.2))
         self.wait(0.4)
 
         # --- Probability bar: prior -> posterior (right-hand “remember this”) ---
@@ -849,21 +983,28 @@ class BayesDiagram(VGroup):
         self.add(braces)
         return self
 
+    def brace_targets(self):
+        return [
+            (self.h_rect, self.prior_rect_direction),
+            (self.nh_rect, self.prior_rect_direction),
+            (self.he_rect, LEFT),
+            (self.hne_rect, LEFT),
+            (self.nhe_rect, RIGHT),
+            (self.nhne_rect, RIGHT),
+        ]
+
     def create_braces(self, buff=SMALL_BUFF):
-        kw = {"buff": buff}
-        return VGroup(
-            Brace(self.h_rect, self.prior_rect_direction, **kw),
-            Brace(self.nh_rect, self.prior_rect_direction, **kw),
-            Brace(self.he_rect, LEFT, **kw),
-            Brace(self.hne_rect, LEFT, **kw),
-            Brace(self.nhe_rect, RIGHT, **kw),
-            Brace(self.nhne_rect, RIGHT, **kw),
-        )
+        return VGroup(*(
+            VectorBrace(rect, direction, buff=buff)
+            for rect, direction in self.brace_targets()
+        ))
 
     def refresh_braces(self):
+        # refit the existing braces in place instead of building new ones
         if self.braces is not None:
-            new_braces = self.create_braces(self.braces_buff)
-            self.braces.become(new_braces)
+            for brace, (rect, direction) in zip(self.braces, self.brace_targets()):
+                brace.buff = self.braces_buff
+                brace.fit_to(rect, direction)
         return self
 
     # The old manimlib pattern was self.play(diagram.set_prior, 0.5)
@@ -931,9 +1072,313 @@ class BayesDiagram(VGroup):
         self.refresh_braces()
         return self
 
+    def set_parameters(self, prior=None, likelihood=None, antilikelihood=None):
+        """
+        Rewrite all six rectangles in place from the outer square's bounds,
+        so colors, opacities and any scaling/placement are kept and no new
+        mobjects get built. Cheap enough to call per frame or per slider move.
+        """
+        if prior is not None:
+            self.prior = prior
+        if likelihood is not None:
+            self.likelihood = likelihood
+        if antilikelihood is not None:
+            self.antilikelihood = antilikelihood
+
+        x0, y0, _ = self.outer.get_corner(DL)
+        side = self.outer.width
+        xm = x0 + self.prior * side
+        x1 = x0 + side
+        y1 = y0 + side
+        y_he = y0 + self.likelihood * side
+        y_nhe = y0 + self.antilikelihood * side
+
+        # h, nh, he, hne, nhe, nhne
+        points = rectangle_points(
+            np.array([x0, xm, x0, x0, xm, xm]),
+            np.array([xm, x1, xm, xm, x1, x1]),
+            np.array([y0, y0, y0, y_he, y0, y_nhe]),
+            np.array([y1, y1, y_he, y1, y_nhe, y1]),
+        )
+        rects = [self.h_rect, self.nh_rect, self.he_rect, self.hne_rect, self.nhe_rect, self.nhne_rect]
+        for i, rect in enumerate(rects):
+            rect.points[...] = points[16 * i:16 * (i + 1)]
+        self.refresh_braces()
+        return self
+
+    def sweep(self, keyframes, **kwargs):
+        """A ParameterSweep through keyframes; every frame is a real diagram."""
+        return ParameterSweep(self, keyframes, **kwargs)
+
     def copy(self):
         return super().copy()
 
+
+class ParameterAnimation(Animation):
+    """
+    Calls mobject.set_parameters(**params(alpha)) every frame.
+
+    Unlike UpdateFromAlphaFunc no starting copy is made: the mobject
+    rewrites its own geometry in place.
+    """
+
+    def __init__(self, mobject, params, **kwargs):
+        super().__init__(mobject, **kwargs)
+        self.params = params
+
+    def begin(self):
+        if self.suspend_mobject_updating:
+            self.mobject.suspend_updating()
+        self.interpolate(0)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_parameters(**self.params(self.rate_func(alpha)))
+
+    def get_all_mobjects(self):
+        return [self.mobject]
+
+
+class ParameterSweep(ParameterAnimation):
+    """
+    One animation through a list of Bayes-diagram keyframes, interpolated in
+    (prior, likelihood, antilikelihood) space, so every frame is a real
+    diagram -- unlike a Transform between two diagrams, where columns, braces
+    and labels blend point by point.
+
+    Each keyframe is a dict of the parameters that change (the others carry
+    over), optionally with its own run_time and rate_func; {"hold": t}
+    keeps still for t seconds:
+
+        diagram.sweep([
+            dict(prior=0.1),
+            dict(prior=0.6),
+            dict(hold=0.2),
+            dict(likelihood=0.4, run_time=2.0, rate_func=linear),
+        ], segment_time=1.2)
+
+    The rate funcs shape each segment; the sweep as a whole runs linearly in
+    time, for sum(run_time + hold) seconds, or for run_time seconds if given,
+    with every segment scaled in proportion.
+    """
+
+    PARAMETERS = ("prior", "likelihood", "antilikelihood")
+
+    def __init__(self, diagram, keyframes, segment_time=1.0, rate_func=smooth, run_time=None, **kwargs):
+        current = {name: getattr(diagram, name) for name in self.PARAMETERS}
+        values = [[current[name] for name in self.PARAMETERS]]
+        times = [0.0]
+        self.easings = []
+        for keyframe in keyframes:
+            keyframe = dict(keyframe)
+            if "hold" in keyframe:
+                duration, easing = keyframe.pop("hold"), linear
+            else:
+                duration = keyframe.pop("run_time", segment_time)
+                easing = keyframe.pop("rate_func", rate_func)
+            unknown = set(keyframe) - set(self.PARAMETERS)
+            if unknown:
+                raise ValueError(f"unknown keyframe keys {sorted(unknown)}")
+            current.update(keyframe)
+            values.append([current[name] for name in self.PARAMETERS])
+            times.append(times[-1] + duration)
+            self.easings.append(easing)
+
+        self.keyframe_times = np.array(times)
+        self.keyframe_values = np.array(values, dtype=float)
+        # parameters_at works on alpha, so a total run_time rescales every segment
+        run_time = times[-1] if run_time is None else run_time
+        super().__init__(diagram, self.parameters_at, run_time=run_time, rate_func=linear, **kwargs)
+
+    def parameters_at(self, alpha):
+        times = self.keyframe_times
+        t = alpha * times[-1]
+        i = min(max(np.searchsorted(times, t, side="right") - 1, 0), len(times) - 2)
+        span = times[i + 1] - times[i]
+        local = self.easings[i]((t - times[i]) / span) if span > 0 else 1.0
+        start, end = self.keyframe_values[i], self.keyframe_values[i + 1]
+        return dict(zip(self.PARAMETERS, start + local * (end - start)))
+
+
+def rectangle_points(x0, x1, y0, y1):
+    """
+    Bezier points for many axis-aligned rectangles at once.
+
+    Takes (n,) arrays of bounds, returns (n * 16, 3) points: per rectangle
+    four straight cubic segments UR -> UL -> DL -> DR -> UR, the same
+    vertex order as manim's Rectangle.
+    """
+    z = np.zeros_like(x0)
+    corners = np.stack([
+        np.stack([x1, y1, z], axis=-1),
+        np.stack([x0, y1, z], axis=-1),
+        np.stack([x0, y0, z], axis=-1),
+        np.stack([x1, y0, z], axis=-1),
+        np.stack([x1, y1, z], axis=-1),
+    ], axis=1)                                  # (n, 5, 3)
+    starts = corners[:, :-1, None, :]           # (n, 4, 1, 3)
+    deltas = corners[:, 1:, None, :] - starts
+    t = np.array([0, 1 / 3, 2 / 3, 1])[None, None, :, None]
+    return (starts + t * deltas).reshape(-1, 3)
+
+
+class BayesGridDiagram(VGroup):
+    """
+    Area diagram for K hypotheses and M evidence outcomes:
+      - Column k has width prior[k]
+      - Inside column k, row m (bottom-up) has height likelihood[k, m]
+
+    Each evidence outcome is one VMobject holding its K rectangles as
+    subpaths, so all K x M regions come out of one vectorized layout pass
+    and set_parameters() rewrites the point buffers in place. With K = M = 2
+    this is the same picture as BayesDiagram.
+    """
+
+    def __init__(
+        self,
+        prior,
+        likelihood,
+        height: float = 3.0,
+        evidence_colors=None,
+        stroke_color=WHITE,
+        stroke_width: float = 1,
+        fill_opacity: float = 1.0,
+        highlight_color=HYPOTHESIS_COLOR,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        prior, likelihood = self._check_parameters(prior, likelihood)
+        num_hypotheses, num_outcomes = likelihood.shape
+
+        if evidence_colors is None:
+            evidence_colors = color_gradient([EVIDENCE_COLOR1, EVIDENCE_COLOR2, NOT_EVIDENCE_COLOR2], num_outcomes)
+        if len(evidence_colors) != num_outcomes:
+            raise ValueError(f"need {num_outcomes} evidence colors, got {len(evidence_colors)}")
+
+        self.outer = Square(side_length=height)
+        self.outer.set_stroke(WHITE, 2)
+        self.outer.set_fill(opacity=0)
+
+        self.evidence_layers = VGroup(*[
+            VMobject(
+                fill_color=color,
+                fill_opacity=fill_opacity,
+                stroke_color=stroke_color,
+                stroke_width=stroke_width,
+            )
+            for color in evidence_colors
+        ])
+        self.highlight = VMobject(stroke_color=highlight_color, stroke_width=4, fill_opacity=0)
+        self.highlight_mask = np.zeros((num_hypotheses, num_outcomes), dtype=bool)
+
+        self.add(self.evidence_layers, self.outer, self.highlight)
+        self.set_parameters(prior, likelihood)
+
+    @staticmethod
+    def _check_parameters(prior, likelihood):
+        prior = np.array(prior, dtype=float)
+        likelihood = np.array(likelihood, dtype=float)
+        if prior.ndim != 1 or likelihood.ndim != 2 or likelihood.shape[0] != len(prior):
+            raise ValueError(
+                f"prior must be (K,) and likelihood (K, M); got {prior.shape} and {likelihood.shape}"
+            )
+        if (prior < 0).any() or (likelihood < 0).any():
+            raise ValueError("probabilities must be non-negative")
+        # normalize: prior over hypotheses, each likelihood row over outcomes
+        prior /= prior.sum() or 1.0
+        row_sums = likelihood.sum(axis=1, keepdims=True)
+        likelihood /= np.where(row_sums == 0, 1.0, row_sums)
+        return prior, likelihood
+
+    # --- layout -----------------------------------------------------------
+    def region_bounds(self) -> np.ndarray:
+        """(K, M, 4) array of x0, x1, y0, y1 for every region."""
+        left, bottom, _ = self.outer.get_corner(DL)
+        width, height = self.outer.width, self.outer.height
+
+        col_right = left + np.cumsum(self.prior) * width
+        col_left = col_right - self.prior * width
+        row_top = bottom + np.cumsum(self.likelihood, axis=1) * height
+        row_bottom = row_top - self.likelihood * height
+
+        num_outcomes = self.likelihood.shape[1]
+        return np.stack([
+            np.repeat(col_left[:, None], num_outcomes, axis=1),
+            np.repeat(col_right[:, None], num_outcomes, axis=1),
+            row_bottom,
+            row_top,
+        ], axis=-1)
+
+    def set_parameters(self, prior=None, likelihood=None):
+        prior = self.prior if prior is None else prior
+        likelihood = self.likelihood if likelihood is None else likelihood
+        self.prior, self.likelihood = self._check_parameters(prior, likelihood)
+
+        bounds = self.region_bounds()
+        num_hypotheses, num_outcomes = self.likelihood.shape
+        # one (M, K * 16, 3) block: outcome-major so each layer is contiguous
+        by_outcome = bounds.transpose(1, 0, 2).reshape(-1, 4)
+        points = rectangle_points(*by_outcome.T).reshape(num_outcomes, -1, 3)
+
+        for layer, layer_points in zip(self.evidence_layers, points):
+            if layer.points.shape == layer_points.shape:
+                layer.points[...] = layer_points
+            else:
+                layer.set_points(layer_points)
+        self._update_highlight(bounds)
+        return self
+
+    # --- posterior ----------------------------------------------------------
+    def joint(self) -> np.ndarray:
+        """(K, M) joint probabilities P(H_k, E_m) -- the region areas."""
+        return self.prior[:, None] * self.likelihood
+
+    def posterior(self, outcome: int) -> np.ndarray:
+        """P(H_k | E_outcome) for every hypothesis."""
+        column = self.joint()[:, outcome]
+        total = column.sum()
+        return column / total if total > 0 else column
+
+    def highlight_regions(self, mask):
+        self.highlight_mask = np.array(mask, dtype=bool).reshape(self.likelihood.shape)
+        self._update_highlight(self.region_bounds())
+        return self
+
+    def highlight_posterior(self, outcome: int, hypotheses=None):
+        """
+        Outline the regions making up P(H | E_outcome): the outcome's row in
+        every column (its denominator) or only the given hypotheses.
+        """
+        mask = np.zeros(self.likelihood.shape, dtype=bool)
+        mask[slice(None) if hypotheses is None else list(hypotheses), outcome] = True
+        return self.highlight_regions(mask)
+
+    def _update_highlight(self, bounds):
+        selected = bounds[self.highlight_mask]
+        if len(selected):
+            self.highlight.set_points(rectangle_points(*selected.T))
+        else:
+            self.highlight.set_points(np.zeros((0, 3)))
+
+    # --- animation helper -------------------------------------------------
+    def morph_to(self, prior=None, likelihood=None, **kwargs):
+        """
+        Animation that moves the layout to a new prior vector and/or
+        likelihood matrix, rewriting the geometry in place every frame.
+        """
+        start_prior, start_likelihood = self.prior.copy(), self.likelihood.copy()
+        end_prior, end_likelihood = self._check_parameters(
+            start_prior if prior is None else prior,
+            start_likelihood if likelihood is None else likelihood,
+        )
+        return ParameterAnimation(
+            self,
+            lambda alpha: dict(
+                prior=interpolate(start_prior, end_prior, alpha),
+                likelihood=interpolate(start_likelihood, end_likelihood, alpha),
+            ),
+            **kwargs,
+        )
+
 # --------------------------------------------------------------------
 # 1. Bayes formula helper
 # --------------------------------------------------------------------
@@ -1039,7 +1484,38 @@ def get_bayes_formula(expand_denominator: bool = False) -> MathTex:
     return formula
 
 
-class Scene5_BayesEquationWithDiagrams(Scene):
+def diagram_fraction(prior, likelihood, antilikelihood, height=2.0):
+    """
+    P(H|E) drawn as a fraction of two BayesDiagrams: only H & E lit on top,
+    the whole E row below. Returns VGroup(top, bar, bottom); call
+    set_parameters() on top and bottom to update it in place.
+    """
+    top_diag = BayesDiagram(prior, likelihood, antilikelihood, height=height)
+    bottom_diag = BayesDiagram(prior, likelihood, antilikelihood, height=height)
+
+    # Match shading:
+    # Top: only left-bottom (H & E) is cyan, everything else dark
+    for r in [top_diag.he_rect, top_diag.hne_rect,
+              top_diag.nhe_rect, top_diag.nhne_rect]:
+        r.set_fill(BLACK, opacity=1.0)
+    top_diag.he_rect.set_fill(EVIDENCE_COLOR1, opacity=1.0)
+
+    # Bottom: E-row – left cyan, right darker teal
+    for r in [bottom_diag.he_rect, bottom_diag.hne_rect,
+              bottom_diag.nhe_rect, bottom_diag.nhne_rect]:
+        r.set_fill(BLACK, opacity=1.0)
+    bottom_diag.he_rect.set_fill(EVIDENCE_COLOR1, opacity=1.0)
+    bottom_diag.nhe_rect.set_fill(EVIDENCE_COLOR2, opacity=1.0)
+
+    frac_bar_diag = Line(LEFT, RIGHT, stroke_width=2.5, color=WHITE)
+    frac_bar_diag.set_width(top_diag.get_width())
+
+    return VGroup(top_diag, frac_bar_diag, bottom_diag).arrange(
+        DOWN, buff=0.3, aligned_edge=RIGHT
+    )
+
+
+class Scene5_BayesEquationWithDiagrams(BayesScene):
     def construct(self):
         self.camera.background_color = BG
 
@@ -1064,34 +1540,13 @@ class Scene5_BayesEquationWithDiagrams(Scene):
         eq_symbol.scale(1.6)
 
         # ---------- Right: Bayes diagrams as a fraction ----------
-        prior_val    = 0.35
-        like_val     = 0.6
-        antilike_val = 0.2
+        prior_val    = self.param("prior", 0.35)
+        like_val     = self.param("likelihood", 0.6)
+        antilike_val = self.param("antilikelihood", 0.2)
         box_h        = 2.0
 
-        top_diag = BayesDiagram(prior_val, like_val, antilike_val, height=box_h)
-        bottom_diag = BayesDiagram(prior_val, like_val, antilike_val, height=box_h)
-
-        # Match shading:
-        # Top: only left-bottom (H & E) is cyan, everything else dark
-        for r in [top_diag.he_rect, top_diag.hne_rect,
-                  top_diag.nhe_rect, top_diag.nhne_rect]:
-            r.set_fill(BLACK, opacity=1.0)
-        top_diag.he_rect.set_fill(EVIDENCE_COLOR1, opacity=1.0)
-
-        # Bottom: E-row – left cyan, right darker teal
-        for r in [bottom_diag.he_rect, bottom_diag.hne_rect,
-                  bottom_diag.nhe_rect, bottom_diag.nhne_rect]:
-            r.set_fill(BLACK, opacity=1.0)
-        bottom_diag.he_rect.set_fill(EVIDENCE_COLOR1, opacity=1.0)
-        bottom_diag.nhe_rect.set_fill(EVIDENCE_COLOR2, opacity=1.0)
-
-        frac_bar_diag = Line(LEFT, RIGHT, stroke_width=2.5, color=WHITE)
-        frac_bar_diag.set_width(top_diag.get_width())
-
-        diag_stack = VGroup(top_diag, frac_bar_diag, bottom_diag).arrange(
-            DOWN, buff=0.3, aligned_edge=RIGHT
-        )
+        diag_stack = diagram_fraction(prior_val, like_val, antilike_val, height=box_h)
+        top_diag, frac_bar_diag, bottom_diag = diag_stack
         diag_stack.scale(1.3)
 
         # ---------- Overall centered layout ----------
@@ -1226,97 +1681,16 @@ class Scene5_BayesEquationWithDiagrams(Scene):
         )
         self.wait(2.0)
 
-class Scene6_MainTakeaways(Scene):
+class Scene6_MainTakeaways(BayesScene):
     def construct(self):
-        self.camera.background_color = BG
-
-        # ----- Title + subtitle -----
-        title = Text(
-            "Main takeaways",
-            font_size=48,
-            weight="BOLD"
-        )
-        title.set_color_by_gradient(BLUE_B, TEAL_A)
-        title.to_edge(UP, buff=0.8)
-
-        subtitle = Text(
-            "Bayes’ theorem as the geometry of changing beliefs",
-            font_size=32
-        ).set_color(TEAL_B)
-        subtitle.next_to(title, DOWN, buff=0.4)
-
-        # ----- 3 bullets: Bayesianism (philosophy & significance) -----
-        bayesianism_bullets = BulletedList(
-            "Bayesianism treats probabilities as degrees of belief, not just long-run frequencies.",
-            "Rational agents should update those degrees of belief when new evidence arrives.",
-            "It connects belief, fair betting odds, and scientific reasoning into one framework.",
-            font_size=30,
-        )
-        bayesianism_bullets.set_color(TEAL_A)
-        bayesianism_bullets.set_width(10)
-
-        # ----- 3 bullets: Bayes’ theorem (the rule itself) -----
-        bayes_rule_bullets = BulletedList(
-            "Bayes’ theorem gives a precise rule for moving from prior to posterior.",
-            "Geometrically, the posterior is “what fraction of the E-cases also have H”.",
-            "As evidence carves up the space of possibilities, your credences shift smoothly.",
-            font_size=30,
-        )
-        bayes_rule_bullets.set_color(TEAL_A)
-        bayes_rule_bullets.set_width(10)
-
-        # Group the two lists and center them on screen
-        bullets_group = VGroup(bayesianism_bullets, bayes_rule_bullets).arrange(
-            DOWN, buff=0.6, aligned_edge=LEFT
-        )
-        # Place under subtitle, then center horizontally
-        bullets_group.next_to(subtitle, DOWN, buff=0.6)
-        bullets_group.move_to(np.array([0, bullets_group.get_center()[1], 0]))
-
-        # ----- Animations -----
-        self.play(FadeIn(title, shift=0.2 * DOWN), run_time=0.7)
-        self.play(FadeIn(subtitle, shift=0.1 * DOWN), run_time=0.6)
-
-        all_bullets = list(bayesianism_bullets) + list(bayes_rule_bullets)
-        self.play(
-            LaggedStart(
-                *[FadeIn(b, shift=0.1 * RIGHT) for b in all_bullets],
-                lag_ratio=0.13,
-                run_time=3.0,
-            )
-        )
-
-        self.wait(2.0)
+        self.play_timeline("scene6_main_takeaways.toml")
 
 
-
-class Scene7_Thanks(Scene):
+class Scene7_Thanks(BayesScene):
     def construct(self):
-        self.camera.background_color = BG
+        self.play_timeline("scene7_thanks.toml")
 
-        # ----- Main thank-you text -----
-        thanks = Text(
-            "Thank you for watching!",
-            font_size=60,
-            weight="BOLD"
-        )
-        thanks.set_color_by_gradient(BLUE_B, TEAL_A)
-        thanks.move_to(ORIGIN + 0.3 * UP)
-
-        subtitle = Text(
-            "Bayes' theorem: the geometry of changing beliefs",
-            font_size=32
-        ).set_color(TEAL_B)
-        subtitle.next_to(thanks, DOWN, buff=0.5)
-
-        # Simple closing animation
-        self.play(FadeIn(thanks, scale=1.1), run_time=1.2)
-        self.play(FadeIn(subtitle, shift=0.2 * UP), run_time=0.8)
-        self.play(Flash(thanks, line_length=0.25, color=EVIDENCE_COLOR1, time_width=0.6),
-                  run_time=0.6)
-        self.wait(2.5)
-
-class FullBayesMovie(Scene):
+class FullBayesMovie(LifecycleScene, BayesScene):
     def fade_out_all(self, run_time=0.6, pause=0.2):
         """
         Fade out everything currently on screen.
@@ -1332,28 +1706,716 @@ class FullBayesMovie(Scene):
         # Scene 1
         Scene1_TitleCard.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene1_TitleCard")
 
         # Scene 2
         Scene2_History.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene2_History")
 
         # Scene 3
         Scene3_WhatIsBayesianism.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene3_WhatIsBayesianism")
 
         # Scene 4
         Scene4_BayesVisualization.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene4_BayesVisualization")
 
         # Scene 5
         Scene5_BayesEquationWithDiagrams.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene5_BayesEquationWithDiagrams")
 
         # Scene 6
         Scene6_MainTakeaways.construct(self)
         self.fade_out_all()
+        self.end_segment("Scene6_MainTakeaways")
 
         # Scene 7 (final – no fade after, unless you want a final fade to black)
         Scene7_Thanks.construct(self)
         # Optional final fade:
         # self.fade_out_all()
+        self.end_segment("Scene7_Thanks")
+
+
+# --------------------------------------------------------------------
+# Continuous-parameter updating: Beta prior, streaming coin flips
+# --------------------------------------------------------------------
+class BetaPosteriorPlot(VGroup):
+    """
+    Beta(a, b) density of a coin's bias next to a SimpleProbabilityBar of
+    the posterior mean.
+
+    The density is evaluated on a fixed grid (precomputed log x and
+    log(1 - x)) and written straight into one curve's points, so each
+    observation costs a couple of vector ops instead of a new graph.
+    With normalize=True (default) the curve is scaled so its peak touches
+    the top of the axes; the shape sharpens as evidence accumulates.
+    """
+
+    def __init__(
+        self,
+        a: float = 1.0,
+        b: float = 1.0,
+        num_samples: int = 200,
+        normalize: bool = True,
+        y_max: float = 1.0,
+        axes_width: float = 5.0,
+        axes_height: float = 3.0,
+        curve_color=COLOR_POST,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.normalize = normalize
+        self.y_max = y_max
+
+        self.axes = Axes(
+            x_range=[0, 1, 0.25],
+            y_range=[0, y_max, y_max / 2],
+            x_length=axes_width,
+            y_length=axes_height,
+            tips=False,
+        )
+
+        # midpoints, so x = 0 and x = 1 (where the density can blow up) are never hit
+        grid = (np.arange(num_samples) + 0.5) / num_samples
+        self.log_x = np.log(grid)
+        self.log_1mx = np.log1p(-grid)
+
+        # straight segments between grid points: x of every Bezier point is fixed
+        self._t = np.array([0, 1 / 3, 2 / 3, 1])
+        self._x_values = (grid[:-1, None] + self._t * np.diff(grid)[:, None]).reshape(-1, 1)
+
+        self.curve = VMobject(stroke_color=curve_color, stroke_width=3)
+        self.curve.set_points(np.zeros((len(self._x_values), 3)))
+
+        self.bar = SimpleProbabilityBar(p=0.5, width=axes_width * 0.8, height=0.4)
+        self.bar.next_to(self.axes, DOWN, buff=0.5)
+
+        self.add(self.axes, self.curve, self.bar)
+        self.set_parameters(a, b)
+
+    def density(self) -> np.ndarray:
+        a, b = self.a, self.b
+        log_pdf = (a - 1) * self.log_x + (b - 1) * self.log_1mx
+        if self.normalize:
+            return np.exp(log_pdf - log_pdf.max()) * self.y_max
+        log_beta = math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+        return np.minimum(np.exp(log_pdf - log_beta), self.y_max)
+
+    def mean(self) -> float:
+        return self.a / (self.a + self.b)
+
+    def set_parameters(self, a=None, b=None):
+        self.a = self.a if a is None else float(a)
+        self.b = self.b if b is None else float(b)
+
+        y = self.density()
+        y_points = (y[:-1, None] + self._t * np.diff(y)[:, None]).reshape(-1, 1)
+        # axes coordinates -> scene points, following the axes if they moved
+        origin = self.axes.c2p(0, 0)
+        x_unit = self.axes.c2p(1, 0) - origin
+        y_unit = self.axes.c2p(0, 1) - origin
+        self.curve.points[...] = origin + self._x_values * x_unit + y_points * y_unit
+        self.bar.set_p(self.mean())
+        return self
+
+    def observe(self, heads: bool):
+        """Conjugate update for one flip."""
+        if heads:
+            return self.set_parameters(a=self.a + 1)
+        return self.set_parameters(b=self.b + 1)
+
+    def stream(self, flips, **kwargs):
+        """
+        Animation that feeds the flips in over its run_time (many per frame
+        if needed), updating the same curve every frame.
+        """
+        flips = np.asarray(flips, dtype=bool)
+        heads = np.concatenate([[0], np.cumsum(flips)])
+        seen = np.arange(len(flips) + 1)
+        a0, b0 = self.a, self.b
+
+        def params(alpha):
+            n = int(round(alpha * len(flips)))
+            return dict(a=a0 + heads[n], b=b0 + seen[n] - heads[n])
+
+        return ParameterAnimation(self, params, **kwargs)
+
+
+class BetaBinomialUpdating(BayesScene):
+    def construct(self):
+        self.camera.background_color = BG
+
+        title = Text("Updating a belief about a coin", font_size=40)
+        title.set_color_by_gradient(BLUE_B, TEAL_A)
+        title.to_edge(UP, buff=0.5)
+
+        plot = BetaPosteriorPlot(a=2, b=2)
+        plot.next_to(title, DOWN, buff=0.5)
+
+        caption = Tex(r"Prior $\mathrm{Beta}(2, 2)$, true bias $0.7$", font_size=30)
+        caption.next_to(plot, DOWN, buff=0.3)
+
+        self.play(FadeIn(title, shift=0.2 * DOWN), run_time=0.8)
+        self.play(Create(plot.axes), Create(plot.curve), FadeIn(plot.bar), FadeIn(caption), run_time=1.2)
+        self.wait(0.5)
+
+        rng = np.random.default_rng(0)
+        flips = rng.random(2000) < 0.7
+
+        # a few flips slowly, then the rest streaming
+        for flip in flips[:5]:
+            self.play(plot.stream([flip]), run_time=0.5)
+        self.play(plot.stream(flips[5:]), run_time=6.0, rate_func=linear)
+        self.wait(2.0)
+
+
+# --------------------------------------------------------------------
+# Monte Carlo population: N sampled individuals inside a Bayes diagram
+# --------------------------------------------------------------------
+POPULATION_COLORS = {
+    "he": HYPOTHESIS_COLOR,   # H and E: the posterior's numerator
+    "nhe": WHITE,             # ¬H and E: the rest of the denominator
+    "hne": GREY_B,
+    "nhne": GREY_D,
+}
+
+
+class PopulationCloud(PMobject):
+    """
+    N simulated individuals as one point cloud over a Bayes diagram.
+
+    Samples are uniform in the diagram's square, so position *is* the
+    simulation: x < prior means H, and y below the column's likelihood
+    (or antilikelihood) means E. Classification into he/hne/nhe/nhne is
+    done with array masks, colors are assigned per mask, and the camera
+    draws the whole population in one vectorized point-cloud pass.
+
+    Works with SimpleBayesDiagram and BayesDiagram (anything with .outer,
+    .prior, .likelihood, .antilikelihood). Place the diagram first.
+    """
+
+    def __init__(self, diagram, num_samples=10_000, seed=0, stroke_width=2, **kwargs):
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        rng = np.random.default_rng(seed)
+        x, y = rng.random((2, num_samples))
+
+        is_h = x < diagram.prior
+        is_e = y < np.where(is_h, diagram.likelihood, diagram.antilikelihood)
+        self.masks = {
+            "he": is_h & is_e,
+            "hne": is_h & ~is_e,
+            "nhe": ~is_h & is_e,
+            "nhne": ~is_h & ~is_e,
+        }
+
+        rgbas = np.empty((num_samples, 4))
+        for key, mask in self.masks.items():
+            rgbas[mask] = color_to_rgba(POPULATION_COLORS[key])
+
+        left, bottom, _ = diagram.outer.get_corner(DL)
+        self.all_points = np.column_stack([
+            left + x * diagram.outer.width,
+            bottom + y * diagram.outer.height,
+            np.zeros(num_samples),
+        ])
+        self.all_rgbas = rgbas
+
+        # running counts, so the posterior frequency at any n is a lookup
+        self.cum_he = np.concatenate([[0], np.cumsum(self.masks["he"])])
+        self.cum_e = np.concatenate([[0], np.cumsum(is_e)])
+
+        self.num_samples = num_samples
+        self.set_parameters(num_visible=num_samples)
+
+    def set_parameters(self, num_visible=None):
+        """Show the first num_visible individuals (views, no copies)."""
+        n = self.num_samples if num_visible is None else int(num_visible)
+        self.num_visible = n
+        self.points = self.all_points[:n]
+        self.rgbas = self.all_rgbas[:n]
+        return self
+
+    def posterior_frequency(self) -> float:
+        """Share of the visible E-cases that also have H."""
+        n = self.num_visible
+        return self.cum_he[n] / self.cum_e[n] if self.cum_e[n] else 0.0
+
+    def stream(self, **kwargs):
+        """Animation that lets the individuals arrive over its run_time."""
+        return ParameterAnimation(
+            self,
+            lambda alpha: dict(num_visible=round(alpha * self.num_samples)),
+            **kwargs,
+        )
+
+
+class MonteCarloPopulation(BayesScene):
+    def construct(self):
+        self.camera.background_color = BG
+
+        prior, likelihood, antilikelihood = 0.3, 0.7, 0.2
+        exact = prior * likelihood / (prior * likelihood + (1 - prior) * antilikelihood)
+
+        title = Text("Bayes by counting", font_size=40)
+        title.set_color_by_gradient(BLUE_B, TEAL_A)
+        title.to_edge(UP, buff=0.4)
+
+        diagram = SimpleBayesDiagram(prior, likelihood, antilikelihood, height=4.0)
+        diagram.shift(1.8 * LEFT + 0.3 * DOWN)
+
+        cloud = PopulationCloud(diagram, num_samples=100_000, stroke_width=1)
+        cloud.set_parameters(num_visible=0)
+
+        frequency = DecimalNumber(0, num_decimal_places=3)
+        frequency.add_updater(lambda m: m.set_value(cloud.posterior_frequency()))
+        readout = VGroup(
+            Tex(r"Share of $E$-cases with $H$:", font_size=32),
+            frequency,
+            Tex(f"Exact $P(H \\mid E) = {exact:.3f}$", font_size=32),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+        readout.next_to(diagram, RIGHT, buff=1.2)
+
+        self.play(FadeIn(title, shift=0.2 * DOWN), FadeIn(diagram), run_time=1.0)
+        self.add(cloud)
+        self.play(FadeIn(readout), run_time=0.6)
+        self.play(cloud.stream(), run_time=8.0, rate_func=rate_functions.ease_in_quad)
+        frequency.clear_updaters()
+        self.wait(2.0)
+
+
+# --------------------------------------------------------------------
+# Posterior landscape: P(H | E) over (prior x likelihood)
+# --------------------------------------------------------------------
+def make_colormap(colors, size=256) -> np.ndarray:
+    """(size, 4) uint8 lookup table running through the given colors."""
+    return np.array([color_to_int_rgba(c, 1.0) for c in color_gradient(colors, size)], dtype=np.uint8)
+
+
+POSTERIOR_COLORMAP = [GREY_E, BLUE_E, TEAL_C, COLOR_POST]
+
+
+class PosteriorHeatmap(Group):
+    """
+    P(H | E) for every (prior, likelihood) pair at a fixed antilikelihood,
+    drawn as one ImageMobject.
+
+      - x: prior P(H), left to right
+      - y: likelihood P(E | H), bottom to top
+
+    The grid is computed in one vectorized pass and pushed through a
+    colormap lookup table straight into the image's pixel array, so
+    changing the antilikelihood rewrites the texture and nothing else.
+    A cursor marks the (prior, likelihood) of a tracked diagram.
+    """
+
+    def __init__(
+        self,
+        antilikelihood: float = 0.2,
+        resolution: int = 256,
+        side_length: float = 3.0,
+        colors=POSTERIOR_COLORMAP,
+        show_labels: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.resolution = resolution
+        self.lut = make_colormap(colors)
+
+        # cell centers; rows run top (likelihood 1) to bottom
+        centers = (np.arange(resolution) + 0.5) / resolution
+        self.prior_grid = centers[None, :]
+        self.likelihood_grid = centers[::-1, None]
+        self.numerator = self.prior_grid * self.likelihood_grid
+        self.not_prior = 1 - self.prior_grid
+
+        self.image = ImageMobject(np.zeros((resolution, resolution, 4), dtype=np.uint8))
+        self.image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.image.set_height(side_length)
+
+        self.frame = SurroundingRectangle(self.image, buff=0, color=WHITE, stroke_width=2)
+
+        self.cursor = Dot(radius=0.06, color=WHITE)
+        self.cursor.set_stroke(BLACK, 2, background=True)
+
+        self.add(self.image, self.frame, self.cursor)
+
+        if show_labels:
+            self.x_label = MathTex(r"P(H)").scale(0.7).next_to(self.frame, DOWN, buff=0.15)
+            self.y_label = MathTex(r"P(E \mid H)").scale(0.7).rotate(PI / 2)
+            self.y_label.next_to(self.frame, LEFT, buff=0.15)
+            self.add(self.x_label, self.y_label)
+
+        self.antilikelihood = None
+        self.set_parameters(antilikelihood=antilikelihood, prior=0.5, likelihood=0.5)
+
+    def posterior(self, antilikelihood: float) -> np.ndarray:
+        """(resolution, resolution) grid of P(H | E)."""
+        denominator = self.numerator + self.not_prior * antilikelihood
+        return np.divide(self.numerator, denominator, out=np.zeros_like(self.numerator), where=denominator > 0)
+
+    def set_parameters(self, antilikelihood=None, prior=None, likelihood=None):
+        if antilikelihood is not None and antilikelihood != self.antilikelihood:
+            self.antilikelihood = antilikelihood
+            indices = (self.posterior(antilikelihood) * (len(self.lut) - 1)).astype(np.intp)
+            np.take(self.lut, indices, axis=0, out=self.image.pixel_array)
+        if prior is not None or likelihood is not None:
+            self.prior = self.prior if prior is None else prior
+            self.likelihood = self.likelihood if likelihood is None else likelihood
+            left, bottom, _ = self.image.get_corner(DL)
+            self.cursor.move_to([
+                left + self.prior * self.image.width,
+                bottom + self.likelihood * self.image.height,
+                0,
+            ])
+        return self
+
+    def track(self, diagram):
+        """Keep texture and cursor in sync with a diagram's parameters."""
+        self.add_updater(lambda m: m.set_parameters(
+            antilikelihood=diagram.antilikelihood,
+            prior=diagram.prior,
+            likelihood=diagram.likelihood,
+        ))
+        return self
+
+    def morph_to(self, antilikelihood: float, **kwargs):
+        """Animate the antilikelihood; only the texture is rewritten."""
+        start = self.antilikelihood
+        return ParameterAnimation(
+            self,
+            lambda alpha: dict(antilikelihood=interpolate(start, antilikelihood, alpha)),
+            **kwargs,
+        )
+
+
+class PosteriorLandscape(BayesScene):
+    def construct(self):
+        self.camera.background_color = BG
+
+        title = Text("How the posterior depends on everything", font_size=36)
+        title.set_color_by_gradient(BLUE_B, TEAL_A)
+        title.to_edge(UP, buff=0.4)
+
+        diagram = BayesDiagram(0.35, 0.6, 0.2, height=3.0)
+        diagram.shift(3 * LEFT + 0.3 * DOWN)
+
+        heatmap = PosteriorHeatmap(antilikelihood=0.2, side_length=3.0)
+        heatmap.shift(2.5 * RIGHT + 0.3 * DOWN)
+        heatmap.track(diagram)
+
+        self.play(FadeIn(title, shift=0.2 * DOWN), run_time=0.8)
+        self.play(FadeIn(diagram), FadeIn(heatmap), run_time=1.2)
+        self.wait(0.5)
+
+        # Move along the likelihood axis, then flatten the landscape
+        self.play(UpdateFromAlphaFunc(
+            diagram, lambda m, a: m.set_likelihood(interpolate(0.6, 0.9, a))
+        ), run_time=2.0)
+        self.play(UpdateFromAlphaFunc(
+            diagram, lambda m, a: m.set_antilikelihood(interpolate(0.2, 0.6, a))
+        ), run_time=3.0)
+        self.wait(2.0)
+
+
+# --------------------------------------------------------------------
+# Bayesian networks: several tests and a confounder
+# --------------------------------------------------------------------
+class BayesNetDiagram(VGroup):
+    """
+    A bayesnet.BayesNet drawn as boxes and arrows, every box with a
+    SimpleProbabilityBar of P(node = true).
+
+    observe() returns an animation to new evidence: the posteriors are
+    computed once (one message pass, see bayesnet.py) and the bars slide
+    there with set_p, so a frame costs the same as for a single bar.
+    Observed nodes get an evidence-colored outline.
+
+    positions maps node names to (x, y); by default nodes are laid out in
+    rows by depth, roots on top.
+    """
+
+    def __init__(
+        self,
+        net,
+        positions=None,
+        node_width=2.2,
+        node_height=1.0,
+        row_gap=1.6,
+        state="true",
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.net = net
+        self.state = state
+        self.evidence = {}
+        self.posteriors = self._posteriors({})
+        positions = positions or self._layered_positions(node_width + 0.5, row_gap)
+
+        self.boxes, self.bars, self.labels = {}, {}, {}
+        nodes = VGroup()
+        for name in net.names:
+            x, y = positions[name]
+            box = RoundedRectangle(width=node_width, height=node_height, corner_radius=0.15)
+            box.set_fill(GREY_E, opacity=1.0)
+            box.set_stroke(WHITE, 2)
+            box.move_to([x, y, 0])
+            label = Text(name, font_size=24)
+            label.move_to(box.get_top() + 0.28 * DOWN)
+            bar = SimpleProbabilityBar(
+                p=self.posteriors[name], width=node_width - 0.3, height=0.26, color1=COLOR_POST
+            )
+            bar.move_to(box.get_bottom() + 0.3 * UP)
+            self.boxes[name], self.labels[name], self.bars[name] = box, label, bar
+            nodes.add(VGroup(box, label, bar))
+
+        arrows = VGroup()
+        for child, parents in zip(net.names, net.parents):
+            for parent in parents:
+                arrows.add(self._arrow(self.boxes[net.names[parent]], self.boxes[child]))
+
+        self.nodes = nodes
+        self.arrows = arrows
+        self.add(arrows, nodes)
+        self.move_to(ORIGIN)
+
+    def _layered_positions(self, column_gap, row_gap) -> dict:
+        depth = {}
+        for name, parents in zip(self.net.names, self.net.parents):
+            depth[name] = 1 + max((depth[self.net.names[p]] for p in parents), default=-1)
+        rows = {}
+        for name in self.net.names:
+            rows.setdefault(depth[name], []).append(name)
+        positions = {}
+        for d, names in rows.items():
+            for i, name in enumerate(names):
+                positions[name] = ((i - (len(names) - 1) / 2) * column_gap, -d * row_gap)
+        return positions
+
+    @staticmethod
+    def _arrow(start_box, end_box):
+        delta = end_box.get_center() - start_box.get_center()
+        if abs(delta[1]) >= 0.5 * abs(delta[0]):
+            start, end = (start_box.get_bottom(), end_box.get_top()) if delta[1] < 0 else (start_box.get_top(), end_box.get_bottom())
+        else:
+            start, end = (start_box.get_right(), end_box.get_left()) if delta[0] > 0 else (start_box.get_left(), end_box.get_right())
+        return Arrow(start, end, buff=0.05, stroke_width=3, max_tip_length_to_length_ratio=0.15, color=GREY_B)
+
+    def _posteriors(self, evidence) -> dict:
+        marginals = self.net.query(evidence)
+        return {
+            name: float(marginals[name][self.net.states[i].index(self.state)])
+            for i, name in enumerate(self.net.names)
+        }
+
+    def set_parameters(self, posteriors=None, highlight=None):
+        """Bars to the given P(true) values; highlight fades outlines (0 plain, 1 observed)."""
+        for name, p in (posteriors or {}).items():
+            self.bars[name].set_p(p)
+            self.posteriors[name] = p
+        for name, t in (highlight or {}).items():
+            self.boxes[name].set_stroke(interpolate_color(WHITE, COLOR_EVID, t), 2 + 2 * t)
+        return self
+
+    def observe(self, evidence=None, **kwargs):
+        """
+        Animation to the posteriors after updating the evidence; a value of
+        None retracts a node's evidence. Play it before calling observe()
+        again.
+        """
+        previous = dict(self.evidence)
+        self.evidence = {
+            name: value for name, value in {**previous, **(evidence or {})}.items() if value is not None
+        }
+        start = dict(self.posteriors)
+        target = self._posteriors(self.evidence)
+        changed = set(previous) ^ set(self.evidence)
+        outline = {name: (name in previous, name in self.evidence) for name in changed}
+
+        def params(alpha):
+            return dict(
+                posteriors={name: start[name] + alpha * (target[name] - start[name]) for name in start},
+                highlight={name: a + alpha * (b - a) for name, (a, b) in outline.items()},
+            )
+
+        return ParameterAnimation(self, params, **kwargs)
+
+
+def medical_network():
+    """A disease with two tests, a symptom, and smoking as a confounder."""
+    net = BayesNet()
+    net.add_node("Smoker", [], [0.75, 0.25])
+    net.add_node("Older", [], [0.6, 0.4])
+    net.add_node("Disease", ["Smoker", "Older"], [
+        [[0.98, 0.02], [0.94, 0.06]],   # non-smoker: younger, older
+        [[0.92, 0.08], [0.80, 0.20]],   # smoker
+    ])
+    net.add_node("Test A", ["Disease"], [[0.92, 0.08], [0.15, 0.85]])
+    net.add_node("Test B", ["Disease", "Smoker"], [
+        [[0.97, 0.03], [0.85, 0.15]],   # healthy: false positives are smoking-related
+        [[0.10, 0.90], [0.10, 0.90]],
+    ])
+    net.add_node("Cough", ["Disease", "Smoker"], [
+        [[0.90, 0.10], [0.55, 0.45]],
+        [[0.40, 0.60], [0.25, 0.75]],
+    ])
+    return net
+
+
+class BayesNetworkEvidence(BayesScene):
+    def construct(self):
+        self.camera.background_color = BG
+
+        title = Text("Several tests, one confounder", font_size=40)
+        title.set_color_by_gradient(BLUE_B, TEAL_A)
+        title.to_edge(UP, buff=0.4)
+
+        diagram = BayesNetDiagram(medical_network(), row_gap=1.7)
+        diagram.next_to(title, DOWN, buff=0.5)
+
+        caption = Tex(r"Bars show $P(\text{node} \mid \text{evidence})$", font_size=30)
+        caption.to_edge(DOWN, buff=0.4)
+
+        self.play(FadeIn(title, shift=0.2 * DOWN), run_time=0.8)
+        self.play(FadeIn(diagram.nodes), run_time=1.0)
+        self.play(LaggedStart(*[GrowArrow(a) for a in diagram.arrows], lag_ratio=0.15), FadeIn(caption), run_time=1.2)
+        self.wait(0.5)
+
+        # Positive test, then a second opinion, then the confounder shows up
+        for evidence in (
+            {"Test A": "true"},
+            {"Cough": "true"},
+            {"Test B": "true"},
+            {"Smoker": "true"},
+            {"Test B": None},
+        ):
+            self.play(diagram.observe(evidence), run_time=1.5)
+            self.wait(0.8)
+        self.wait(1.5)
+
+
+# --------------------------------------------------------------------
+# Many hypotheses at once: one chart, one vertex array
+# --------------------------------------------------------------------
+class PosteriorChart(VGroup):
+    """
+    Posterior over many hypotheses as a bar chart: values[i] fills bar i
+    up to values[i] / max_value of the chart's height.
+
+    All filled bars are subpaths of one VMobject (and all the grey tracks
+    behind them of another), so set_values() is one rectangle_points()
+    call and one write into the points array, however many bars there
+    are. Bars are COLOR_POST on grey tracks, as for the posterior
+    elsewhere; positions are taken from the tracks on every call, so
+    move_to()/scale() carry over.
+
+    Only the top_k largest bars get a percentage label, from the same
+    cached MathTex set as SimpleProbabilityBar; a label is swapped only
+    when its rounded value changes.
+    """
+
+    def __init__(
+        self,
+        values,
+        width=10.0,
+        height=3.0,
+        gap=0.2,
+        max_value=1.0,
+        top_k=3,
+        color1=COLOR_POST,
+        color2=GREY_B,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        # not self.height: Mobject.height is the live bounding box
+        self.bar_height = height
+        self.max_value = max_value
+        self.top_k = min(top_k, n)
+
+        pitch = width / n
+        self._x0 = np.arange(n) * pitch + gap * pitch / 2  # relative to the chart's left edge
+        self._x1 = self._x0 + (1 - gap) * pitch
+        zeros, full = np.zeros(n), np.full(n, height)
+        stroke = 1 if (1 - gap) * pitch > 0.08 else 0
+
+        self.tracks = VMobject()
+        self.tracks.set_points(rectangle_points(self._x0, self._x1, zeros, full))
+        self.tracks.set_fill(color2, opacity=0.35).set_stroke(WHITE, stroke, opacity=0.5)
+        self.bars = VMobject()
+        self.bars.set_points(rectangle_points(self._x0, self._x1, zeros, zeros))
+        self.bars.set_fill(color1, opacity=1.0).set_stroke(WHITE, stroke)
+
+        self.labels = VGroup(*[_percent_label(0).copy() for _ in range(self.top_k)])
+        self._label_percents = [0] * self.top_k
+        self.add(self.tracks, self.bars, self.labels)
+        self.move_to(ORIGIN)
+        self.set_values(values)
+
+    def set_values(self, values):
+        values = np.asarray(values, dtype=float)
+        self.values = values
+        # chart coordinates -> scene points, following the tracks if they moved
+        span = self._x1[-1] - self._x0[0]
+        scale = self.tracks.width / span
+        left, bottom, _ = self.tracks.get_corner(DL) - scale * self._x0[0] * RIGHT
+        tops = bottom + scale * self.bar_height * np.clip(values / self.max_value, 0, 1)
+        self.bars.points[...] = rectangle_points(
+            left + scale * self._x0, left + scale * self._x1, np.full(len(values), bottom), tops,
+        )
+
+        if self.top_k:
+            top = np.argpartition(-values, self.top_k - 1)[:self.top_k]
+            for slot, i in enumerate(top[np.argsort(-values[top])]):
+                percent = min(max(int(round(100 * values[i])), 0), 100)
+                label = self.labels[slot]
+                if percent != self._label_percents[slot]:
+                    label.become(_percent_label(percent))
+                    self._label_percents[slot] = percent
+                label.next_to([left + scale * (self._x0[i] + self._x1[i]) / 2, tops[i], 0], UP, buff=0.08)
+        return self
+
+    def set_parameters(self, values=None):
+        return self.set_values(self.values if values is None else values)
+
+    def animate_to(self, values, **kwargs):
+        """Animation from the current values to new ones, every bar at once."""
+        start, end = self.values.copy(), np.asarray(values, dtype=float)
+        return ParameterAnimation(self, lambda alpha: dict(values=start + alpha * (end - start)), **kwargs)
+
+
+class HypothesisGridUpdating(BayesScene):
+    def construct(self):
+        self.camera.background_color = BG
+
+        title = Text("200 hypotheses about a coin", font_size=40)
+        title.set_color_by_gradient(BLUE_B, TEAL_A)
+        title.to_edge(UP, buff=0.5)
+
+        # theta_i on a grid, uniform prior; the posterior after h heads in n flips
+        theta = (np.arange(200) + 0.5) / 200
+        log_theta, log_1mt = np.log(theta), np.log1p(-theta)
+
+        def posterior(heads, flips):
+            log_post = heads * log_theta + (flips - heads) * log_1mt
+            post = np.exp(log_post - log_post.max())
+            return post / post.sum()
+
+        chart = PosteriorChart(posterior(0, 0), width=11, height=4.0, max_value=0.1, top_k=3)
+        chart.next_to(title, DOWN, buff=0.6)
+        caption = Tex(r"$P(\theta_i \mid \text{flips})$, true bias $0.7$", font_size=30)
+        caption.next_to(chart, DOWN, buff=0.3)
+
+        self.play(FadeIn(title, shift=0.2 * DOWN), FadeIn(chart), FadeIn(caption), run_time=1.0)
+        self.wait(0.5)
+
+        rng = np.random.default_rng(0)
+        heads = np.concatenate([[0], np.cumsum(rng.random(400) < 0.7)])
+        for n in (1, 2, 5, 10, 25, 50, 100, 200, 400):
+            self.play(chart.animate_to(posterior(heads[n], n)), run_time=0.8)
+            self.wait(0.2)
+        self.wait(1.5)
@@ -0,0 +1,424 @@
+"""
+Voiceover narration with scene timing fitted to the recorded lines.
+
+Clips are local WAV files, one directory per scene:
+
+    HPL112/narration/Scene1_TitleCard/intro.wav
+    HPL112/narration/Scene1_TitleCard/cues.toml     # optional with a single clip
+
+cues.toml says which play()/wait() calls (half-open index range, waits
+count as plays) each line is spoken over:
+
+    [[cue]]
+    file = "intro.wav"
+    plays = [0, 4]
+    lead_in = 0.2      # silence before the line, default 0
+    tail = 0.3         # room after it, default 0.3
+
+The scene's natural timings come from one frameless fast-forward pass
+(cached per source hash under media/narration/). FullBayesMovie has no
+clips of its own: each of its segments is narrated with that scene's
+clips. Each cue range is then
+stretched or compressed to lead_in + clip + tail: the waits absorb the
+difference as long as they keep at least a quarter of their length,
+otherwise every run_time in the range is scaled. Clip lengths are read by
+streaming the files in chunks.
+
+The narration track is written next to the partial movies and muxed while
+the partial movies are concatenated, in the same ffmpeg pass. Re-recording
+a line only changes the timings of its own cue range, so manim's partial
+movie cache still has every other play, and other scenes are untouched.
+
+Check a scene's fit without rendering (from the repo root):
+    python HPL112/src/narration.py Scene1_TitleCard
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import tomllib
+import wave
+from pathlib import Path
+
+try:
+    import audioop  # audioop-lts on Python 3.13+
+except ImportError:  # pragma: no cover
+    audioop = None
+
+import numpy as np
+from manim import Wait, config, logger, tempconfig
+from manim.utils.file_ops import is_gif_format
+
+from framepool import PooledFrameScene
+from partial import NARRATION_TRACK, FastForwardRenderer, SegmentFileWriter, concat_segments, partial_movie_files
+from timeline import TIMELINE_DIR
+
+NARRATION_DIR = Path(__file__).resolve().parents[1] / "narration"
+CUES_FILE = "cues.toml"
+CHUNK_FRAMES = 64 * 1024
+TRACK_FORMAT = (2, 2, 48000)  # channels, sample width in bytes, sample rate
+DEFAULT_TAIL = 0.3
+MIN_WAIT_SHARE = 0.25
+
+_measuring = False
+
+
+# --------------------------------------------------------------------
+# WAV files, streamed
+# --------------------------------------------------------------------
+def wav_duration(path) -> float:
+    """Length in seconds, counted over the data itself (headers can lie)."""
+    with wave.open(str(path), "rb") as wav:
+        frame_bytes = wav.getsampwidth() * wav.getnchannels()
+        frames = 0
+        while chunk := wav.readframes(CHUNK_FRAMES):
+            frames += len(chunk) // frame_bytes
+        return frames / wav.getframerate()
+
+
+def _convert(chunk, source, state):
+    """Convert one chunk from source (channels, width, rate) to TRACK_FORMAT."""
+    channels, width, rate = source
+    out_channels, out_width, out_rate = TRACK_FORMAT
+    if width == 1:
+        chunk = audioop.bias(chunk, 1, -128)  # 8-bit WAV is unsigned
+    if width != out_width:
+        chunk = audioop.lin2lin(chunk, width, out_width)
+    if channels == 2 and out_channels == 1:
+        chunk = audioop.tomono(chunk, out_width, 0.5, 0.5)
+    elif channels == 1 and out_channels == 2:
+        chunk = audioop.tostereo(chunk, out_width, 1, 1)
+    elif channels != out_channels:
+        raise ValueError(f"cannot convert {channels}-channel audio")
+    if rate != out_rate:
+        chunk, state = audioop.ratecv(chunk, out_width, out_channels, rate, out_rate, state)
+    return chunk, state
+
+
+def _write_silence(out, frames: int):
+    frame_bytes = TRACK_FORMAT[0] * TRACK_FORMAT[1]
+    block = bytes(CHUNK_FRAMES * frame_bytes)
+    while frames > 0:
+        n = min(frames, CHUNK_FRAMES)
+        out.writeframesraw(block[:n * frame_bytes])
+        frames -= n
+
+
+def _copy_clip(out, path) -> int:
+    """Append a clip to out chunk by chunk; returns frames written."""
+    frame_bytes = TRACK_FORMAT[0] * TRACK_FORMAT[1]
+    written = 0
+    state = None
+    with wave.open(str(path), "rb") as clip:
+        source = (clip.getnchannels(), clip.getsampwidth(), clip.getframerate())
+        convert = source != TRACK_FORMAT
+        if convert and audioop is None:
+            raise RuntimeError(f"{path} is not {TRACK_FORMAT} and audioop is unavailable")
+        while chunk := clip.readframes(CHUNK_FRAMES):
+            if convert:
+                chunk, state = _convert(chunk, source, state)
+            out.writeframesraw(chunk)
+            written += len(chunk) // frame_bytes
+    return written
+
+
+def write_track(path, placements, total_seconds: float) -> Path:
+    """
+    One WAV with each (start_seconds, clip_path) placed on a silent track
+    total_seconds long. A clip that would overlap the previous one starts
+    right after it instead.
+    """
+    channels, width, rate = TRACK_FORMAT
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(width)
+        out.setframerate(rate)
+        position = 0
+        for start, clip in placements:
+            gap = round(start * rate) - position
+            _write_silence(out, gap)
+            position += max(gap, 0)
+            position += _copy_clip(out, clip)
+        _write_silence(out, round(total_seconds * rate) - position)
+    return path
+
+
+# --------------------------------------------------------------------
+# Cues and natural timings
+# --------------------------------------------------------------------
+def load_cues(scene_name: str, directory=NARRATION_DIR) -> list[dict] | None:
+    scene_dir = Path(directory) / scene_name
+    clips = sorted(scene_dir.glob("*.wav"))
+    if not clips:
+        return None
+    cues_path = scene_dir / CUES_FILE
+    if cues_path.exists():
+        cues = tomllib.loads(cues_path.read_text()).get("cue", [])
+    elif len(clips) == 1:
+        cues = [{"file": clips[0].name}]
+    else:
+        raise ValueError(f"{scene_dir} has {len(clips)} clips but no {CUES_FILE}")
+    for cue in cues:
+        cue["path"] = scene_dir / cue["file"]
+        if not cue["path"].exists():
+            raise FileNotFoundError(cue["path"])
+    return cues
+
+
+def _cache_path(scene_name: str) -> Path:
+    return Path(config.media_dir) / "narration" / f"{scene_name}.json"
+
+
+def source_hash(scene_cls) -> str:
+    """Over the scene's module and the helper modules beside it, plus the timelines."""
+    sources = sorted(Path(inspect.getfile(scene_cls)).parent.glob("*.py"))
+    h = hashlib.sha256()
+    for path in sources + sorted(TIMELINE_DIR.glob("*.*")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()[:24]
+
+
+class _TimingRenderer(FastForwardRenderer):
+    """Fast-forwards through every play, recording what each one was."""
+
+    def __init__(self, **kwargs):
+        super().__init__(play_range=(float("inf"), None), **kwargs)
+        self.timings = []
+
+    def play(self, scene, *args, **kwargs):
+        super().play(scene, *args, **kwargs)
+        animations = scene.animations
+        self.timings.append({
+            "duration": float(scene.duration),
+            "wait": len(animations) == 1 and isinstance(animations[0], Wait),
+            "frozen": bool(scene.is_current_animation_frozen_frame()),
+        })
+
+
+def measure_timings(scene_cls) -> tuple[list[dict], list[list]]:
+    """
+    Natural duration of every play()/wait(), without rendering frames,
+    plus [label, plays so far] for every end_segment() a multi-segment
+    scene calls.
+    """
+    global _measuring
+    settings = {"quality": "low_quality", "write_to_movie": False, "save_last_frame": False,
+                "disable_caching": True, "preview": False}
+    _measuring = True
+    try:
+        with tempconfig(settings):
+            renderer = _TimingRenderer()
+            scene = scene_cls(renderer=renderer)
+            scene.render()
+    finally:
+        _measuring = False
+    return renderer.timings, [list(end) for end in getattr(scene, "segment_ends", [])]
+
+
+def _measured(scene_cls) -> dict:
+    path = _cache_path(scene_cls.__name__)
+    key = source_hash(scene_cls)
+    if path.exists():
+        cached = json.loads(path.read_text())
+        if cached.get("source") == key:
+            return cached
+    timings, segments = measure_timings(scene_cls)
+    measured = {"source": key, "timings": timings, "segments": segments}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(measured, indent=1))
+    return measured
+
+
+def natural_timings(scene_cls) -> list[dict]:
+    """measure_timings(), cached until a source file or a timeline changes."""
+    return _measured(scene_cls)["timings"]
+
+
+def natural_segments(scene_cls) -> list[list]:
+    """[label, plays so far] after each segment of a multi-segment scene."""
+    return _measured(scene_cls)["segments"]
+
+
+def fit_cues(timings: list[dict], cues: list[dict], clip_seconds: list[float]) -> list[float]:
+    """Per-play run_time factors that give each cue range its clip's length."""
+    factors = [1.0] * len(timings)
+    previous_stop = 0
+    for cue, clip in sorted(zip(cues, clip_seconds), key=lambda pair: pair[0].get("plays", [0])[0]):
+        start, stop = cue.get("plays", [0, len(timings)])
+        if not 0 <= start < stop <= len(timings) or start < previous_stop:
+            raise ValueError(f"cue {cue['file']}: bad or overlapping play range {start}:{stop}")
+        previous_stop = stop
+
+        span = timings[start:stop]
+        natural = sum(t["duration"] for t in span)
+        waits = sum(t["duration"] for t in span if t["wait"])
+        target = cue.get("lead_in", 0.0) + clip + cue.get("tail", DEFAULT_TAIL)
+        animated = natural - waits
+
+        if waits > 0 and target - animated >= MIN_WAIT_SHARE * waits:
+            wait_factor = (target - animated) / waits
+            for i in range(start, stop):
+                if timings[i]["wait"]:
+                    factors[i] = wait_factor
+        else:
+            for i in range(start, stop):
+                factors[i] = target / natural
+    return factors
+
+
+def play_frames(duration: float, frozen: bool, frame_rate: float) -> int:
+    """Frames a play of this length writes (same arithmetic as the renderer)."""
+    dt = 1 / frame_rate
+    if frozen:
+        return int(duration / dt)
+    return len(np.arange(0, duration, dt))
+
+
+class NarrationPlan:
+    """Fitted timings for one scene plus where each clip starts."""
+
+    def __init__(self, timings, cues, clip_seconds):
+        self.timings = timings
+        self.cues = cues
+        self.clip_seconds = clip_seconds
+        self.factors = fit_cues(timings, cues, clip_seconds)
+
+    @classmethod
+    def for_scene(cls, scene_cls, directory=NARRATION_DIR):
+        cues = load_cues(scene_cls.__name__, directory)
+        if cues is None:
+            return cls.for_segments(scene_cls, directory)
+        clip_seconds = [wav_duration(cue["path"]) for cue in cues]
+        return cls(natural_timings(scene_cls), cues, clip_seconds)
+
+    @classmethod
+    def for_segments(cls, scene_cls, directory=NARRATION_DIR):
+        """
+        A multi-segment scene (FullBayesMovie) with no clips of its own is
+        narrated with each segment's clips, their play ranges shifted to
+        where the segment starts.
+        """
+        if not hasattr(scene_cls, "end_segment") or not any(Path(directory).glob("*/*.wav")):
+            return None
+        cues = []
+        start = 0
+        for label, end in natural_segments(scene_cls):
+            for cue in load_cues(label, directory) or []:
+                first, stop = cue.get("plays", [0, end - start])
+                cues.append({**cue, "plays": [start + first, start + stop]})
+            start = end
+        if not cues:
+            return None
+        clip_seconds = [wav_duration(cue["path"]) for cue in cues]
+        return cls(natural_timings(scene_cls), cues, clip_seconds)
+
+    def factor(self, index: int) -> float:
+        return self.factors[index] if index < len(self.factors) else 1.0
+
+    def durations(self) -> list[float]:
+        return [t["duration"] * f for t, f in zip(self.timings, self.factors)]
+
+    def play_starts(self, frame_rate: float) -> list[float]:
+        """Start time of every play, plus the scene's end, in seconds."""
+        starts = [0]
+        for timing, duration in zip(self.timings, self.durations()):
+            starts.append(starts[-1] + play_frames(duration, timing["frozen"], frame_rate))
+        return [frames / frame_rate for frames in starts]
+
+    def write_track(self, path, frame_rate=None) -> Path:
+        frame_rate = frame_rate or config.frame_rate
+        starts = self.play_starts(frame_rate)
+        placements = sorted(
+            (starts[cue.get("plays", [0])[0]] + cue.get("lead_in", 0.0), cue["path"])
+            for cue in self.cues
+        )
+        return write_track(path, placements, starts[-1])
+
+
+# --------------------------------------------------------------------
+# Scene and file writer
+# --------------------------------------------------------------------
+class NarratedFileWriter(SegmentFileWriter):
+    """Muxes the narration track while concatenating, in one ffmpeg pass."""
+
+    narration_track = None
+
+    def combine_to_movie(self):
+        if self.narration_track is None or is_gif_format():
+            return super().combine_to_movie()
+        logger.info("Combining to Movie file with narration.")
+        files = [f for f in partial_movie_files(self) if f is not None]
+        concat_segments(files, Path(self.movie_file_path), audio=self.narration_track)
+        self.print_file_ready_message(str(self.movie_file_path))
+
+
+class NarratedScene(PooledFrameScene):
+    """Fits play()/wait() timings to HPL112/narration/<SceneName>/ when present."""
+
+    def make_renderer(self, skip_animations=False, **kwargs):
+        kwargs.setdefault("file_writer_class", NarratedFileWriter)
+        return super().make_renderer(skip_animations=skip_animations, **kwargs)
+
+    def setup(self):
+        super().setup()
+        self.narration_index = 0
+        self.narration_plan = None if _measuring else NarrationPlan.for_scene(type(self))
+
+    def compile_animations(self, *args, **kwargs):
+        animations = super().compile_animations(*args, **kwargs)
+        if self.narration_plan is not None:
+            factor = self.narration_plan.factor(self.narration_index)
+            self.narration_index += 1
+            if factor != 1.0:
+                for anim in animations:
+                    anim.run_time *= factor
+                    if isinstance(anim, Wait):
+                        anim.duration *= factor
+        return animations
+
+    def tear_down(self):
+        super().tear_down()
+        file_writer = self.renderer.file_writer
+        directory = getattr(file_writer, "partial_movie_directory", None)
+        if self.narration_plan is None or directory is None:
+            return
+        track = self.narration_plan.write_track(Path(directory) / NARRATION_TRACK)
+        if isinstance(file_writer, NarratedFileWriter):
+            file_writer.narration_track = track
+
+
+# --------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scene")
+    parser.add_argument("--track", help="also write the narration track to this WAV file")
+    args = parser.parse_args()
+
+    import main
+
+    scene_cls = getattr(main, args.scene)
+    plan = NarrationPlan.for_scene(scene_cls)
+    if plan is None:
+        print(f"no clips in {NARRATION_DIR / args.scene}")
+        return
+    durations = plan.durations()
+    for cue, clip in zip(plan.cues, plan.clip_seconds):
+        start, stop = cue.get("plays", [0, len(plan.timings)])
+        natural = sum(t["duration"] for t in plan.timings[start:stop])
+        fitted = sum(durations[start:stop])
+        print(f"{cue['file']:>24}  plays {start}:{stop}  clip {clip:6.2f}s  "
+              f"natural {natural:6.2f}s -> {fitted:6.2f}s")
+    if args.track:
+        print(plan.write_track(args.track))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,400 @@
+"""
+Render orchestrator: a queue of render jobs run a few at a time.
+
+Each job renders one scene -- a scene from main.py, FullBayesMovie, or a
+parameterized variant of Scene4/Scene5 (prior, likelihood, antilikelihood)
+-- in its own worker process, so a running job can be cancelled by
+terminating it. At most --concurrency workers run at once.
+
+Progress goes out as JSON lines on stdout and, with --socket, to every
+client of a local Unix socket:
+
+    {"event": "progress", "job": "Scene4_BayesVisualization", "frames": 412,
+     "fps": 38.5, "progress": 0.3124, "eta": 23.4, "time": ...}
+
+Other events: queued, started, finished, failed, cancelled. Socket clients
+can send commands, one JSON object per line:
+
+    {"cmd": "submit", "scene": "Scene5_BayesEquationWithDiagrams", "params": {"prior": 0.5}}
+    {"cmd": "cancel", "job": "<id>"}
+    {"cmd": "resume", "job": "<id>"}
+    {"cmd": "status"}
+
+With --state, job statuses are kept in a JSON file; --resume re-queues
+every job that did not finish. A resumed job starts over from the top of
+the scene, but manim's partial movie cache still has every play that was
+finished before the cancel, so only the rest is rendered. The cancelled
+play itself is rendered again: segments are encoded under a temporary
+name and only moved to their cache path once complete (see partial.py).
+Workers choose their renderer as a plain `manim` run does, so
+BAYES_CHECKPOINT (and the other BAYES_* variables) apply to jobs too.
+
+Usage (from the repo root):
+    python HPL112/src/orchestrate.py Scene1_TitleCard Scene2_History FullBayesMovie -c 2
+    python HPL112/src/orchestrate.py --jobs jobs.json -c 4 --state render-state.json --socket /tmp/bayes.sock
+    python HPL112/src/orchestrate.py --resume --state render-state.json
+
+jobs.json is a list of {"scene": ..., "params": {...}, "quality": ...}.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+EVENT_PREFIX = "@@bayes-render "
+LOG_DIR = Path("media") / "orchestrator"
+DONE = ("finished", "failed", "cancelled")
+
+
+# --------------------------------------------------------------------
+# Jobs
+# --------------------------------------------------------------------
+def variant_name(scene: str, params: dict) -> str:
+    """Class (and movie file) name of a parameterized scene."""
+    if not params:
+        return scene
+    parts = [f"{key}{value}".replace(".", "p").replace("-", "m") for key, value in sorted(params.items())]
+    return f"{scene}__{'_'.join(parts)}"
+
+
+class RenderJob:
+    def __init__(self, scene, params=None, quality="low_quality", job_id=None, status="queued", movie=None, error=None):
+        self.scene = scene
+        self.params = dict(params or {})
+        self.quality = quality
+        self.id = job_id or f"{variant_name(scene, self.params)}@{quality}"
+        self.status = status
+        self.movie = movie
+        self.error = error
+        self.process = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id, "scene": self.scene, "params": self.params, "quality": self.quality,
+            "status": self.status, "movie": self.movie, "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["scene"], data.get("params"), data.get("quality", "low_quality"),
+                   data.get("id"), data.get("status", "queued"), data.get("movie"), data.get("error"))
+
+
+# --------------------------------------------------------------------
+# Orchestrator
+# --------------------------------------------------------------------
+class Orchestrator:
+    def __init__(self, concurrency=1, state_path=None, serve=False):
+        self.concurrency = concurrency
+        self.state_path = Path(state_path) if state_path else None
+        self.serve = serve
+        self.jobs = {}
+        self.queue = asyncio.Queue()
+        self.subscribers = set()
+        self.idle = asyncio.Event()
+        self.stopping = False
+
+    # --- events and state ----------------------------------------------
+    def emit(self, event: dict):
+        event.setdefault("time", round(time.time(), 3))
+        line = json.dumps(event)
+        print(line, flush=True)
+        for writer in list(self.subscribers):
+            try:
+                writer.write(line.encode() + b"\n")
+            except (ConnectionError, RuntimeError):
+                self.subscribers.discard(writer)
+
+    def save_state(self):
+        if self.state_path is None:
+            return
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps([job.to_dict() for job in self.jobs.values()], indent=1))
+        tmp.replace(self.state_path)
+
+    def load_state(self) -> list[RenderJob]:
+        if self.state_path is None or not self.state_path.exists():
+            return []
+        return [RenderJob.from_dict(data) for data in json.loads(self.state_path.read_text())]
+
+    def _set_status(self, job, status, **fields):
+        job.status = status
+        for key, value in fields.items():
+            setattr(job, key, value)
+        self.save_state()
+        self.emit({"event": status, "job": job.id, **fields})
+        self._check_idle()
+
+    def _check_idle(self):
+        done = all(job.status in DONE for job in self.jobs.values())
+        if done and (self.stopping or not self.serve):
+            self.idle.set()
+        else:
+            self.idle.clear()
+
+    # --- commands --------------------------------------------------------
+    def submit(self, job: RenderJob) -> RenderJob:
+        base, n = job.id, 1
+        while job.id in self.jobs and self.jobs[job.id] is not job:
+            n += 1
+            job.id = f"{base}#{n}"
+        self.jobs[job.id] = job
+        self._set_status(job, "queued")
+        self.queue.put_nowait(job)
+        return job
+
+    def cancel(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.status in DONE:
+            return
+        if job.process is not None and job.process.returncode is None:
+            job.process.terminate()  # _run_job reports the cancel once it exits
+            job.status = "cancelling"
+        else:
+            self._set_status(job, "cancelled")
+
+    def resume(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is not None and job.status in ("cancelled", "failed"):
+            job.error = None
+            self._set_status(job, "queued")
+            self.queue.put_nowait(job)
+
+    def shutdown(self):
+        """Cancel everything and stop once the running workers have exited."""
+        self.stopping = True
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+        self._check_idle()
+
+    # --- running ----------------------------------------------------------
+    async def _run_job(self, job: RenderJob):
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        log_path = LOG_DIR / f"{job.id.replace('/', '_')}.log"
+        started = time.perf_counter()
+        with open(log_path, "w") as log:
+            job.process = await asyncio.create_subprocess_exec(
+                sys.executable, str(Path(__file__).resolve()), "--worker", json.dumps(job.to_dict()),
+                stdout=asyncio.subprocess.PIPE, stderr=log,
+            )
+            self._set_status(job, "started", error=None)
+            async for raw in job.process.stdout:
+                line = raw.decode(errors="replace")
+                if line.startswith(EVENT_PREFIX):
+                    event = json.loads(line[len(EVENT_PREFIX):])
+                    if event.get("event") == "result":
+                        job.movie = event.get("movie")
+                    else:
+                        self.emit({**event, "job": job.id})
+                else:
+                    log.write(line)
+            returncode = await job.process.wait()
+        job.process = None
+
+        seconds = round(time.perf_counter() - started, 2)
+        if job.status == "cancelling":
+            self._set_status(job, "cancelled", seconds=seconds)
+        elif returncode == 0:
+            self._set_status(job, "finished", movie=job.movie, seconds=seconds)
+        else:
+            self._set_status(job, "failed", error=f"exit code {returncode}, see {log_path}", seconds=seconds)
+
+    async def _worker_loop(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.status == "queued":
+                    await self._run_job(job)
+            finally:
+                self.queue.task_done()
+
+    async def _handle_client(self, reader, writer):
+        self.subscribers.add(writer)
+        try:
+            async for raw in reader:
+                try:
+                    command = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                cmd = command.pop("cmd", None)
+                if cmd == "submit":
+                    self.submit(RenderJob(command["scene"], command.get("params"), command.get("quality", "low_quality")))
+                elif cmd == "cancel":
+                    self.cancel(command["job"])
+                elif cmd == "resume":
+                    self.resume(command["job"])
+                elif cmd == "status":
+                    status = {"event": "status", "jobs": [job.to_dict() for job in self.jobs.values()]}
+                    writer.write(json.dumps(status).encode() + b"\n")
+                    await writer.drain()
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def run(self, jobs, socket_path=None):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.shutdown)
+            except NotImplementedError:  # Windows
+                pass
+
+        server = None
+        if socket_path:
+            Path(socket_path).unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+
+        workers = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+        for job in jobs:
+            self.submit(job)
+        self._check_idle()
+        try:
+            await self.idle.wait()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            if server is not None:
+                server.close()
+                Path(socket_path).unlink(missing_ok=True)
+        return list(self.jobs.values())
+
+
+# --------------------------------------------------------------------
+# Worker process
+# --------------------------------------------------------------------
+def _emit_from_worker(event: dict):
+    print(EVENT_PREFIX + json.dumps(event), flush=True)
+
+
+class ProgressReporter:
+    """
+    Reports frames written, fps and ETA at most every interval seconds.
+
+    Attached to whichever renderer the scene chose (checkpoint, frame
+    store, hashes or the plain pooled one) by wrapping its add_frame() and
+    play() on the instance.
+    """
+
+    def __init__(self, emit, total_seconds, interval=0.5):
+        self.emit = emit
+        self.total_seconds = total_seconds
+        self.interval = interval
+        self.renderer = None
+        self.frames_done = 0
+        self.started = time.perf_counter()
+        self.last_report = 0.0
+
+    def attach(self, renderer):
+        self.renderer = renderer
+        add_frame, play = renderer.add_frame, renderer.play
+
+        def counted_add_frame(frame, num_frames=1):
+            if not renderer.skip_animations:
+                self.frames_done += num_frames
+            add_frame(frame, num_frames)
+            self.report()
+
+        def reported_play(scene, *args, **kwargs):
+            play(scene, *args, **kwargs)
+            self.report()  # cached plays advance time without frames
+
+        renderer.add_frame = counted_add_frame
+        renderer.play = reported_play
+        self.started = time.perf_counter()
+
+    def report(self, force=False):
+        from manim import config
+
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.started
+        fps = self.frames_done / elapsed if elapsed > 0 else 0.0
+        done = self.renderer.time
+        remaining = max(self.total_seconds - done, 0.0) * config.frame_rate
+        self.emit({
+            "event": "progress",
+            "frames": self.frames_done,
+            "fps": round(fps, 1),
+            "progress": round(min(done / self.total_seconds, 1.0), 4) if self.total_seconds else None,
+            "eta": round(remaining / fps, 1) if fps > 0 else None,
+        })
+
+
+def run_worker(job: dict):
+    from manim import tempconfig
+
+    import main
+    from narration import NarrationPlan, natural_timings
+
+    base = getattr(main, job["scene"])
+    scene_cls = base
+    if job.get("params"):
+        # a real subclass, so the movie file and timing caches get their own name
+        scene_cls = type(variant_name(job["scene"], job["params"]), (base,), {
+            "parameters": {**base.parameters, **job["params"]},
+            "__module__": base.__module__,
+        })
+
+    plan = NarrationPlan.for_scene(scene_cls)
+    durations = plan.durations() if plan else [t["duration"] for t in natural_timings(scene_cls)]
+
+    with tempconfig({"quality": job.get("quality", "low_quality"), "preview": False, "progress_bar": "none"}):
+        # the scene picks its renderer as under `manim`, so BAYES_CHECKPOINT etc. apply
+        scene = scene_cls()
+        progress = ProgressReporter(_emit_from_worker, sum(durations))
+        progress.attach(scene.renderer)
+        scene.render()
+        progress.report(force=True)
+        _emit_from_worker({"event": "result", "movie": str(scene.renderer.file_writer.movie_file_path)})
+
+
+# --------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene class names to render")
+    parser.add_argument("--jobs", help="JSON file with a list of jobs")
+    parser.add_argument("-c", "--concurrency", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--state", help="job state file (enables --resume)")
+    parser.add_argument("--resume", action="store_true", help="re-queue unfinished jobs from --state")
+    parser.add_argument("--socket", help="Unix socket for progress events and commands")
+    parser.add_argument("--serve", action="store_true", help="keep running for socket submissions")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(json.loads(args.worker))
+        return
+
+    orchestrator = Orchestrator(args.concurrency, args.state, serve=args.serve)
+    jobs = [RenderJob(scene, quality=args.quality) for scene in args.scenes]
+    if args.jobs:
+        jobs += [RenderJob(d["scene"], d.get("params"), d.get("quality", args.quality))
+                 for d in json.loads(Path(args.jobs).read_text())]
+    if args.resume:
+        previous = orchestrator.load_state()
+        for job in previous:
+            if job.status == "finished":
+                orchestrator.jobs[job.id] = job  # keep finished jobs in the state file
+            else:
+                jobs.append(job)
+
+    if not jobs and not args.serve:
+        parser.error("nothing to render")
+    finished = asyncio.run(orchestrator.run(jobs, args.socket))
+    sys.exit(0 if all(job.status == "finished" for job in finished) else 1)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,496 @@
+"""
+Partial re-rendering of long scenes by play index or time window.
+
+Plays before the requested range are fast-forwarded: their animations
+jump to the end state (one interpolate(1), no AnimationPlan) and nothing
+is rasterized -- not even the static background manim normally captures
+for every play. Only plays inside the range produce frames.
+
+Every play is its own partial movie file. SegmentFileWriter encodes each
+one with the same fixed x264 settings and closed GOPs, so every file
+starts on an IDR frame and any run of them -- within a scene or across
+scenes -- concatenates with ffmpeg's concat demuxer and stream copy.
+Segments are kept in a partial movie subdirectory named after those
+settings, so cached files encoded differently are never mixed in. After
+each render segments.json next to them lists which file belongs to which
+play, with its frame count and start frame.
+
+A partial render is spliced back into the full scene that way: unchanged
+segments are never re-encoded. Time windows snap outward to play
+boundaries, the granularity of those segments. --assemble concatenates
+the segments of several scenes into one movie the same way, in seconds
+whatever its length; re-render one scene and assemble again to swap it.
+
+Usage (from the repo root):
+    python HPL112/src/partial.py Scene5_BayesEquationWithDiagrams                # full render
+    python HPL112/src/partial.py Scene5_BayesEquationWithDiagrams --plays 12:15  # plays 12, 13, 14
+    python HPL112/src/partial.py Scene5_BayesEquationWithDiagrams --time 20:26.5
+    python HPL112/src/partial.py Scene1_TitleCard Scene2_History ... --assemble movie.mp4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from manim import __version__, config, logger, tempconfig
+from manim.utils.exceptions import EndSceneEarlyException
+from manim.utils.file_ops import is_webm_format
+
+from framepool import PooledCairoRenderer, PooledFileWriter
+
+SEGMENTS_FILE = "segments.json"
+NARRATION_TRACK = "narration.wav"  # written next to the partial movies by narration.py
+
+# identical for every segment of every scene; x264 always opens a file with
+# an IDR frame, open-gop=0 keeps GOPs closed, scenecut=0 keeps GOP layout
+# independent of content
+ENCODER_ARGS = (
+    "-vcodec", "libx264", "-pix_fmt", "yuv420p",
+    "-preset", "medium", "-crf", "23", "-profile:v", "high",
+    "-x264-params", "open-gop=0:scenecut=0:keyint=250:bframes=3",
+)
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_version() -> str:
+    try:
+        result = subprocess.run([config.ffmpeg_executable, "-version"], capture_output=True, text=True)
+        return result.stdout.split("\n", 1)[0]
+    except OSError:
+        return "unknown"
+
+
+def encoder_signature() -> str:
+    """Everything that has to match for segments to stream-copy together."""
+    parts = [*ENCODER_ARGS, config.frame_rate, config.pixel_width, config.pixel_height, _ffmpeg_version()]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:10]
+
+
+def writing_path(file_path) -> Path:
+    """Where a partial movie is encoded until its play has finished."""
+    path = Path(file_path)
+    return path.with_name(f"{path.stem}.part{path.suffix}")
+
+
+class SegmentFileWriter(PooledFileWriter):
+    """
+    Encodes every partial movie with ENCODER_ARGS and records frame counts,
+    writing segments.json when the scene finishes.
+
+    With segments_only set (chunks of a larger render, see chunked.py, or
+    a partial render that splices itself into the full movie) the partial
+    movies are the whole output: no movie is combined and no segments.json
+    written.
+    """
+
+    segments_only = False
+
+    def init_output_directories(self, scene_name):
+        super().init_output_directories(scene_name)
+        if hasattr(self, "partial_movie_directory"):
+            directory = Path(self.partial_movie_directory) / f"kf-{encoder_signature()}"
+            directory.mkdir(parents=True, exist_ok=True)
+            self.partial_movie_directory = directory
+        self.segment_frames = {}
+        self.frames_in_segment = 0
+        previous = read_segments(segments_path(self)) if hasattr(self, "partial_movie_directory") else None
+        for play in previous or []:
+            if play.get("file") and play.get("frames") is not None:
+                self.segment_frames[play["file"]] = play["frames"]
+
+    def open_movie_pipe(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        self.frames_in_segment = 0
+        # encode under a temporary name: a killed render must not leave a
+        # short file at the hash path for the cache to pick up
+        self.writing_file_path = writing_path(file_path)
+        if is_webm_format() or config.transparent:
+            super().open_movie_pipe(self.writing_file_path)
+            self.partial_movie_file_path = file_path
+            return
+
+        fps = config.frame_rate
+        if fps == int(fps):
+            fps = int(fps)
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "rawvideo",
+            "-s", f"{config.pixel_width}x{config.pixel_height}",
+            "-pix_fmt", "rgba",
+            "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-loglevel", config.ffmpeg_loglevel.lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+            *ENCODER_ARGS,
+            "-video_track_timescale", str(round(config.frame_rate * 1000)),
+            str(self.writing_file_path),
+        ]
+        self.writing_process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write_frame(self, frame_or_renderer):
+        super().write_frame(frame_or_renderer)
+        self.frames_in_segment += 1
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        os.replace(self.writing_file_path, self.partial_movie_file_path)
+        self.segment_frames[str(self.partial_movie_file_path)] = self.frames_in_segment
+
+    def finish(self):
+        if self.segments_only:
+            return
+        super().finish()
+        if hasattr(self, "partial_movie_directory") and self.partial_movie_files:
+            durations = [None] * len(self.partial_movie_files)
+            write_segments(segments_path(self), self.output_name, segment_entries(self, durations))
+
+    def clean_cache(self):
+        """
+        manim's eviction, oldest first by atime, minus everything this
+        render's segments.json lists, the manifest and narration track
+        themselves, and segments still being encoded: a long scene would
+        otherwise delete its own first plays before the manifest names them.
+        """
+        not_movies = {SEGMENTS_FILE, NARRATION_TRACK, "partial_movie_file_list.txt"}
+        movies = [
+            path for path in Path(self.partial_movie_directory).iterdir()
+            if path.is_file() and path.name not in not_movies and ".part." not in path.name
+        ]
+        excess = len(movies) - config["max_files_cached"]
+        if excess <= 0:
+            return
+        in_use = {Path(f).name for f in partial_movie_files(self) if f is not None}
+        evictable = sorted((path for path in movies if path.name not in in_use), key=lambda path: path.stat().st_atime)
+        for path in evictable[:excess]:
+            path.unlink()
+        logger.info(
+            f"The partial movie directory is full (> {config['max_files_cached']} files); removed "
+            f"{min(excess, len(evictable))} old segment(s), none of the {len(in_use)} this render uses."
+        )
+
+
+class FastForwardRenderer(PooledCairoRenderer):
+    """
+    Renders plays in [start, stop) only; everything before is applied as
+    end states without rasterization, everything after is never run.
+
+    Also records the run time of every play, skipped or not.
+    """
+
+    def __init__(self, play_range=None, **kwargs):
+        kwargs.setdefault("file_writer_class", SegmentFileWriter)
+        super().__init__(**kwargs)
+        self.play_range = play_range
+        self.play_durations = []
+
+    def update_skipping_status(self):
+        super().update_skipping_status()
+        if self.play_range is None:
+            return
+        start, stop = self.play_range
+        if self.num_plays < start:
+            self.skip_animations = True
+        elif stop is not None and self.num_plays >= stop:
+            self.skip_animations = True
+            raise EndSceneEarlyException()
+
+    def play(self, scene, *args, **kwargs):
+        super().play(scene, *args, **kwargs)
+        self.play_durations.append(scene.get_run_time(scene.animations))
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        if self.skip_animations:
+            return
+        super().update_frame(scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        if self.skip_animations:
+            self.static_image = None
+            return None
+        return super().save_static_frame_data(scene, static_mobjects)
+
+    def freeze_current_frame(self, duration: float):
+        if self.skip_animations:
+            return
+        super().freeze_current_frame(duration)
+
+    # --- segment bookkeeping ---------------------------------------------
+    def segments(self) -> list[dict]:
+        return segment_entries(self.file_writer, self.play_durations)
+
+
+# --------------------------------------------------------------------
+# Segment manifests and splicing
+# --------------------------------------------------------------------
+def partial_movie_files(file_writer) -> list:
+    """One entry per play (None for skipped plays), across all sections."""
+    sections = getattr(file_writer, "sections", None)
+    if sections:
+        return [f for section in sections for f in section.partial_movie_files]
+    return list(getattr(file_writer, "partial_movie_files", []))
+
+
+def segment_entries(file_writer, durations) -> list[dict]:
+    """
+    One entry per play: its file, run time, frame count and start frame.
+    Frame counts come from the file writer (also for cached files it saw
+    in an earlier render); a play with no known count leaves later starts
+    unknown.
+    """
+    files = partial_movie_files(file_writer)
+    known = getattr(file_writer, "segment_frames", {})
+    fps = config.frame_rate
+    entries, start = [], 0
+    for i, duration in enumerate(durations):
+        file = files[i] if i < len(files) else None
+        frames = known.get(str(file)) if file else None
+        if duration is None and frames is not None:
+            duration = frames / fps
+        entries.append({
+            "file": str(file) if file else None,
+            "run_time": duration,
+            "frames": frames,
+            "start_frame": start,
+        })
+        start = None if start is None or frames is None else start + frames
+    return entries
+
+
+def segments_path(file_writer) -> Path:
+    return Path(file_writer.partial_movie_directory) / SEGMENTS_FILE
+
+
+def read_segments(path) -> list[dict] | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())["plays"]
+
+
+def write_segments(path, scene_name: str, plays: list[dict]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "scene": scene_name,
+        "encoder": encoder_signature(),
+        "frame_rate": config.frame_rate,
+        "pixel_width": config.pixel_width,
+        "pixel_height": config.pixel_height,
+        "plays": plays,
+    }, indent=1))
+
+
+def merge_segments(previous: list[dict], rendered: list[dict], play_range) -> list[dict]:
+    """Previous full-render segments with the re-rendered range swapped in."""
+    start, stop = play_range
+    stop = len(rendered) if stop is None else min(stop, len(rendered))
+    if len(previous) < stop:
+        raise ValueError(
+            f"previous render has {len(previous)} plays, cannot splice plays {start}..{stop - 1}"
+        )
+    merged = [dict(seg) for seg in previous]
+    for i in range(start, stop):
+        merged[i] = rendered[i]
+    return merged
+
+
+def concat_segments(files, output: Path, audio=None):
+    """
+    Stream-copy concatenation; no segment is re-encoded. An audio track,
+    if given, is encoded and muxed in the same ffmpeg pass.
+    """
+    missing = [f for f in files if not f or not Path(f).exists()]
+    if missing:
+        raise FileNotFoundError(f"missing partial movie files: {missing[:3]}")
+    ffmpeg = shutil.which("ffmpeg") or "ffmpeg"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for f in files:
+            listing.write(f"file '{Path(f).resolve().as_posix()}'\n")
+    tmp_output = output.with_name(output.stem + "_splicing" + output.suffix)
+    try:
+        command = [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listing.name]
+        if audio is None:
+            command += ["-c", "copy"]
+        else:
+            command += ["-i", str(audio), "-map", "0:v:0", "-map", "1:a:0",
+                        "-c:v", "copy", "-c:a", "aac", "-b:a", "320k"]
+        subprocess.run(command + [str(tmp_output)], check=True)
+        tmp_output.replace(output)
+    finally:
+        Path(listing.name).unlink(missing_ok=True)
+    return output
+
+
+def scene_segments_path(scene_name: str) -> Path:
+    """
+    segments.json of a scene at the current quality, without rendering it.
+    `manim main.py` renders live under videos/main/, renders driven from
+    Python (partial.py, orchestrate.py) under videos/; the first that
+    exists wins.
+    """
+    module_names = ["main", ""]
+    if config.input_file:
+        module_names.insert(0, config.get_dir("input_file").stem)
+    candidates = [
+        Path(config.get_dir("partial_movie_dir", module_name=module, scene_name=scene_name))
+        / f"kf-{encoder_signature()}" / SEGMENTS_FILE
+        for module in module_names
+    ]
+    return next((path for path in candidates if path.exists()), candidates[0])
+
+
+def assemble(scene_names, output, quality="low_quality") -> Path:
+    """
+    Concatenate the recorded segments of several scenes into one movie,
+    stream copy only. Every scene must have been rendered with the current
+    encoder settings at this quality.
+
+    Narration tracks found next to the scenes' segments are laid out at
+    their scenes' start times on one track, muxed in the same ffmpeg pass.
+    """
+    from narration import write_track
+
+    files, placements, elapsed = [], [], 0.0
+    with tempconfig({"quality": quality}):
+        for name in scene_names:
+            path = scene_segments_path(name)
+            plays = read_segments(path)
+            if plays is None:
+                raise FileNotFoundError(f"no segments for {name} at {quality}; render it first ({path})")
+            if json.loads(path.read_text()).get("encoder") != encoder_signature():
+                raise ValueError(f"{name} was encoded with other settings; re-render it")
+            files += [play["file"] for play in plays if play["file"]]
+            track = path.with_name(NARRATION_TRACK)
+            if track.exists():
+                placements.append((elapsed, track))
+            elapsed += sum(
+                play["frames"] / config.frame_rate if play["frames"] is not None else play["run_time"] or 0.0
+                for play in plays if play["file"]
+            )
+
+        logger.info(f"Assembling {len(files)} segments from {len(scene_names)} scenes")
+        if not placements:
+            return concat_segments(files, Path(output))
+        with tempfile.TemporaryDirectory(prefix="bayes-assemble-") as scratch:
+            audio = write_track(Path(scratch) / NARRATION_TRACK, placements, elapsed)
+            return concat_segments(files, Path(output), audio=audio)
+
+
+# --------------------------------------------------------------------
+# Driver
+# --------------------------------------------------------------------
+def play_durations(scene_cls, quality="low_quality") -> list[float]:
+    """Fast-forward through the whole scene (no frames) to time its plays."""
+    with tempconfig({"quality": quality, "write_to_movie": False, "preview": False}):
+        renderer = FastForwardRenderer(play_range=(float("inf"), None))
+        scene_cls(renderer=renderer).render()
+    return renderer.play_durations
+
+
+def plays_for_window(durations, t0: float, t1: float) -> tuple[int, int]:
+    """Smallest play range [start, stop) covering the time window [t0, t1)."""
+    start = stop = None
+    elapsed = 0.0
+    for i, duration in enumerate(durations):
+        end = elapsed + duration
+        if start is None and end > t0:
+            start = i
+        if elapsed < t1:
+            stop = i + 1
+        elapsed = end
+    if start is None or stop is None or stop <= start:
+        raise ValueError(f"time window {t0}..{t1}s is outside the scene ({elapsed:.2f}s)")
+    return start, stop
+
+
+def render_partial(scene_cls, play_range=None, quality="low_quality", splice=True):
+    """
+    Render plays in play_range (all of them if None), update the scene's
+    segments.json and, for partial renders, splice the result into the
+    previously rendered full movie. Returns the movie path.
+    """
+    scene_name = scene_cls.__name__
+    with tempconfig({"quality": quality, "preview": False}):
+        previous = None
+        if play_range is not None:
+            # read before rendering: the full render's manifest and movie must survive it
+            previous = read_segments(scene_segments_path(scene_name))
+            if previous is None:
+                raise FileNotFoundError(
+                    f"no {SEGMENTS_FILE} for {scene_name}; render the full scene with this tool first"
+                )
+
+        renderer = FastForwardRenderer(play_range=play_range)
+        scene = scene_cls(renderer=renderer)
+        # a partial render must not combine its few plays over the full movie
+        renderer.file_writer.segments_only = play_range is not None
+        scene.render()
+
+        file_writer = renderer.file_writer
+        manifest = segments_path(file_writer)
+        rendered = renderer.segments()
+        movie = Path(file_writer.movie_file_path)
+
+        if play_range is None:
+            write_segments(manifest, scene_name, rendered)
+            return movie
+
+        merged = merge_segments(previous, rendered, play_range)
+        write_segments(manifest, scene_name, merged)
+        if splice:
+            track = Path(file_writer.partial_movie_directory) / NARRATION_TRACK
+            concat_segments([seg["file"] for seg in merged], movie, audio=track if track.exists() else None)
+        return movie
+
+
+def _parse_range(text: str, cast):
+    start, _, stop = text.partition(":")
+    return cast(start) if start else cast(0), cast(stop) if stop else None
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="+", metavar="scene")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--plays", help="half-open play index range, e.g. 12:15")
+    group.add_argument("--time", help="time window in seconds, e.g. 20:26.5")
+    group.add_argument("--assemble", metavar="OUTPUT", help="stream-copy the scenes' segments into one movie")
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--no-splice", action="store_true", help="only write the partial movie")
+    args = parser.parse_args()
+
+    if args.assemble:
+        print(assemble(args.scenes, args.assemble, args.quality))
+        return
+    if len(args.scenes) != 1:
+        parser.error("give one scene, or several with --assemble")
+
+    import main
+
+    scene_cls = getattr(main, args.scenes[0])
+    play_range = None
+    if args.plays:
+        play_range = _parse_range(args.plays, int)
+    elif args.time:
+        t0, t1 = _parse_range(args.time, float)
+        durations = play_durations(scene_cls, args.quality)
+        play_range = plays_for_window(durations, t0, float("inf") if t1 is None else t1)
+        print(f"time window {args.time} -> plays {play_range[0]}:{play_range[1]}")
+
+    print(render_partial(scene_cls, play_range, args.quality, splice=not args.no_splice))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,319 @@
+"""
+Render-time budgets: per-scene and per-primitive timing baselines.
+
+Every sample renders a scene in a fresh process (caching off) and splits
+the wall time into
+
+    construction  scene code between plays (building mobjects, layout)
+    animate       inside play() but outside rasterizing/encoding
+                  (begin, interpolation, plans)
+    frames        rasterizing (update_frame)
+    encode        handing frames to ffmpeg, plus the final combine
+
+plus per-primitive totals: "play:<Animation>" splits each play's time
+over its top-level animations, "new:<Mobject>" is construction time of
+the outermost tracked mobject class (a MathTex inside a
+SimpleBayesDiagram counts towards the diagram).
+
+A baseline stores median and MAD of several samples. check renders new
+samples and flags a metric when its median exceeds
+
+    baseline median + max(3 * 1.4826 * MAD, 10% of median, 50 ms)
+
+A scene fails when its total does (or when it exceeds a hand-set budget
+in the baseline's "budgets" section, e.g. {"Scene5_BayesEquationWithDiagrams": 40});
+component and primitive overruns are reported as warnings. A scene with
+no baseline fails too, so new scenes don't go unchecked.
+
+Usage (from the repo root):
+    python HPL112/src/perfbudget.py record --repeats 5                  # every scene
+    python HPL112/src/perfbudget.py check Scene5_BayesEquationWithDiagrams
+    python HPL112/src/perfbudget.py check --warn-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import defaultdict
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_BASELINE = Path("perf-baseline.json")
+METRICS = ("total", "construction", "animate", "frames", "encode")
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normal noise
+NOISE_SIGMAS = 3.0
+RELATIVE_TOLERANCE = 0.10
+ABSOLUTE_TOLERANCE = 0.05
+
+TRACKED_MOBJECTS = (
+    "Text", "MathTex", "Tex", "BulletedList", "ImageMobject", "Brace",
+    "SimpleBayesDiagram", "BayesDiagram", "BayesGridDiagram", "SimpleProbabilityBar",
+    "VectorBrace", "BetaPosteriorPlot", "PopulationCloud", "PosteriorHeatmap", "BayesNetDiagram",
+    "PosteriorChart",
+)
+
+
+# --------------------------------------------------------------------
+# Measuring one render
+# --------------------------------------------------------------------
+def primitive_names(animations) -> list[str]:
+    names = []
+    for anim in animations:
+        anim = getattr(anim, "animation", anim)  # unwrap PlannedAnimation
+        names.append(f"play:{type(anim).__name__}")
+    return names or ["play:?"]
+
+
+class ConstructionTimer:
+    """Wraps __init__ of the tracked classes while active."""
+
+    def __init__(self, namespace, names=TRACKED_MOBJECTS):
+        self.classes = [namespace[name] for name in names if isinstance(namespace.get(name), type)]
+        self.totals = defaultdict(float)
+        self._depth = 0
+        self._originals = {}
+
+    def _wrap(self, cls, original):
+        timer = self
+
+        def __init__(obj, *args, **kwargs):
+            if timer._depth:
+                return original(obj, *args, **kwargs)
+            timer._depth += 1
+            start = time.perf_counter()
+            try:
+                return original(obj, *args, **kwargs)
+            finally:
+                timer._depth -= 1
+                # outermost tracked class wins, even if cls is a base of type(obj)
+                timer.totals[f"new:{type(obj).__name__}"] += time.perf_counter() - start
+
+        return __init__
+
+    def __enter__(self):
+        for cls in self.classes:
+            if "__init__" in vars(cls):
+                self._originals[cls] = vars(cls)["__init__"]
+                cls.__init__ = self._wrap(cls, self._originals[cls])
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self._originals.items():
+            cls.__init__ = original
+        self._originals.clear()
+
+
+def _make_budget_renderer(**kwargs):
+    from framepool import PooledCairoRenderer
+
+    class BudgetRenderer(PooledCairoRenderer):
+        def __init__(self):
+            super().__init__(**kwargs)
+            self.timings = dict.fromkeys(METRICS[1:], 0.0)
+            self.primitives = defaultdict(float)
+            self.frames_written = 0
+            self._mark = time.perf_counter()
+
+        def init_scene(self, scene):
+            super().init_scene(scene)
+            self._mark = time.perf_counter()
+
+        def play(self, scene, *args, **kwargs):
+            start = time.perf_counter()
+            self.timings["construction"] += start - self._mark
+            inner_before = self.timings["frames"] + self.timings["encode"]
+            super().play(scene, *args, **kwargs)
+            self._mark = time.perf_counter()
+
+            spent = self._mark - start
+            self.timings["animate"] += spent - (self.timings["frames"] + self.timings["encode"] - inner_before)
+            names = primitive_names(scene.animations)
+            for name in names:
+                self.primitives[name] += spent / len(names)
+
+        def update_frame(self, *args, **kwargs):
+            start = time.perf_counter()
+            super().update_frame(*args, **kwargs)
+            self.timings["frames"] += time.perf_counter() - start
+
+        def add_frame(self, frame, num_frames=1):
+            start = time.perf_counter()
+            super().add_frame(frame, num_frames)
+            self.timings["encode"] += time.perf_counter() - start
+            if not self.skip_animations:
+                self.frames_written += num_frames
+
+        def scene_finished(self, scene):
+            start = time.perf_counter()
+            self.timings["construction"] += start - self._mark
+            super().scene_finished(scene)
+            self.timings["encode"] += time.perf_counter() - start
+
+    return BudgetRenderer()
+
+
+def measure_scene(scene_name: str, quality: str) -> dict:
+    """One sample; runs in a child process."""
+    from manim import tempconfig
+
+    import main
+
+    scene_cls = getattr(main, scene_name)
+    settings = {"quality": quality, "disable_caching": True, "preview": False, "progress_bar": "none"}
+    with tempconfig(settings), ConstructionTimer(vars(main)) as timer:
+        renderer = _make_budget_renderer()
+        start = time.perf_counter()
+        scene_cls(renderer=renderer).render()
+        total = time.perf_counter() - start
+
+    return {
+        "total": total,
+        **renderer.timings,
+        "frames_written": renderer.frames_written,
+        "primitives": {**renderer.primitives, **timer.totals},
+    }
+
+
+def sample_scenes(scene_names, repeats=3, quality="low_quality") -> dict:
+    """{scene: [sample, ...]}, each sample in a fresh process."""
+    ctx = get_context("spawn")
+    samples = defaultdict(list)
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for _ in range(repeats):
+            for name in scene_names:  # interleaved, so drift hits every scene alike
+                samples[name].append(pool.apply(measure_scene, (name, quality)))
+    return dict(samples)
+
+
+# --------------------------------------------------------------------
+# Statistics
+# --------------------------------------------------------------------
+def robust_stats(values) -> dict:
+    values = np.asarray(values, dtype=float)
+    median = float(np.median(values))
+    return {"median": median, "mad": float(np.median(np.abs(values - median))), "n": len(values)}
+
+
+def summarize(samples: list[dict]) -> dict:
+    metrics = {m: robust_stats([s[m] for s in samples]) for m in METRICS}
+    names = sorted({name for s in samples for name in s["primitives"]})
+    primitives = {name: robust_stats([s["primitives"].get(name, 0.0) for s in samples]) for name in names}
+    return {"metrics": metrics, "primitives": primitives, "frames": samples[0]["frames_written"]}
+
+
+def threshold(stats: dict) -> float:
+    noise = NOISE_SIGMAS * MAD_SCALE * stats["mad"]
+    return stats["median"] + max(noise, RELATIVE_TOLERANCE * stats["median"], ABSOLUTE_TOLERANCE)
+
+
+def compare(baseline: dict, current: dict, budget: float | None = None) -> list[dict]:
+    """One row per metric/primitive present in both summaries."""
+    rows = []
+    for group in ("metrics", "primitives"):
+        for name, base in baseline[group].items():
+            now = current[group].get(name)
+            if now is None:
+                continue
+            limit = threshold(base)
+            if name == "total" and budget is not None:
+                limit = budget
+            rows.append({
+                "name": name,
+                "baseline": base["median"],
+                "current": now["median"],
+                "limit": limit,
+                "over": now["median"] > limit,
+                "fatal": name == "total",
+            })
+    return rows
+
+
+# --------------------------------------------------------------------
+# Baseline files
+# --------------------------------------------------------------------
+def environment(quality: str) -> dict:
+    import manim
+
+    return {
+        "quality": quality,
+        "manim": manim.__version__,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def record(scene_names, path=DEFAULT_BASELINE, repeats=5, quality="low_quality") -> dict:
+    path = Path(path)
+    baseline = json.loads(path.read_text()) if path.exists() else {"scenes": {}, "budgets": {}}
+    for name, samples in sample_scenes(scene_names, repeats, quality).items():
+        baseline["scenes"][name] = summarize(samples)
+    baseline["environment"] = environment(quality)
+    path.write_text(json.dumps(baseline, indent=1, sort_keys=True))
+    return baseline
+
+
+def check(scene_names, path=DEFAULT_BASELINE, repeats=3) -> dict:
+    """{scene: rows}; scenes without a baseline map to None."""
+    baseline = json.loads(Path(path).read_text())
+    env = baseline["environment"]
+    if env["machine"] != platform.node():
+        print(f"warning: baseline was recorded on {env['machine']}, not {platform.node()}", file=sys.stderr)
+    results = {name: None for name in scene_names}
+    baselined = [n for n in scene_names if n in baseline["scenes"]]
+    for name, samples in sample_scenes(baselined, repeats, env["quality"]).items():
+        budget = baseline.get("budgets", {}).get(name)
+        results[name] = compare(baseline["scenes"][name], summarize(samples), budget)
+    return results
+
+
+def _print_rows(scene: str, rows: list[dict], verbose: bool):
+    print(scene)
+    for row in rows:
+        if not (row["over"] or verbose or row["name"] in METRICS):
+            continue
+        flag = ("FAIL" if row["fatal"] else "warn") if row["over"] else "ok"
+        print(f"  {flag:>4}  {row['name']:<36} {row['baseline']:8.2f}s -> {row['current']:8.2f}s"
+              f"  (limit {row['limit']:.2f}s)")
+
+
+def _main():
+    from framepool import _scene_names
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("scenes", nargs="*", help="scene class names (default: all)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--repeats", type=int, default=None, help="samples per scene (record: 5, check: 3)")
+    parser.add_argument("--quality", default="low_quality", help="record only; check uses the baseline's")
+    parser.add_argument("--warn-only", action="store_true", help="report overruns but exit 0")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list every primitive")
+    args = parser.parse_args()
+
+    scenes = args.scenes or _scene_names()
+    if args.command == "record":
+        record(scenes, args.baseline, args.repeats or 5, args.quality)
+        print(f"baseline for {len(scenes)} scenes written to {args.baseline}")
+        return
+
+    results = check(scenes, args.baseline, args.repeats or 3)
+    failed = False
+    for scene, rows in results.items():
+        if rows is None:
+            # a new scene would otherwise pass unchecked forever
+            print(f"{scene}\n  FAIL  no baseline in {args.baseline} (run `record` for it)")
+            failed = True
+            continue
+        _print_rows(scene, rows, args.verbose)
+        failed |= any(row["over"] and row["fatal"] for row in rows)
+    sys.exit(1 if failed and not args.warn_only else 0)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,328 @@
+"""
+One-pass LaTeX for every MathTex/Tex string the scenes use.
+
+On a cold cache manim runs latex + dvisvgm once per distinct TeX string;
+FullBayesMovie has dozens of them (formulas, diagram labels, percent
+labels, bullets with inline math). The prepass here
+
+  1. finds the strings with a dry run: every scene is constructed in a
+     child process with all plays fast-forwarded, and tex_to_svg_file is
+     swapped for a recorder that hands back a placeholder SVG (a dry run
+     with a temporary media dir, so no cache sees the placeholders);
+  2. writes all missing strings as pages of one LaTeX document per
+     preamble (standalone's multi mode), compiles it once and converts
+     every page with one dvisvgm call;
+  3. files each page under the name manim would have given it
+     (media/Tex/<tex_hash>.svg), so the real render finds them all cached.
+
+Geometry that depends on typeset sizes can hide strings from the dry run,
+so discovery repeats (now with real SVGs) until nothing new turns up. If a
+batch fails to compile it is bisected; a string that fails on its own is
+left for manim, which reports the error as usual.
+
+The discovered strings are remembered per main.py/timeline content, so a
+warm run costs one stat() per string.
+
+    python HPL112/src/texbatch.py                    # every scene
+    python HPL112/src/texbatch.py FullBayesMovie
+    BAYES_TEX_PREPASS=1 manim -ql HPL112/src/main.py FullBayesMovie
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from manim import Scene, config, logger, tempconfig
+from manim.utils.tex_file_writing import tex_compilation_command, tex_hash
+
+PREPASS_ENV_VAR = "BAYES_TEX_PREPASS"
+MANIFEST = "bayes_tex_batch.json"
+MAX_ROUNDS = 4
+PAGE_ENV = "standalone"  # standalone's own page environment in multi mode
+
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="8pt" height="8pt" viewBox="0 0 8 8">'
+    '<path d="M0 0H8V8H0Z"/></svg>'
+)
+
+_DOCUMENTCLASS = re.compile(r"\\documentclass(\[[^\]]*\])?\{standalone\}")
+_done_in_process = False
+
+
+def _source_key() -> str:
+    from timeline import TIMELINE_DIR
+
+    h = hashlib.sha256()
+    for path in [Path(__file__).with_name("main.py")] + sorted(TIMELINE_DIR.glob("*.*")):
+        h.update(path.read_bytes())
+    return h.hexdigest()[:24]
+
+
+def _svg_path(tex_dir: Path, texcode: str) -> Path:
+    return tex_dir / f"{tex_hash(texcode)}.svg"
+
+
+# --------------------------------------------------------------------
+# Discovery (child process)
+# --------------------------------------------------------------------
+def _discover_in_child(scene_names, tex_dir: str) -> list[dict]:
+    """Dry-run the scenes; every TeX document they need, cached or not."""
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from partial import FastForwardRenderer
+
+    os.environ.pop(PREPASS_ENV_VAR, None)
+    import main
+
+    tex_dir = Path(tex_dir)
+    found = {}
+
+    with tempfile.TemporaryDirectory(prefix="bayes-tex-") as scratch:
+        placeholder = Path(scratch) / "placeholder.svg"
+        placeholder.write_text(PLACEHOLDER_SVG)
+
+        def record(expression, environment=None, tex_template=None):
+            template = tex_template or config.tex_template
+            if environment is not None:
+                texcode = template.get_texcode_for_expression_in_env(expression, environment)
+            else:
+                texcode = template.get_texcode_for_expression(expression)
+            found[texcode] = {
+                "texcode": texcode,
+                "compiler": template.tex_compiler,
+                "output_format": template.output_format,
+            }
+            svg = _svg_path(tex_dir, texcode)
+            return svg if svg.exists() else placeholder
+
+        settings = {"media_dir": scratch, "write_to_movie": False, "save_last_frame": False,
+                    "disable_caching": True, "preview": False, "progress_bar": "none"}
+        original = tex_mobject.tex_to_svg_file
+        tex_mobject.tex_to_svg_file = record
+        try:
+            with tempconfig(settings):
+                for name in scene_names:
+                    try:
+                        renderer = FastForwardRenderer(play_range=(float("inf"), None))
+                        getattr(main, name)(renderer=renderer).render()
+                    except Exception as err:
+                        # placeholder geometry can trip layout code; the next round has real SVGs
+                        logger.debug(f"tex discovery stopped early in {name}: {err!r}")
+                # built on demand while animating, never during a dry run
+                for percent in range(101):
+                    main._percent_label(percent)
+        finally:
+            tex_mobject.tex_to_svg_file = original
+    return list(found.values())
+
+
+def discover(scene_names) -> list[dict]:
+    ctx = get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_discover_in_child, (list(scene_names), str(config.get_dir("tex_dir"))))
+
+
+# --------------------------------------------------------------------
+# Batch compilation
+# --------------------------------------------------------------------
+def _split_document(texcode: str) -> tuple[str, str]:
+    head, _, rest = texcode.partition(r"\begin{document}")
+    body, _, _ = rest.partition(r"\end{document}")
+    return head, body
+
+
+def _multi_page_head(head: str) -> str | None:
+    """The preamble with standalone switched to one page per environment."""
+    match = _DOCUMENTCLASS.search(head)
+    if match is None:
+        return None
+    options = (match.group(1) or "[]")[1:-1]
+    options = ",".join(filter(None, [options, "multi"]))
+    return head[:match.start()] + rf"\documentclass[{options}]{{standalone}}" + head[match.end():]
+
+
+class BatchCompiler:
+    def __init__(self, tex_dir: Path):
+        self.tex_dir = tex_dir
+        self.processes = 0
+        self.batches = 0
+        self.given_up = False
+
+    def compile(self, requests: list[dict]) -> list[dict]:
+        """Compile what is missing; returns the requests left for manim."""
+        groups, left = {}, []
+        for request in requests:
+            head, body = _split_document(request["texcode"])
+            multi_head = _multi_page_head(head)
+            if multi_head is None or not body.strip():
+                left.append(request)  # custom document class or nothing to typeset
+                continue
+            key = (request["compiler"], request["output_format"], multi_head)
+            groups.setdefault(key, []).append(request)
+
+        for (compiler, output_format, head), group in groups.items():
+            left += self._compile_group(compiler, output_format, head, group)
+        return left
+
+    def _compile_group(self, compiler, output_format, head, group) -> list[dict]:
+        if self.given_up:
+            return group
+        if self._try_batch(compiler, output_format, head, group):
+            self.batches += 1
+            return []
+        if len(group) == 1:
+            # nothing has worked yet: multi-page mode itself is failing here,
+            # bisecting further would only cost more LaTeX runs than manim would
+            self.given_up = self.batches == 0
+            return group
+        middle = len(group) // 2
+        return (self._compile_group(compiler, output_format, head, group[:middle])
+                + self._compile_group(compiler, output_format, head, group[middle:]))
+
+    def _try_batch(self, compiler, output_format, head, group) -> bool:
+        pages = [
+            rf"\begin{{{PAGE_ENV}}}{_split_document(r['texcode'])[1]}\end{{{PAGE_ENV}}}"
+            for r in group
+        ]
+        document = "\n".join([head.rstrip(), r"\begin{document}", *pages, r"\end{document}", ""])
+        name = "batch-" + tex_hash(document)
+        tex_file = self.tex_dir / f"{name}.tex"
+        tex_file.write_text(document, encoding="utf-8")
+        out_file = tex_file.with_suffix(output_format)
+        try:
+            self.processes += 1
+            if os.system(tex_compilation_command(compiler, output_format, tex_file, self.tex_dir)) != 0:
+                logger.debug(f"batch of {len(group)} TeX strings failed, splitting")
+                return False
+            self.processes += 1
+            os.system(" ".join([
+                "dvisvgm",
+                "--pdf" if output_format == ".pdf" else "",
+                "-p 1-",
+                f'"{out_file.as_posix()}"',
+                "-n",
+                "-v 0",
+                f'-o "{(self.tex_dir / name).as_posix()}-page%p.svg"',
+                ">",
+                os.devnull,
+            ]))
+            page_files = {
+                int(re.search(r"-page(\d+)\.svg$", path.name).group(1)): path
+                for path in self.tex_dir.glob(f"{name}-page*.svg")
+            }
+            if sorted(page_files) != list(range(1, len(group) + 1)):
+                logger.debug(f"batch gave {len(page_files)} pages for {len(group)} strings, splitting")
+                for path in page_files.values():
+                    path.unlink()
+                return False
+            for number, request in enumerate(group, start=1):
+                target = _svg_path(self.tex_dir, request["texcode"])
+                page_files[number].replace(target)
+                target.with_suffix(".tex").write_text(request["texcode"], encoding="utf-8")
+            return True
+        finally:
+            if not config.no_latex_cleanup:
+                for path in self.tex_dir.glob(f"{name}.*"):
+                    path.unlink()
+
+
+# --------------------------------------------------------------------
+# Prepass
+# --------------------------------------------------------------------
+def _all_scene_names() -> list[str]:
+    from framepool import _scene_names
+
+    return _scene_names()
+
+
+def prepass(scene_names=None) -> dict:
+    """Make sure every TeX string of the scenes is in manim's SVG cache."""
+    start = time.perf_counter()
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = tex_dir / MANIFEST
+    key = _source_key()
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    if scene_names is None:
+        scene_names = _all_scene_names()
+    entry = manifest.get(key, {})
+    known = entry.get("requests", [])
+    stats = {"strings": len(known), "compiled": 0, "latex_processes": 0, "rounds": 0, "left_for_manim": 0}
+
+    compiler = BatchCompiler(tex_dir)
+    if set(scene_names) <= set(entry.get("scenes", [])):
+        # same sources: the recorded strings are all there is
+        missing = [r for r in known if not _svg_path(tex_dir, r["texcode"]).exists()]
+        left = compiler.compile(missing) if missing else []
+        stats.update(
+            compiled=len(missing) - len(left),
+            latex_processes=compiler.processes,
+            left_for_manim=len(left),
+            seconds=round(time.perf_counter() - start, 2),
+        )
+        return stats
+
+    seen, failed = {r["texcode"]: r for r in known}, set()
+    for round_number in range(1, MAX_ROUNDS + 1):
+        stats["rounds"] = round_number
+        for request in discover(scene_names):
+            seen.setdefault(request["texcode"], request)
+        missing = [
+            r for code, r in seen.items()
+            if code not in failed and not _svg_path(tex_dir, code).exists()
+        ]
+        if not missing:
+            break
+        left = compiler.compile(missing)
+        failed.update(r["texcode"] for r in left)
+        stats["compiled"] += len(missing) - len(left)
+
+    stats.update(
+        strings=len(seen),
+        latex_processes=compiler.processes,
+        left_for_manim=len(failed),
+        seconds=round(time.perf_counter() - start, 2),
+    )
+    manifest[key] = {
+        "scenes": sorted(set(scene_names) | set(entry.get("scenes", []))),
+        "requests": list(seen.values()),
+    }
+    manifest_path.write_text(json.dumps({key: manifest[key]}, indent=1))
+    return stats
+
+
+class TexPrepassScene(Scene):
+    """Runs the prepass once per process before the first scene when BAYES_TEX_PREPASS is set."""
+
+    def setup(self):
+        global _done_in_process
+        # before the other setups: narration's timing dry run already builds TeX
+        if os.environ.get(PREPASS_ENV_VAR) and not _done_in_process:
+            _done_in_process = True
+            stats = prepass()
+            logger.info(f"TeX prepass: {stats}")
+        super().setup()
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene class names (default: all)")
+    parser.add_argument("--force", action="store_true", help="clear the SVG cache first")
+    args = parser.parse_args()
+
+    if args.force:
+        shutil.rmtree(config.get_dir("tex_dir"), ignore_errors=True)
+    print(json.dumps(prepass(args.scenes or None), indent=1))
+
+
+if __name__ == "__main__":
+    _main()
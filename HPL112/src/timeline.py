@@ -0,0 +1,315 @@
+"""
+Declarative scene descriptions (TOML / JSON) compiled to manim animations.
+
+The text-heavy scenes (title card, history, takeaways, thanks) are just
+mobjects, a bit of layout and a list of plays and waits, so they live in
+timelines/*.toml instead of construct() code. A file has four parts:
+
+    background = "BG"                  # optional
+    background_target = "camera"       # or "config"
+
+    [mobjects.<id>]                    # built in file order
+    type = "Text"                      # Text, Tex, MathTex, BulletedList, Line,
+    text = "..."                       # RoundedRectangle, ImageMobject, VGroup, Group
+    ...
+
+    [[layout]]                         # mobject method calls, run once
+    target = "<id>"
+    op = "arrange"                     # arrange, next_to, to_edge, move_to, ...
+    args = ["DOWN"]
+    buff = 0.25
+
+    [[timeline]]                       # one entry per play() or wait()
+    play = [{ anim = "Write", target = "<id>" }]
+    run_time = 1.2
+    do = [...]                         # optional layout ops right before the play
+
+    [[timeline]]
+    wait = 0.3
+
+Values that are strings are small expressions: manim constants ("DOWN",
+"TEAL_A"), extra constants such as "BG", numbers, + - * /, comparisons,
+and <id>.width / <id>.height. Hex colors ("#0e0e10") pass through.
+
+Everything except the timeline is cached (in memory and pickled under
+media/timeline_cache) keyed by its content, so a timing-only edit reuses
+the constructed, laid-out mobjects. The unchanged plays then hash the same
+as before and manim reuses their partial movie files; only the plays
+whose timing changed are re-rendered.
+"""
+
+from __future__ import annotations
+
+import ast
+import copy
+import hashlib
+import json
+import operator
+import pickle
+import tomllib
+from pathlib import Path
+
+import manim
+import numpy as np
+from manim import config, logger
+
+TIMELINE_DIR = Path(__file__).parent / "timelines"
+
+MOBJECT_TYPES = {
+    "Text", "Tex", "MathTex", "BulletedList", "Line",
+    "RoundedRectangle", "Rectangle", "ImageMobject", "VGroup", "Group",
+}
+LAYOUT_OPS = {
+    "arrange", "next_to", "to_edge", "to_corner", "move_to", "shift", "scale",
+    "set_width", "set_height", "set_x", "set_y", "align_to", "rotate",
+    "set_color", "set_opacity", "set_color_by_gradient",
+}
+ANIMATIONS = {
+    "Write", "Create", "FadeIn", "FadeOut", "Flash", "GrowArrow",
+    "GrowFromCenter", "Indicate", "LaggedStart", "AnimationGroup",
+}
+# constructor kwargs taken verbatim (not evaluated)
+RAW_KWARGS = {"weight", "slant", "font"}
+
+_BINARY = {
+    ast.Add: operator.add, ast.Sub: operator.sub,
+    ast.Mult: operator.mul, ast.Div: operator.truediv,
+}
+_COMPARE = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+}
+_ATTRIBUTES = {"width", "height"}
+
+_layout_cache = {}
+
+
+class TimelineError(ValueError):
+    pass
+
+
+# --------------------------------------------------------------------
+# Expressions
+# --------------------------------------------------------------------
+class Evaluator:
+    def __init__(self, constants: dict):
+        self.names = {
+            name: value for name, value in vars(manim).items()
+            if name.isupper() and not name.startswith("_")
+        }
+        self.names.update(frame_width=config.frame_width, frame_height=config.frame_height)
+        self.names.update(constants)
+
+    def __call__(self, value):
+        if isinstance(value, str):
+            if value.startswith("#"):
+                return value
+            try:
+                tree = ast.parse(value, mode="eval")
+            except SyntaxError as err:
+                raise TimelineError(f"bad expression {value!r}") from err
+            return self._eval(tree.body, value)
+        if isinstance(value, list):
+            return [self(v) for v in value]
+        return value
+
+    def _eval(self, node, source):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id not in self.names:
+                raise TimelineError(f"unknown name {node.id!r} in {source!r}")
+            return self.names[node.id]
+        if isinstance(node, ast.Attribute) and node.attr in _ATTRIBUTES:
+            return getattr(self._eval(node.value, source), node.attr)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return _BINARY[type(node.op)](self._eval(node.left, source), self._eval(node.right, source))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self._eval(node.operand, source)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in _COMPARE:
+            return _COMPARE[type(node.ops[0])](
+                self._eval(node.left, source), self._eval(node.comparators[0], source)
+            )
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return np.array([self._eval(e, source) for e in node.elts], dtype=float)
+        raise TimelineError(f"unsupported expression {source!r}")
+
+
+# --------------------------------------------------------------------
+# Loading
+# --------------------------------------------------------------------
+def load_spec(path) -> dict:
+    path = Path(path)
+    if path.suffix == ".toml":
+        return tomllib.loads(path.read_text())
+    if path.suffix == ".json":
+        return json.loads(path.read_text())
+    raise TimelineError(f"unsupported timeline format: {path.suffix}")
+
+
+def layout_key(spec: dict, constants: dict) -> str:
+    """Content hash of everything that determines the laid-out mobjects."""
+    layout_part = {
+        "mobjects": spec.get("mobjects", {}),
+        "layout": spec.get("layout", []),
+        "constants": {name: str(value) for name, value in constants.items()},
+        "frame": [config.frame_width, config.frame_height],
+        "manim": manim.__version__,
+    }
+    blob = json.dumps(layout_part, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+
+# --------------------------------------------------------------------
+# Building
+# --------------------------------------------------------------------
+def _kwargs(spec: dict, skip, ev) -> dict:
+    return {
+        key: (value if key in RAW_KWARGS else ev(value))
+        for key, value in spec.items() if key not in skip
+    }
+
+
+_POST_OPS = ("type", "text", "tex", "items", "file", "children", "start", "end",
+             "scale", "width", "height", "gradient", "t2c", "fill")
+
+
+def build_mobject(spec: dict, objects: dict, ev):
+    kind = spec.get("type")
+    if kind not in MOBJECT_TYPES:
+        raise TimelineError(f"unsupported mobject type {kind!r}")
+    cls = getattr(manim, kind)
+    kwargs = _kwargs(spec, _POST_OPS, ev)
+
+    if kind == "Text":
+        mob = cls(spec["text"], **kwargs)
+    elif kind in ("Tex", "MathTex"):
+        tex = spec["tex"]
+        mob = cls(*(tex if isinstance(tex, list) else [tex]), **kwargs)
+    elif kind == "BulletedList":
+        mob = cls(*spec["items"], **kwargs)
+    elif kind == "Line":
+        mob = cls(ev(spec.get("start", "LEFT")), ev(spec.get("end", "RIGHT")), **kwargs)
+    elif kind == "ImageMobject":
+        mob = cls(spec["file"], **kwargs)
+    elif kind in ("VGroup", "Group"):
+        try:
+            mob = cls(*[objects[name] for name in spec["children"]], **kwargs)
+        except KeyError as err:
+            raise TimelineError(f"group child {err} is not defined above the group") from err
+    else:
+        mob = cls(**kwargs)
+
+    if "scale" in spec:
+        mob.scale(ev(spec["scale"]))
+    if "width" in spec:
+        mob.set_width(ev(spec["width"]))
+    if "height" in spec:
+        mob.set_height(ev(spec["height"]))
+    if "gradient" in spec:
+        mob.set_color_by_gradient(*ev(spec["gradient"]))
+    if "t2c" in spec:
+        mob.set_color_by_t2c({text: ev(color) for text, color in spec["t2c"].items()})
+    return mob
+
+
+def apply_op(op: dict, objects: dict, ev):
+    if "if" in op and not ev(op["if"]):
+        return
+    name = op.get("op")
+    if name not in LAYOUT_OPS:
+        raise TimelineError(f"unsupported layout op {name!r}")
+    target = objects[op["target"]]
+    args = [ev(a) for a in op.get("args", [])]
+    kwargs = _kwargs(op, {"op", "target", "args", "if"}, ev)
+    getattr(target, name)(*args, **kwargs)
+
+
+def build_layout(spec: dict, constants: dict) -> dict:
+    """Construct and lay out every mobject of a spec; returns id -> mobject."""
+    objects = {}
+    ev = Evaluator(constants)
+    for name, mob_spec in spec.get("mobjects", {}).items():
+        objects[name] = build_mobject(mob_spec, objects, ev)
+        ev.names[name] = objects[name]
+    for op in spec.get("layout", []):
+        apply_op(op, objects, ev)
+    return objects
+
+
+def laid_out_mobjects(spec: dict, constants: dict) -> dict:
+    """Cached build_layout(); callers get their own deep copy."""
+    key = layout_key(spec, constants)
+    if key not in _layout_cache:
+        disk_path = Path(config.media_dir) / "timeline_cache" / f"{key}.pkl"
+        objects = None
+        if disk_path.exists():
+            try:
+                objects = pickle.loads(disk_path.read_bytes())
+            except Exception as err:  # stale or incompatible pickle
+                logger.debug(f"timeline cache miss for {key}: {err}")
+        if objects is None:
+            objects = build_layout(spec, constants)
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                disk_path.write_bytes(pickle.dumps(objects))
+            except (pickle.PicklingError, TypeError, AttributeError, OSError) as err:
+                logger.debug(f"timeline layout {key} not written to disk: {err}")
+        _layout_cache[key] = objects
+    # one deepcopy of the whole dict keeps group/child sharing intact
+    return copy.deepcopy(_layout_cache[key])
+
+
+# --------------------------------------------------------------------
+# Animations
+# --------------------------------------------------------------------
+def build_animation(spec: dict, objects: dict, ev):
+    kind = spec.get("anim")
+    if kind not in ANIMATIONS:
+        raise TimelineError(f"unsupported animation {kind!r}")
+    cls = getattr(manim, kind)
+
+    if kind in ("LaggedStart", "AnimationGroup"):
+        each = getattr(manim, spec["each"]) if "each" in spec else None
+        if each is None or spec["each"] not in ANIMATIONS:
+            raise TimelineError(f"{kind} needs an 'each' animation")
+        if "children_of" in spec:
+            targets = [child for name in spec["children_of"] for child in objects[name]]
+        else:
+            targets = [objects[name] for name in spec["targets"]]
+        child_kwargs = _kwargs(spec, {"anim", "each", "targets", "children_of", "lag_ratio", "run_time"}, ev)
+        group_kwargs = _kwargs({k: spec[k] for k in ("lag_ratio", "run_time") if k in spec}, (), ev)
+        return cls(*[each(target, **child_kwargs) for target in targets], **group_kwargs)
+
+    return cls(objects[spec["target"]], **_kwargs(spec, {"anim", "target"}, ev))
+
+
+def run_timeline(scene, path, constants: dict | None = None):
+    """Build (or reuse) the mobjects of a timeline file and play it on scene."""
+    constants = constants or {}
+    spec = load_spec(path)
+    objects = laid_out_mobjects(spec, constants)
+
+    ev = Evaluator(constants)
+    ev.names.update(objects)
+
+    if "background" in spec:
+        background = ev(spec["background"])
+        if spec.get("background_target", "camera") == "config":
+            config.background_color = background
+        else:
+            scene.camera.background_color = background
+
+    for step in spec.get("timeline", []):
+        for op in step.get("do", []):
+            apply_op(op, objects, ev)
+        if "wait" in step:
+            scene.wait(ev(step["wait"]))
+        elif "play" in step:
+            animations = [build_animation(a, objects, ev) for a in step["play"]]
+            play_kwargs = _kwargs(step, {"play", "do"}, ev)
+            scene.play(*animations, **play_kwargs)
+        else:
+            raise TimelineError(f"timeline step needs 'play' or 'wait': {step}")
+    return objects
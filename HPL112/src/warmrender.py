@@ -0,0 +1,301 @@
+"""
+Warm preview renderer: a long-lived process that re-renders the scenes you
+are editing as soon as main.py (or manim.cfg, or a timeline) is saved.
+
+A cold `manim -ql` run pays for Python startup, `from manim import *`,
+font loading, TeX cache lookups and SVG parsing before the first frame.
+This process pays that once: manim and the helper modules stay imported,
+and manim's in-memory SVG cache (every parsed Text/MathTex) survives
+re-imports, so a re-render only builds what actually changed.
+
+Change detection is per scene. main.py is parsed with ast; a scene's
+fingerprint covers the source (unparsed, so comment and formatting edits
+don't count) of its class and of every top-level definition it reaches by
+name -- base classes, helper mobjects, constants, other scenes for
+FullBayesMovie -- plus the timeline files its play_timeline() calls
+name, plus manim.cfg. After a save, main is reloaded (only main:
+edits to the helper modules need a restart) and just the scenes whose
+fingerprint moved are rendered at preview quality, each report giving
+the time from the file's modification to the finished movie.
+
+    python HPL112/src/warmrender.py                          # every scene but FullBayesMovie
+    python HPL112/src/warmrender.py Scene4_BayesVisualization Scene5_BayesEquationWithDiagrams
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import importlib
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from manim import Scene, config, logger, tempconfig
+
+from timeline import TIMELINE_DIR
+
+SRC_DIR = Path(__file__).resolve().parent
+MAIN_FILE = SRC_DIR / "main.py"
+CONFIG_FILE = SRC_DIR.parent / "manim.cfg"
+POLL_INTERVAL = 0.25
+SETTLE = 0.1           # a save is done when mtimes stop moving for this long
+PREVIEW_FPS = 15
+PREVIEW_MAX_SIDE = 854
+
+
+# --------------------------------------------------------------------
+# Per-scene fingerprints
+# --------------------------------------------------------------------
+def _defined_names(node) -> list[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(alias.asname or alias.name).split(".")[0] for alias in node.names]
+    targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+    return [n.id for t in targets if t is not None for n in ast.walk(t) if isinstance(n, ast.Name)]
+
+
+def definitions(source: str) -> dict[str, tuple[str, set[str]]]:
+    """Top-level name -> (normalized source, names it mentions)."""
+    defs = {}
+    for node in ast.parse(source).body:
+        mentioned = set()
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name):
+                mentioned.add(sub.id)
+            elif isinstance(sub, ast.Constant) and isinstance(sub.value, str) and sub.value.isidentifier():
+                mentioned.add(sub.value)  # globals()[name] lookups, e.g. TIMELINE_CONSTANTS
+        text = ast.unparse(node)
+        for name in _defined_names(node):
+            previous = defs.get(name, ("", set()))
+            defs[name] = (previous[0] + "\n" + text, previous[1] | mentioned)
+    return defs
+
+
+def closure(defs: dict, name: str) -> set[str]:
+    seen, stack = set(), [name]
+    while stack:
+        current = stack.pop()
+        if current in seen or current not in defs:
+            continue
+        seen.add(current)
+        stack.extend(defs[current][1])
+    return seen
+
+
+def timeline_uses(source: str) -> dict[str, set[str]]:
+    """
+    Top-level name -> timeline files its play_timeline(...) calls name;
+    "*" stands for a call whose file isn't a literal.
+    """
+    uses = {}
+    for node in ast.parse(source).body:
+        files = set()
+        for sub in ast.walk(node):
+            if not isinstance(sub, ast.Call):
+                continue
+            func = sub.func
+            called = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if called != "play_timeline":
+                continue
+            arg = sub.args[0] if sub.args else None
+            literal = isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+            files.add(arg.value if literal else "*")
+        if files:
+            for name in _defined_names(node):
+                uses.setdefault(name, set()).update(files)
+    return uses
+
+
+def _files_digest(paths) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        if path.exists():
+            h.update(path.name.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def fingerprints(scene_names, source: str) -> dict[str, str]:
+    defs = definitions(source)
+    uses = timeline_uses(source)
+    config_digest = _files_digest([CONFIG_FILE])
+    result = {}
+    for name in scene_names:
+        names = closure(defs, name)
+        h = hashlib.sha256(config_digest.encode())
+        for dep in sorted(names):
+            h.update(defs[dep][0].encode())
+        timelines = set().union(*(uses.get(dep, set()) for dep in names))
+        if "*" in timelines:
+            h.update(_files_digest(sorted(TIMELINE_DIR.glob("*.*"))).encode())
+        elif timelines:
+            h.update(_files_digest([TIMELINE_DIR / f for f in sorted(timelines)]).encode())
+        result[name] = h.hexdigest()
+    return result
+
+
+def scene_classes(module) -> list[str]:
+    """Scenes defined in the module that have a construct() of their own."""
+    return [
+        name for name, obj in vars(module).items()
+        if isinstance(obj, type) and issubclass(obj, Scene)
+        and obj.__module__ == module.__name__ and "construct" in vars(obj)
+    ]
+
+
+# --------------------------------------------------------------------
+# Watching and rendering
+# --------------------------------------------------------------------
+def watched_files() -> list[Path]:
+    return [MAIN_FILE, CONFIG_FILE, *sorted(TIMELINE_DIR.glob("*.*"))]
+
+
+def _mtimes(paths) -> dict[Path, float]:
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = path.stat().st_mtime
+        except FileNotFoundError:
+            stamps[path] = 0.0
+    return stamps
+
+
+def preview_settings(quality=None) -> dict:
+    """manim.cfg's frame, at preview frame rate and size unless a quality is named."""
+    settings = {"preview": False, "progress_bar": "none"}
+    if quality:
+        settings["quality"] = quality
+        return settings
+    width, height = config.pixel_width, config.pixel_height
+    scale = min(1.0, PREVIEW_MAX_SIDE / max(width, height))
+    settings.update(
+        frame_rate=min(config.frame_rate, PREVIEW_FPS),
+        pixel_width=int(width * scale) // 2 * 2,
+        pixel_height=int(height * scale) // 2 * 2,
+    )
+    return settings
+
+
+class WarmRenderer:
+    def __init__(self, scene_names=None, quality=None):
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+        if CONFIG_FILE.exists():
+            config.digest_file(CONFIG_FILE)
+        import main
+
+        self.main = main
+        self.requested = scene_names
+        self.quality = quality
+        self.rendered = {}  # scene -> fingerprint of the last render attempt
+        self.stamps = _mtimes(watched_files())
+
+    def scene_names(self) -> list[str]:
+        available = scene_classes(self.main)
+        if self.requested:
+            return [name for name in self.requested if name in available]
+        return [name for name in available if name != "FullBayesMovie"]
+
+    def changed_scenes(self) -> dict[str, str]:
+        """Scenes whose fingerprint differs from their last render, with the new one."""
+        current = fingerprints(self.scene_names(), MAIN_FILE.read_text())
+        return {name: digest for name, digest in current.items() if self.rendered.get(name) != digest}
+
+    def render(self, name: str) -> Path | None:
+        start = time.perf_counter()
+        try:
+            with tempconfig(preview_settings(self.quality)):
+                scene = getattr(self.main, name)()
+                scene.render()
+                movie = Path(scene.renderer.file_writer.movie_file_path)
+        except Exception:
+            traceback.print_exc()
+            return None
+        logger.debug(f"{name} rendered in {time.perf_counter() - start:.2f}s")
+        return movie
+
+    def reload(self, changed: set[Path]) -> bool:
+        if CONFIG_FILE in changed and CONFIG_FILE.exists():
+            config.digest_file(CONFIG_FILE)
+        if MAIN_FILE in changed:
+            try:
+                self.main = importlib.reload(self.main)
+            except Exception:
+                # keep the previous module; the next save tries again
+                traceback.print_exc()
+                return False
+        return True
+
+    def render_changed(self, changed: dict[str, str], edited_at: float | None = None, reload_seconds=0.0):
+        for name, digest in changed.items():
+            self.rendered[name] = digest
+            render_start = time.time()
+            movie = self.render(name)
+            done = time.time()
+            if movie is None:
+                print(f"{name}: render failed")
+                continue
+            if edited_at is None:
+                print(f"{name}: {done - render_start:.2f}s -> {movie}")
+            else:
+                print(f"{name}: edit->video {done - edited_at:.2f}s "
+                      f"(reload {reload_seconds:.2f}s, render {done - render_start:.2f}s) -> {movie}")
+
+    def wait_for_change(self, interval=POLL_INTERVAL) -> tuple[set[Path], float]:
+        while True:
+            time.sleep(interval)
+            stamps = _mtimes(watched_files())
+            if stamps == self.stamps:
+                continue
+            # let the editor finish writing
+            while True:
+                time.sleep(SETTLE)
+                settled = _mtimes(watched_files())
+                if settled == stamps:
+                    break
+                stamps = settled
+            changed = {path for path in stamps.keys() | self.stamps.keys()
+                       if stamps.get(path) != self.stamps.get(path)}
+            self.stamps = stamps
+            return changed, max(stamps.get(path, 0.0) for path in changed)
+
+    def run(self, initial=True, interval=POLL_INTERVAL):
+        if initial:
+            # first renders warm fonts, TeX and the SVG cache
+            self.render_changed(self.changed_scenes())
+        else:
+            self.rendered = fingerprints(self.scene_names(), MAIN_FILE.read_text())
+        print(f"watching {', '.join(p.name for p in [MAIN_FILE, CONFIG_FILE])} and timelines/")
+        while True:
+            changed, edited_at = self.wait_for_change(interval)
+            start = time.perf_counter()
+            if not self.reload(changed):
+                continue
+            reload_seconds = time.perf_counter() - start
+            scenes = self.changed_scenes()
+            if not scenes:
+                print(f"{', '.join(sorted(p.name for p in changed))} saved, no scene changed")
+                continue
+            self.render_changed(scenes, edited_at, reload_seconds)
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene class names (default: all but FullBayesMovie)")
+    parser.add_argument("--quality", default=None, help="manim quality name instead of the preview frame")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between polls")
+    parser.add_argument("--no-initial", action="store_true", help="don't render everything once at start")
+    args = parser.parse_args()
+
+    try:
+        WarmRenderer(args.scenes or None, args.quality).run(initial=not args.no_initial, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    _main()